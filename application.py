@@ -1,22 +1,33 @@
 import asyncio
 import logging
 import os
+import time
 import uuid
-from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Literal
 
 import uvicorn
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
-from pydantic import BaseModel
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
 
-from backend.graph import Graph
-from backend.services.mongodb import MongoDBService
-from backend.services.pdf_service import PDFService
+from backend.services.checkpointing import checkpoint_path
+from backend.services.inflight import InFlightRegistry
+from backend.services.job_queue import JobQueue, QueueFullError
+from backend.services.job_registry import FileJobStore, JobRegistry
+from backend.services.pdf_service import PDFService, pdf_cache_key
+from backend.services.pubsub import create_pubsub
+from backend.services.research_cache import shared_cache
+from backend.services.research_runner import run_research
+from backend.services.search_index import create_search_index
+from backend.services.storage import create_storage
 from backend.services.websocket_manager import WebSocketManager
+from backend.services.worker_pool import ProcessWorkerPool
+from backend.utils.fingerprint import request_fingerprint
+from backend.utils.freshness import stale_categories
 
 # Load environment variables from .env file at startup
 env_path = Path(__file__).parent / '.env'
@@ -35,41 +46,114 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
-    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
     allow_headers=["*"],
 )
 
-manager = WebSocketManager()
-pdf_service = PDFService({"pdf_output_dir": "pdfs"})
-
-job_status = defaultdict(lambda: {
-    "status": "pending",
-    "result": None,
-    "error": None,
-    "debug_info": [],
-    "company": None,
-    "report": None,
-    "last_update": datetime.now().isoformat()
+manager = WebSocketManager(create_pubsub())
+pdf_service = PDFService({
+    "pdf_output_dir": "pdfs",
+    "max_workers": int(os.getenv("PDF_WORKERS", "2")),
+    "max_pending": int(os.getenv("PDF_QUEUE_SIZE", "8")),
+    "timeout_seconds": float(os.getenv("PDF_TIMEOUT_SECONDS", "60")),
+    "max_cache_bytes": int(float(os.getenv("PDF_CACHE_MAX_MB", "200")) * 1024 * 1024)
 })
+job_queue = JobQueue(
+    max_workers=int(os.getenv("RESEARCH_WORKERS", "4")),
+    max_queue_size=int(os.getenv("RESEARCH_QUEUE_SIZE", "100"))
+)
 
-mongodb = None
-if mongo_uri := os.getenv("MONGODB_URI"):
-    try:
-        mongodb = MongoDBService(mongo_uri)
-        logger.info("MongoDB integration enabled")
-    except Exception as e:
-        logger.warning(f"Failed to initialize MongoDB: {e}. Continuing without persistence.")
+# Optional multi-process mode: graphs run in worker processes, sockets stay here
+worker_pool = None
+if (worker_processes := int(os.getenv("RESEARCH_WORKER_PROCESSES", "0"))) > 0:
+    worker_pool = ProcessWorkerPool(
+        processes=worker_processes,
+        websocket_manager=manager,
+        jobs_per_process=-(-job_queue.max_workers // worker_processes)
+    )
+
+# Job status entries, evicted once finished; reports are offloaded to the job store
+job_store_dir = os.getenv("JOB_STORE_DIR", "job_store")
+job_status = JobRegistry(
+    ttl_seconds=float(os.getenv("JOB_STATUS_TTL_SECONDS", "3600")),
+    max_entries=int(os.getenv("JOB_STATUS_MAX_ENTRIES", "5000")),
+    store=FileJobStore(
+        job_store_dir,
+        max_age_seconds=float(os.getenv("JOB_STORE_MAX_AGE_HOURS", "168")) * 3600,
+        max_files=int(os.getenv("JOB_STORE_MAX_FILES", "20000"))
+    ) if job_store_dir else None
+)
+
+# Running jobs by request fingerprint, for attaching duplicate requests
+inflight = InFlightRegistry()
+
+# Running jobs whose own requester cancelled while duplicates still wait on the run
+detached_runs = set()
+
+# Latest completed job per request fingerprint, for report reuse without a database
+latest_reports = {}
+
+# Batch runs keyed by batch_id: job manifest and aggregate counters; finished ones are evicted
+batches = {}
+BATCH_TTL_SECONDS = float(os.getenv("BATCH_TTL_SECONDS", os.getenv("JOB_STATUS_TTL_SECONDS", "3600")))
+BATCH_MAX_ENTRIES = int(os.getenv("BATCH_MAX_ENTRIES", "200"))
+
+# Optionally cancel jobs nobody is watching any more
+AUTO_CANCEL_ON_DISCONNECT = os.getenv("AUTO_CANCEL_ON_DISCONNECT", "false").lower() == "true"
+AUTO_CANCEL_GRACE_SECONDS = float(os.getenv("AUTO_CANCEL_GRACE_SECONDS", "30"))
+
+# Job and report persistence: MongoDB when MONGODB_URI is set, embedded SQLite otherwise
+storage = None
+try:
+    if storage := create_storage():
+        logger.info(f"Persistence enabled ({storage.name})")
+except Exception as e:
+    logger.warning(f"Failed to initialize storage: {e}. Continuing without persistence.")
+
+# Full-text index over completed reports and their curated documents
+search_index = create_search_index()
 
 class ResearchRequest(BaseModel):
     company: str
     company_url: str | None = None
     industry: str | None = None
     hq_location: str | None = None
+    progressive: bool | None = None
+    force_fresh: bool = False
+    time_budget_seconds: float | None = Field(default=None, gt=0)
+    depth: Literal["quick", "standard", "deep"] | None = None
+
+class BatchResearchRequest(BaseModel):
+    requests: list[ResearchRequest] = Field(..., min_length=1)
+    parallelism: int | None = Field(default=None, ge=1)
 
 class PDFGenerationRequest(BaseModel):
     report_content: str
     company_name: str | None = None
 
+@app.on_event("startup")
+async def start_job_queue():
+    await manager.start()
+    if storage:
+        await storage.start()
+    if search_index:
+        await search_index.start(storage)
+    if worker_pool:
+        await worker_pool.start()
+    await job_queue.start()
+
+@app.on_event("shutdown")
+async def stop_job_queue():
+    await job_queue.stop()
+    if worker_pool:
+        await worker_pool.stop()
+    await manager.close()
+    if storage:
+        await storage.close()
+    if search_index:
+        await search_index.close()
+    pdf_service.close()
+
 @app.options("/research")
 async def preflight():
     response = JSONResponse(content=None, status_code=200)
@@ -83,13 +167,40 @@ async def research(data: ResearchRequest):
     try:
         logger.info(f"Received research request for {data.company}")
         job_id = str(uuid.uuid4())
-        asyncio.create_task(process_research(job_id, data))
+        fingerprint = request_fingerprint(data.dict())
+
+        if not data.force_fresh and (cached := await find_reusable_report(fingerprint)):
+            return await serve_cached_report(job_id, fingerprint, data, cached)
+
+        if not data.force_fresh and (leader_id := inflight.leader_for(fingerprint)):
+            return attach_duplicate(job_id, leader_id, data)
+
+        try:
+            position = job_queue.submit(job_id, lambda: process_research(job_id, data))
+        except QueueFullError as e:
+            logger.warning(f"Rejecting research request for {data.company}: {e}")
+            response = JSONResponse(
+                status_code=429,
+                content={"status": "rejected", "message": str(e)}
+            )
+            response.headers["Retry-After"] = str(int(job_queue.estimated_wait(1) or 30))
+            response.headers["Access-Control-Allow-Origin"] = "*"
+            return response
+
+        inflight.register(fingerprint, job_id)
+        job_status.update(job_id, {
+            "status": "queued",
+            "company": data.company,
+            "last_update": datetime.now().isoformat()
+        })
 
         response = JSONResponse(content={
             "status": "accepted",
             "job_id": job_id,
-            "message": "Research started. Connect to WebSocket for updates.",
-            "websocket_url": f"/research/ws/{job_id}"
+            "message": "Research queued. Connect to WebSocket for updates.",
+            "websocket_url": f"/research/ws/{job_id}",
+            "queue_position": position,
+            "estimated_wait_seconds": job_queue.estimated_wait(position)
         })
         response.headers["Access-Control-Allow-Origin"] = "*"
         response.headers["Access-Control-Allow-Methods"] = "POST, OPTIONS"
@@ -100,100 +211,580 @@ async def research(data: ResearchRequest):
         logger.error(f"Error initiating research: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-async def process_research(job_id: str, data: ResearchRequest):
+async def find_reusable_report(fingerprint: str) -> dict | None:
+    """Most recent stored report for a fingerprint, if young enough to serve at all."""
+    cached = None
+    if storage:
+        if stored := await storage.find_latest_report(fingerprint):
+            cached = {
+                "job_id": stored["job_id"],
+                "report": stored.get("report_content"),
+                "age_seconds": (datetime.utcnow() - stored["created_at"]).total_seconds()
+            }
+    elif source_id := latest_reports.get(fingerprint):
+        if source := await job_status.fetch(source_id):
+            cached = {
+                "job_id": source_id,
+                "report": await job_status.load(source_id, "report"),
+                "age_seconds": time.time() - source["completed_at"]
+            }
+        else:
+            # The source job was evicted without a store to load it back from
+            latest_reports.pop(fingerprint, None)
+
+    max_age = float(os.getenv("REPORT_REUSE_MAX_AGE_HOURS", "720")) * 3600
+    if not cached or not cached["report"] or cached["age_seconds"] > max_age:
+        return None
+    return cached
+
+async def load_baseline(job_id: str) -> dict | None:
+    """A completed job's inputs and reusable artifacts, for incremental refresh."""
+    if (source := await job_status.fetch(job_id)) and (artifacts := await job_status.load(job_id, "artifacts")):
+        return {
+            "job_id": job_id,
+            "inputs": source["inputs"],
+            "artifacts": artifacts,
+            "completed_at": source["completed_at"]
+        }
+    if not storage or not (stored := await storage.get_report(job_id)):
+        return None
+    # Reports stored before artifacts had their own records kept them inline
+    if artifacts := await storage.load_artifacts(job_id) or stored.get("artifacts"):
+        job = await storage.get_job(job_id) or {}
+        return {
+            "job_id": job_id,
+            "inputs": job.get("inputs") or {"company": stored.get("company")},
+            "artifacts": artifacts,
+            "completed_at": stored["created_at"].replace(tzinfo=timezone.utc).timestamp()
+        }
+    return None
+
+async def schedule_refresh(fingerprint: str, data: ResearchRequest, stale: list[str],
+                     source_job_id: str | None = None) -> str | None:
+    """Queue a background run that replaces a stale stored report.
+
+    When only news is stale the run is an incremental refresh on top of the
+    source job's artifacts; otherwise the whole pipeline runs again.
+    """
+    if leader_id := inflight.leader_for(fingerprint):
+        return leader_id
+    baseline = None
+    if source_job_id and set(stale) <= {"news"}:
+        baseline = await load_baseline(source_job_id)
+        # Another request may have scheduled the refresh while the baseline loaded
+        if leader_id := inflight.leader_for(fingerprint):
+            return leader_id
+    refresh_id = str(uuid.uuid4())
+    try:
+        job_queue.submit(refresh_id, lambda: process_research(refresh_id, data, baseline=baseline))
+    except QueueFullError:
+        logger.warning(f"Queue full, skipping background refresh for {data.company}")
+        return None
+    inflight.register(fingerprint, refresh_id)
+    job_status.update(refresh_id, {
+        "status": "queued",
+        "company": data.company,
+        "last_update": datetime.now().isoformat()
+    })
+    logger.info(
+        f"Scheduled {'incremental' if baseline else 'full'} background refresh {refresh_id} for {data.company}"
+    )
+    return refresh_id
+
+async def serve_cached_report(job_id: str, fingerprint: str, data: ResearchRequest, cached: dict) -> JSONResponse:
+    """Answer from storage immediately, revalidating in the background when stale."""
+    stale = stale_categories(cached["age_seconds"])
+    refresh_job_id = await schedule_refresh(fingerprint, data, stale, cached["job_id"]) if stale else None
+    logger.info(
+        f"Serving stored report {cached['job_id']} for {data.company} "
+        f"(age {cached['age_seconds']:.0f}s, stale: {stale or 'none'})"
+    )
+
+    job_status.update(job_id, {
+        "status": "completed",
+        "company": data.company,
+        "report": cached["report"],
+        "result": {"report": cached["report"], "company": data.company},
+        "reused_from": cached["job_id"],
+        "completed_at": time.time(),
+        "last_update": datetime.now().isoformat()
+    })
+
+    response = JSONResponse(content={
+        "status": "completed",
+        "job_id": job_id,
+        "message": "Served stored report" + (" while refreshing stale sections" if stale else ""),
+        "websocket_url": f"/research/ws/{job_id}",
+        "report": cached["report"],
+        "cached": True,
+        "source_job_id": cached["job_id"],
+        "age_seconds": round(cached["age_seconds"]),
+        "stale_categories": stale,
+        "refresh_job_id": refresh_job_id
+    })
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    response.headers["Access-Control-Allow-Methods"] = "POST, OPTIONS"
+    response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
+    return response
+
+def attach_duplicate(job_id: str, leader_id: str, data: ResearchRequest) -> JSONResponse:
+    """Give a duplicate request its own job ID bound to the already-running job."""
+    inflight.attach(leader_id, job_id)
+    manager.link_job(job_id, leader_id)
+    job_status.update(job_id, {
+        "status": "processing" if leader_id in detached_runs else job_status[leader_id]["status"],
+        "company": data.company,
+        "duplicate_of": leader_id,
+        "last_update": datetime.now().isoformat()
+    })
+    if storage:
+        storage.create_job(job_id, {**data.dict(), "duplicate_of": leader_id})
+
+    position = job_queue.position(leader_id)
+    response = JSONResponse(content={
+        "status": "accepted",
+        "job_id": job_id,
+        "message": "Identical research already in progress. Connect to WebSocket for updates.",
+        "websocket_url": f"/research/ws/{job_id}",
+        "deduplicated": True,
+        "attached_to": leader_id,
+        "queue_position": position,
+        "estimated_wait_seconds": job_queue.estimated_wait(position) if position else None
+    })
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    response.headers["Access-Control-Allow-Methods"] = "POST, OPTIONS"
+    response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
+    return response
+
+def complete_followers(leader_id: str, status: str, report: str | None = None, error: str | None = None):
+    """Hand a finished job's outcome to the duplicate jobs attached to it."""
+    for follower_id in inflight.release(leader_id):
+        follower = job_status.update(follower_id, {
+            "status": status,
+            "report": report,
+            "error": error,
+            "last_update": datetime.now().isoformat()
+        })
+        if storage:
+            storage.update_job(job_id=follower_id, status=status, error=error)
+            if report:
+                # Marked as a copy, so search backfill doesn't index the leader's report again
+                storage.store_report(job_id=follower_id, report_data={
+                    "report": report,
+                    "company": follower.get("company"),
+                    "duplicate_of": leader_id
+                })
+
+def evict_batches():
+    """Drop finished batches past BATCH_TTL_SECONDS, then the oldest finished ones beyond BATCH_MAX_ENTRIES."""
+    cutoff = (datetime.now() - timedelta(seconds=BATCH_TTL_SECONDS)).isoformat()
+    # Dicts keep insertion order, so finished batches come oldest first
+    finished = [batch_id for batch_id, batch in batches.items() if batch.get("finished_at")]
+    expired = [batch_id for batch_id in finished if batches[batch_id]["finished_at"] < cutoff]
+    over_cap = [batch_id for batch_id in finished if batch_id not in expired]
+    for batch_id in expired + over_cap[:max(0, len(batches) - len(expired) - BATCH_MAX_ENTRIES)]:
+        del batches[batch_id]
+
+@app.post("/research/batch")
+async def research_batch(data: BatchResearchRequest):
+    max_batch = int(os.getenv("RESEARCH_BATCH_MAX", "500"))
+    if len(data.requests) > max_batch:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {max_batch} companies")
+
+    batch_id = str(uuid.uuid4())
+    parallelism = data.parallelism or int(os.getenv("RESEARCH_BATCH_PARALLELISM", "4"))
+    jobs = [
+        {"job_id": str(uuid.uuid4()), "company": request.company, "status": "pending"}
+        for request in data.requests
+    ]
+    # Registered up front so jobs still waiting for a batch slot can be looked up and cancelled
+    for entry in jobs:
+        job_status.update(entry["job_id"], {
+            "status": "queued",
+            "company": entry["company"],
+            "batch_id": batch_id,
+            "last_update": datetime.now().isoformat()
+        })
+    evict_batches()
+    batches[batch_id] = {
+        "batch_id": batch_id,
+        "status": "running",
+        "parallelism": parallelism,
+        "total": len(jobs),
+        "completed": 0,
+        "failed": 0,
+        "cancelled": 0,
+        "created_at": datetime.now().isoformat(),
+        "jobs": jobs
+    }
+    asyncio.create_task(process_batch(batch_id, data.requests, parallelism))
+    logger.info(f"Accepted batch {batch_id} with {len(jobs)} companies (parallelism {parallelism})")
+
+    response = JSONResponse(content={
+        "status": "accepted",
+        "batch_id": batch_id,
+        "total": len(jobs),
+        "jobs": jobs,
+        "websocket_url": f"/research/batch/ws/{batch_id}",
+        "manifest_url": f"/research/batch/{batch_id}"
+    })
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+async def process_batch(batch_id: str, requests: list[ResearchRequest], parallelism: int):
+    """Feed a batch into the job queue, keeping at most `parallelism` of its jobs admitted."""
+    batch = batches[batch_id]
+    slots = asyncio.Semaphore(parallelism)
+
+    async def run_job(entry: dict, request: ResearchRequest):
+        try:
+            entry["status"] = "processing"
+            await process_research(entry["job_id"], request, batch_id=batch_id)
+        finally:
+            slots.release()
+            status = (job_status.get(entry["job_id"]) or {}).get("status")
+            entry["status"] = status if status in ("completed", "cancelled") else "failed"
+            batch[entry["status"]] += 1
+        await manager.send_status_update(
+            job_id=batch_id,
+            status="batch_progress",
+            message=f"{entry['company']}: {entry['status']}",
+            result={
+                "job_id": entry["job_id"],
+                "company": entry["company"],
+                "job_status": entry["status"],
+                "completed": batch["completed"],
+                "failed": batch["failed"],
+                "cancelled": batch["cancelled"],
+                "total": batch["total"]
+            }
+        )
+        return entry["status"]
+
+    for entry, request in zip(batch["jobs"], requests):
+        await slots.acquire()
+        while True:
+            try:
+                job_queue.submit(entry["job_id"], lambda e=entry, r=request: run_job(e, r))
+                entry["status"] = "queued"
+                break
+            except QueueFullError:
+                await asyncio.sleep(1)
+
+    # Wait for the last admitted jobs to finish
+    for _ in range(parallelism):
+        await slots.acquire()
+
+    batch["status"] = "completed"
+    batch["finished_at"] = datetime.now().isoformat()
+    await manager.send_status_update(
+        job_id=batch_id,
+        status="batch_complete",
+        message=f"Batch finished: {batch['completed']}/{batch['total']} reports",
+        result={
+            "completed": batch["completed"],
+            "failed": batch["failed"],
+            "cancelled": batch["cancelled"],
+            "total": batch["total"],
+            "jobs": batch["jobs"],
+            "cache": shared_cache.stats()
+        }
+    )
+    evict_batches()
+
+def update_run(job_id: str, fields: dict) -> None:
+    """Record a running job's state; a requester that left the run keeps its cancelled status."""
+    if job_id in detached_runs:
+        fields = {**{key: value for key, value in fields.items() if key != "error"}, "status": "cancelled"}
+    job_status.update(job_id, fields)
+
+async def process_research(job_id: str, data: ResearchRequest, batch_id: str | None = None,
+                           baseline: dict | None = None, resume: bool = False) -> str:
+    """Run one research job and record its outcome; returns the final status for the job queue."""
     try:
-        if mongodb:
-            mongodb.create_job(job_id, data.dict())
-        await asyncio.sleep(1)  # Allow WebSocket connection
-
-        await manager.send_status_update(job_id, status="processing", message="Starting research")
-
-        graph = Graph(
-            company=data.company,
-            url=data.company_url,
-            industry=data.industry,
-            hq_location=data.hq_location,
-            websocket_manager=manager,
-            job_id=job_id
+        job_inputs = {**data.dict(), "refresh_from": baseline["job_id"] if baseline else None}
+        if (job_status.get(job_id) or {}).get("status") == "cancelled" and job_id not in detached_runs:
+            # Cancelled while queued; only the bookkeeping is left to do
+            if storage and not resume:
+                storage.create_job(job_id, job_inputs)
+            await record_cancellation(job_id, job_status[job_id].get("error") or "Cancelled while queued")
+            return "cancelled"
+
+        update_run(job_id, {
+            "status": "processing",
+            "company": data.company,
+            "inputs": job_inputs,
+            "last_update": datetime.now().isoformat()
+        })
+        if storage and job_id not in detached_runs:
+            if resume:
+                storage.update_job(job_id=job_id, status="processing")
+            else:
+                storage.create_job(job_id, job_inputs)
+
+        await manager.send_status_update(
+            job_id,
+            status="processing",
+            message="Resuming research from last checkpoint" if resume else "Starting research"
         )
 
-        state = {}
-        async for s in graph.run(thread={}):
-            state.update(s)
-        
-        # Look for the compiled report in either location.
-        report_content = state.get('report') or (state.get('editor') or {}).get('report')
-        if report_content:
-            logger.info(f"Found report in final state (length: {len(report_content)})")
-            job_status[job_id].update({
+        inputs = data.dict()
+        inputs["batch_id"] = batch_id
+        inputs["baseline"] = baseline
+        inputs["resume"] = resume
+        if inputs.get("progressive") is None:
+            inputs["progressive"] = os.getenv("PROGRESSIVE_SECTIONS", "false").lower() == "true"
+
+        if worker_pool:
+            outcome = await worker_pool.run(job_id, inputs)
+        else:
+            outcome = await run_research(job_id, inputs, manager)
+
+        degradations = outcome.get("degradations") or []
+        if degradations:
+            logger.info(f"Job {job_id} degraded to meet its time budget: {degradations}")
+
+        if report_content := outcome.get("report"):
+            fingerprint = request_fingerprint(data.dict())
+            update_run(job_id, {
                 "status": "completed",
                 "report": report_content,
                 "company": data.company,
+                "completed_at": time.time(),
+                "artifacts": outcome.get("artifacts"),
+                "degradations": degradations,
                 "last_update": datetime.now().isoformat()
             })
-            if mongodb:
-                mongodb.update_job(job_id=job_id, status="completed")
-                mongodb.store_report(job_id=job_id, report_data={"report": report_content})
+            latest_reports[fingerprint] = job_id
+            if storage:
+                if job_id not in detached_runs:
+                    storage.update_job(
+                        job_id=job_id,
+                        status="completed",
+                        result={"degradations": degradations} if degradations else None
+                    )
+                artifacts = outcome.get("artifacts") or {}
+                storage.store_report(job_id=job_id, report_data={
+                    "report": report_content,
+                    "fingerprint": fingerprint,
+                    "company": data.company,
+                    "references": artifacts.get("references", []),
+                    "sections_completed": [
+                        category for category, briefing in (artifacts.get("briefings") or {}).items() if briefing
+                    ],
+                    "analyst_queries": artifacts.get("queries", {})
+                })
+                if artifacts:
+                    storage.store_artifacts(job_id, artifacts)
+            asyncio.create_task(pdf_service.prerender(report_content, data.company))
+            if search_index:
+                asyncio.create_task(search_index.index_job(
+                    job_id, data.company, report_content, outcome.get("artifacts")
+                ))
+            complete_followers(job_id, "completed", report=report_content)
             await manager.send_status_update(
                 job_id=job_id,
                 status="completed",
                 message="Research completed successfully",
                 result={
                     "report": report_content,
-                    "company": data.company
+                    "company": data.company,
+                    "degradations": degradations
                 }
             )
+            return "completed"
         else:
-            logger.error(f"Research completed without finding report. State keys: {list(state.keys())}")
-            logger.error(f"Editor state: {state.get('editor', {})}")
-            
-            # Check if there was a specific error in the state
-            error_message = "No report found"
-            if error := state.get('error'):
-                error_message = f"Error: {error}"
-            
+            error_message = outcome.get("error") or "No report found"
+            update_run(job_id, {
+                "status": "failed",
+                "error": error_message,
+                "degradations": degradations,
+                "last_update": datetime.now().isoformat()
+            })
+            if storage:
+                if job_id not in detached_runs:
+                    storage.update_job(job_id=job_id, status="failed", error=error_message)
+                if timings := outcome.get("timings"):
+                    storage.store_artifacts(job_id, {"timings": timings})
+            complete_followers(job_id, "failed", error=error_message)
             await manager.send_status_update(
                 job_id=job_id,
                 status="failed",
                 message="Research completed but no report was generated",
                 error=error_message
             )
+            return "failed"
 
+    except asyncio.CancelledError:
+        await record_cancellation(job_id, (job_status.get(job_id) or {}).get("error") or "Research cancelled")
+        raise
     except Exception as e:
         logger.error(f"Research failed: {str(e)}")
+        update_run(job_id, {
+            "status": "failed",
+            "error": str(e),
+            "last_update": datetime.now().isoformat()
+        })
+        complete_followers(job_id, "failed", error=str(e))
         await manager.send_status_update(
             job_id=job_id,
             status="failed",
             message=f"Research failed: {str(e)}",
             error=str(e)
         )
-        if mongodb:
-            mongodb.update_job(job_id=job_id, status="failed", error=str(e))
+        if storage and job_id not in detached_runs:
+            storage.update_job(job_id=job_id, status="failed", error=str(e))
+        return "failed"
+    finally:
+        inflight.release(job_id)
+        manager.unlink_job(job_id)
+        detached_runs.discard(job_id)
+
+async def record_cancellation(job_id: str, reason: str):
+    """Mark a job and its attached duplicates cancelled and tell their clients."""
+    logger.info(f"Research job {job_id} cancelled: {reason}")
+    job_status.update(job_id, {
+        "status": "cancelled",
+        "error": reason,
+        "last_update": datetime.now().isoformat()
+    })
+    if storage:
+        storage.update_job(job_id=job_id, status="cancelled", error=reason)
+    complete_followers(job_id, "cancelled", error=reason)
+    await manager.send_status_update(
+        job_id=job_id,
+        status="cancelled",
+        message="Research cancelled",
+        error=reason
+    )
+
+def cancel_job(job_id: str, reason: str, keep_shared: bool = True) -> bool:
+    """Abort a queued or running job; returns False if there was nothing to cancel.
+
+    A run other requests are attached to keeps going for them: a duplicate is
+    only detached, and a job with duplicates attached is marked cancelled and
+    its clients released while the run continues. keep_shared=False stops the
+    run and cancels everyone on it, for runs nobody is watching any more.
+    """
+    if job_id in detached_runs:
+        if keep_shared:
+            return False
+        job_queue.cancel(job_id)
+        return True
+    job = job_status.get(job_id)
+    if not job or job["status"] not in ("queued", "processing"):
+        return False
+
+    if leader_id := job.get("duplicate_of"):
+        inflight.detach(leader_id, job_id)
+        manager.linked_jobs.get(leader_id, set()).discard(job_id)
+        job_status.update(job_id, {
+            "status": "cancelled",
+            "error": reason,
+            "last_update": datetime.now().isoformat()
+        })
+        if storage:
+            storage.update_job(job_id=job_id, status="cancelled", error=reason)
+        # The last duplicate leaving a run its own requester already left stops it
+        if leader_id in detached_runs and not inflight.followers_of(leader_id):
+            job_queue.cancel(leader_id)
+        return True
+
+    job_status.update(job_id, {
+        "status": "cancelled",
+        "error": reason,
+        "last_update": datetime.now().isoformat()
+    })
+    if keep_shared and inflight.followers_of(job_id):
+        detached_runs.add(job_id)
+        if storage:
+            storage.update_job(job_id=job_id, status="cancelled", error=reason)
+        manager.release_clients(job_id, "cancelled", message="Research cancelled", error=reason)
+        logger.info(f"Research job {job_id} cancelled, its run continues for attached duplicates")
+        return True
+    job_queue.cancel(job_id)
+    return True
+
+def schedule_auto_cancel(job_id: str):
+    """Cancel a job once it has had no clients for the grace period."""
+    if not AUTO_CANCEL_ON_DISCONNECT or job_id not in job_status:
+        return
+    leader_id = job_status[job_id].get("duplicate_of") or job_id
+
+    async def cancel_if_abandoned():
+        await asyncio.sleep(AUTO_CANCEL_GRACE_SECONDS)
+        if manager.connection_count(leader_id) == 0:
+            cancel_job(leader_id, f"No clients connected for {AUTO_CANCEL_GRACE_SECONDS:g}s", keep_shared=False)
+
+    asyncio.create_task(cancel_if_abandoned())
+
+manager.on_job_idle = schedule_auto_cancel
+
 @app.get("/")
 async def ping():
     return {"message": "Alive"}
 
+@app.get("/stats")
+async def get_stats():
+    return {
+        "queue": job_queue.stats(),
+        "worker_processes": worker_pool.stats() if worker_pool else None,
+        "research_cache": shared_cache.stats(),
+        "deduplication": inflight.stats(),
+        "jobs": job_status.stats(),
+        "websockets": manager.stats(),
+        "storage": storage.stats() if storage else None,
+        "search": search_index.stats() if search_index else None,
+        "pdf": pdf_service.stats()
+    }
+
+@app.get("/research/queue/{job_id}")
+async def get_queue_position(job_id: str):
+    position = job_queue.position(job_id)
+    if position is None:
+        raise HTTPException(status_code=404, detail="Job is not queued or running")
+    return {
+        "job_id": job_id,
+        "queue_position": position,
+        "estimated_wait_seconds": job_queue.estimated_wait(position)
+    }
+
+def pdf_response(request: Request, path: str, key: str, filename: str):
+    """Serve a cached PDF; its cache key is the ETag, so unchanged reports answer 304."""
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=0, must-revalidate"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type='application/pdf', filename=filename, headers=headers)
+
 @app.get("/research/pdf/{filename}")
-async def get_pdf(filename: str):
-    pdf_path = os.path.join("pdfs", filename)
-    if not os.path.exists(pdf_path):
+async def get_pdf(filename: str, request: Request):
+    """A cached PDF by its file name, `<cache key>.pdf`."""
+    key = os.path.splitext(os.path.basename(filename))[0]
+    if not (pdf_path := pdf_service.cached(key)):
         raise HTTPException(status_code=404, detail="PDF not found")
-    return FileResponse(pdf_path, media_type='application/pdf', filename=filename)
+    return pdf_response(request, pdf_path, key, filename)
 
 @app.websocket("/research/ws/{job_id}")
-async def websocket_endpoint(websocket: WebSocket, job_id: str):
+async def websocket_endpoint(websocket: WebSocket, job_id: str, since: int = 0, encoding: str = "json"):
+    """Stream a job's events, replaying buffered ones with a sequence number above `since`.
+
+    encoding=msgpack sends binary msgpack frames instead of JSON text when msgpack is installed.
+    """
     try:
         await websocket.accept()
-        await manager.connect(websocket, job_id)
+        status = await job_status.fetch(job_id)
+        leader_id = (status or {}).get("duplicate_of")
+        await manager.connect(websocket, job_id, since=since, replay_from=leader_id, encoding=encoding)
 
-        if job_id in job_status:
-            status = job_status[job_id]
-            await manager.send_status_update(
-                job_id,
+        # Only the process running a job numbers its events, so this goes to the new client alone
+        if status:
+            manager.send_direct(
+                [websocket],
                 status=status["status"],
                 message="Connected to status stream",
                 error=status["error"],
-                result=status["result"]
+                result=await job_status.load(job_id, "result")
             )
 
         while True:
@@ -207,47 +798,254 @@ async def websocket_endpoint(websocket: WebSocket, job_id: str):
         logger.error(f"WebSocket error for job {job_id}: {str(e)}", exc_info=True)
         manager.disconnect(websocket, job_id)
 
+@app.get("/research/{job_id}/events")
+async def stream_research_events(job_id: str, request: Request, since: int = 0):
+    """Stream a job's events as Server-Sent Events.
+
+    Buffered events are replayed first, starting after the Last-Event-ID
+    header a reconnecting EventSource sends, or after `since`.
+    """
+    job = await job_status.fetch(job_id)
+    if not job and not manager.has_events(job_id):
+        raise HTTPException(status_code=404, detail="Research job not found")
+    try:
+        since = int(request.headers.get("last-event-id", since))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Last-Event-ID must be an event sequence number")
+    leader_id = (job or {}).get("duplicate_of")
+    return StreamingResponse(
+        manager.stream(job_id, since=since, replay_from=leader_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop nginx-style proxies from buffering the stream
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+@app.get("/research/batch/{batch_id}")
+async def get_batch(batch_id: str):
+    if not (batch := batches.get(batch_id)):
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return {
+        **batch,
+        "jobs": [
+            {**entry, "report_url": f"/research/{entry['job_id']}/report" if entry["status"] == "completed" else None}
+            for entry in batch["jobs"]
+        ]
+    }
+
+@app.websocket("/research/batch/ws/{batch_id}")
+async def batch_websocket_endpoint(websocket: WebSocket, batch_id: str, since: int = 0, encoding: str = "json"):
+    try:
+        await websocket.accept()
+        await manager.connect(websocket, batch_id, since=since, encoding=encoding)
+
+        if batch := batches.get(batch_id):
+            manager.send_direct(
+                [websocket],
+                status="batch_" + batch["status"],
+                message="Connected to batch progress stream",
+                result={key: batch[key] for key in ("completed", "failed", "cancelled", "total")}
+            )
+
+        while True:
+            try:
+                await websocket.receive_text()
+            except WebSocketDisconnect:
+                manager.disconnect(websocket, batch_id)
+                break
+
+    except Exception as e:
+        logger.error(f"WebSocket error for batch {batch_id}: {str(e)}", exc_info=True)
+        manager.disconnect(websocket, batch_id)
+
+@app.post("/research/{job_id}/refresh")
+async def refresh_research(job_id: str):
+    """Re-run only the news research on top of a completed job and re-edit the report."""
+    if not (baseline := await load_baseline(job_id)):
+        raise HTTPException(status_code=404, detail="No stored research artifacts for this job")
+
+    data = ResearchRequest(**{
+        key: value for key, value in baseline["inputs"].items()
+        if key in ResearchRequest.model_fields
+    })
+    refresh_id = str(uuid.uuid4())
+    try:
+        position = job_queue.submit(refresh_id, lambda: process_research(refresh_id, data, baseline=baseline))
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    inflight.register(request_fingerprint(data.dict()), refresh_id)
+    job_status.update(refresh_id, {
+        "status": "queued",
+        "company": data.company,
+        "refresh_from": job_id,
+        "last_update": datetime.now().isoformat()
+    })
+    return {
+        "status": "accepted",
+        "job_id": refresh_id,
+        "refresh_from": job_id,
+        "message": "Incremental refresh queued. Connect to WebSocket for updates.",
+        "websocket_url": f"/research/ws/{refresh_id}",
+        "queue_position": position
+    }
+
+@app.post("/research/{job_id}/resume")
+async def resume_research(job_id: str):
+    """Continue a failed job from the last node that completed before the failure."""
+    if not checkpoint_path():
+        raise HTTPException(status_code=501, detail="Checkpointing not configured")
+    if job_queue.position(job_id) is not None:
+        raise HTTPException(status_code=409, detail="Research job is still queued or running")
+
+    inputs = None
+    if (job := await job_status.fetch(job_id)) and job.get("inputs"):
+        if job["status"] == "completed":
+            raise HTTPException(status_code=409, detail="Research job already completed")
+        inputs = job["inputs"]
+    elif storage and (stored := await storage.get_job(job_id)):
+        if stored.get("status") == "completed":
+            raise HTTPException(status_code=409, detail="Research job already completed")
+        inputs = stored.get("inputs")
+    if not inputs:
+        raise HTTPException(status_code=404, detail="Research job not found")
+
+    # Refresh jobs rebuild their refresh graph; its state comes from the checkpoint
+    baseline = await load_baseline(inputs["refresh_from"]) if inputs.get("refresh_from") else None
+    data = ResearchRequest(**{
+        key: value for key, value in inputs.items()
+        if key in ResearchRequest.model_fields
+    })
+    try:
+        position = job_queue.submit(
+            job_id,
+            lambda: process_research(job_id, data, baseline=baseline, resume=True)
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    inflight.register(request_fingerprint(data.dict()), job_id)
+    job_status.update(job_id, {
+        "status": "queued",
+        "error": None,
+        "last_update": datetime.now().isoformat()
+    })
+    return {
+        "status": "accepted",
+        "job_id": job_id,
+        "message": "Research resume queued. Connect to WebSocket for updates.",
+        "websocket_url": f"/research/ws/{job_id}",
+        "queue_position": position
+    }
+
+@app.delete("/research/{job_id}")
+async def cancel_research(job_id: str):
+    """Cancel a queued or running job, aborting its in-flight provider calls."""
+    if not await job_status.fetch(job_id):
+        raise HTTPException(status_code=404, detail="Research job not found")
+    if not cancel_job(job_id, "Cancelled by client"):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Research job is already {job_status[job_id]['status']}"
+        )
+    return {
+        "status": "cancelled",
+        "job_id": job_id
+    }
+
+@app.get("/research/history")
+async def research_history(company: str | None = None, status: str | None = None,
+                           before: datetime | None = None, limit: int = Query(50, ge=1, le=500)):
+    """Stored jobs, newest first; pass the last job's created_at as `before` for the next page."""
+    if not storage:
+        raise HTTPException(status_code=501, detail="Database persistence not configured")
+    jobs = await storage.list_jobs(company=company, status=status, before=before, limit=limit)
+    return {
+        "jobs": jobs,
+        "next_before": jobs[-1]["created_at"] if len(jobs) == limit else None
+    }
+
+@app.get("/search")
+async def search_reports(q: str = Query(..., min_length=1), kind: Literal["report", "document"] | None = None,
+                         company: str | None = None, limit: int = Query(20, ge=1, le=100)):
+    """Past report sections and curated documents matching every term of `q`, best first."""
+    if not search_index:
+        raise HTTPException(status_code=501, detail="Search index not configured")
+    started = time.perf_counter()
+    hits = await search_index.search(q, kind=kind, company=company, limit=limit)
+    return {
+        "query": q,
+        "hits": hits,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
 @app.get("/research/{job_id}")
 async def get_research(job_id: str):
-    if not mongodb:
+    if not storage:
         raise HTTPException(status_code=501, detail="Database persistence not configured")
-    job = mongodb.get_job(job_id)
+    job = await storage.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Research job not found")
     return job
 
+@app.get("/research/{job_id}/artifacts")
+async def get_research_artifacts(job_id: str, kind: str | None = None):
+    """Stored artifact records for a job, optionally only one kind (briefing, curated, queries, references, timings)."""
+    if not storage:
+        raise HTTPException(status_code=501, detail="Database persistence not configured")
+    return {"job_id": job_id, "artifacts": await storage.get_artifacts(job_id, kind)}
+
 @app.get("/research/{job_id}/report")
 async def get_research_report(job_id: str):
-    if not mongodb:
-        if job_id in job_status:
-            result = job_status[job_id]
-            if report := result.get("report"):
-                return {"report": report}
+    if not storage:
+        if report := await job_status.load(job_id, "report"):
+            return {"report": report}
         raise HTTPException(status_code=404, detail="Report not found")
     
-    report = mongodb.get_report(job_id)
+    report = await storage.get_report(job_id)
     if not report:
         raise HTTPException(status_code=404, detail="Research report not found")
     return report
 
-@app.post("/generate-pdf")
-async def generate_pdf(data: PDFGenerationRequest):
-    """Generate a PDF from markdown content and stream it to the client."""
+async def serve_pdf(request: Request, report_content: str, company_name: str | None):
+    # Revalidation needs no render, or even a cached file
+    etag = f'"{pdf_cache_key(report_content)}"'
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers={"ETag": etag})
     try:
-        success, result = pdf_service.generate_pdf_stream(data.report_content, data.company_name)
-        if success:
-            pdf_buffer, filename = result
-            return StreamingResponse(
-                pdf_buffer,
-                media_type='application/pdf',
-                headers={
-                    'Content-Disposition': f'attachment; filename="{filename}"'
-                }
-            )
-        else:
-            raise HTTPException(status_code=500, detail=result)
+        path, key, filename = await pdf_service.get_or_render(report_content, company_name)
+    except QueueFullError as e:
+        logger.warning(f"Rejecting PDF request: {e}")
+        return JSONResponse(
+            status_code=429,
+            content={"status": "rejected", "message": str(e)},
+            headers={"Retry-After": "5"}
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="PDF generation timed out")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.error(f"Error generating PDF: {e}")
+        raise HTTPException(status_code=500, detail=f"Error generating PDF: {e}")
+    return pdf_response(request, path, key, filename)
+
+@app.post("/generate-pdf")
+async def generate_pdf(data: PDFGenerationRequest, request: Request):
+    """Generate a PDF from markdown content, or serve it from the cache."""
+    return await serve_pdf(request, data.report_content, data.company_name)
+
+@app.get("/research/{job_id}/pdf")
+async def get_research_pdf(job_id: str, request: Request):
+    """PDF of a completed job's report, usually pre-rendered when the job finished."""
+    entry = await job_status.fetch(job_id) or {}
+    report = await job_status.load(job_id, "report")
+    if not report and storage and (stored := await storage.get_report(job_id)):
+        report = stored.get("report_content")
+        entry = {"company": stored.get("company")}
+    if not report:
+        raise HTTPException(status_code=404, detail="Research report not found")
+    return await serve_pdf(request, report, entry.get("company"))
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,6 +1,19 @@
-from typing import TypedDict, NotRequired, Required, Dict, List, Any
+from typing import Annotated, TypedDict, NotRequired, Required, Dict, List, Any
 from backend.services.websocket_manager import WebSocketManager
 
+
+def merge_queries(left: Dict[str, List[str]] | None, right: Dict[str, List[str]] | None) -> Dict[str, List[str]]:
+    """Merge per-category query lists from parallel researchers, dropping repeats.
+
+    Nodes that hand back the whole state write the same queries again, so the
+    merge has to be idempotent.
+    """
+    merged = {category: list(queries) for category, queries in (left or {}).items()}
+    for category, queries in (right or {}).items():
+        existing = merged.setdefault(category, [])
+        existing.extend(query for query in queries if query not in existing)
+    return merged
+
 #Define the input state
 class InputState(TypedDict, total=False):
     company: Required[str]
@@ -9,6 +22,10 @@ class InputState(TypedDict, total=False):
     industry: NotRequired[str]
     websocket_manager: NotRequired[WebSocketManager]
     job_id: NotRequired[str]
+    progressive: NotRequired[bool]
+    batch_id: NotRequired[str]
+    baseline: NotRequired[Dict[str, Any]]
+    depth: NotRequired[str]
 
 class ResearchState(InputState):
     site_scrape: Dict[str, Any]
@@ -26,5 +43,10 @@ class ResearchState(InputState):
     industry_briefing: str
     company_briefing: str
     references: List[str]
+    reference_info: Dict[str, Any]
+    reference_titles: Dict[str, str]
     briefings: Dict[str, Any]
-    report: str
\ No newline at end of file
+    reused_categories: List[str]
+    news_since: float
+    report: str
+    analyst_queries: Annotated[Dict[str, List[str]], merge_queries]
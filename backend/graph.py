@@ -1,11 +1,14 @@
 import logging
-from typing import Any, AsyncIterator, Dict
+import time
+from functools import wraps
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
 
 from langchain_core.messages import SystemMessage
 from langgraph.graph import StateGraph
 
 from .classes.state import InputState
 from .nodes import GroundingNode
+from .nodes.baseline import Baseline
 from .nodes.briefing import Briefing
 from .nodes.collector import Collector
 from .nodes.curator import Curator
@@ -17,14 +20,20 @@ from .nodes.researchers import (
     IndustryAnalyzer,
     NewsScanner,
 )
+from .services.checkpointing import clear_checkpoints, open_checkpointer
+from .services.time_budget import TimeBudget
 
 logger = logging.getLogger(__name__)
 
 class Graph:
     def __init__(self, company=None, url=None, hq_location=None, industry=None,
-                 websocket_manager=None, job_id=None):
+                 websocket_manager=None, job_id=None, progressive=False, batch_id=None,
+                 baseline=None, time_budget=None, depth=None):
         self.websocket_manager = websocket_manager
         self.job_id = job_id
+        self.budget = TimeBudget(time_budget)
+        # Wall-clock seconds spent in each node during this run
+        self.node_timings: Dict[str, float] = {}
         
         # Initialize InputState
         self.input_state = InputState(
@@ -34,6 +43,10 @@ class Graph:
             industry=industry,
             websocket_manager=websocket_manager,
             job_id=job_id,
+            progressive=progressive,
+            batch_id=batch_id,
+            baseline=baseline,
+            depth=depth,
             messages=[
                 SystemMessage(content="Expert researcher starting investigation")
             ]
@@ -41,7 +54,10 @@ class Graph:
 
         # Initialize nodes with WebSocket manager and job ID
         self._init_nodes()
-        self._build_workflow()
+        if baseline:
+            self._build_refresh_workflow()
+        else:
+            self._build_workflow()
 
     def _init_nodes(self):
         """Initialize all workflow nodes"""
@@ -56,21 +72,43 @@ class Graph:
         self.briefing = Briefing()
         self.editor = Editor()
 
+        # Every node adapts to the same per-job deadline
+        for node in (self.ground, self.financial_analyst, self.news_scanner,
+                     self.industry_analyst, self.company_analyst, self.enricher,
+                     self.briefing, self.editor):
+            node.budget = self.budget
+
+    def _timed(self, name: str, run: Callable[[Any], Awaitable[Any]]) -> Callable[[Any], Awaitable[Any]]:
+        """Wrap a node so its duration is recorded in node_timings.
+
+        wraps() keeps the node's state annotation, which LangGraph reads to
+        register the node's state channels.
+        """
+        @wraps(run)
+        async def timed(state):
+            started = time.perf_counter()
+            try:
+                return await run(state)
+            finally:
+                elapsed = time.perf_counter() - started
+                self.node_timings[name] = round(self.node_timings.get(name, 0) + elapsed, 3)
+        return timed
+
     def _build_workflow(self):
         """Configure the state graph workflow"""
         self.workflow = StateGraph(InputState)
         
         # Add nodes with their respective processing functions
-        self.workflow.add_node("grounding", self.ground.run)
-        self.workflow.add_node("financial_analyst", self.financial_analyst.run)
-        self.workflow.add_node("news_scanner", self.news_scanner.run)
-        self.workflow.add_node("industry_analyst", self.industry_analyst.run)
-        self.workflow.add_node("company_analyst", self.company_analyst.run)
-        self.workflow.add_node("collector", self.collector.run)
-        self.workflow.add_node("curator", self.curator.run)
-        self.workflow.add_node("enricher", self.enricher.run)
-        self.workflow.add_node("briefing", self.briefing.run)
-        self.workflow.add_node("editor", self.editor.run)
+        self.workflow.add_node("grounding", self._timed("grounding", self.ground.run))
+        self.workflow.add_node("financial_analyst", self._timed("financial_analyst", self.financial_analyst.run))
+        self.workflow.add_node("news_scanner", self._timed("news_scanner", self.news_scanner.run))
+        self.workflow.add_node("industry_analyst", self._timed("industry_analyst", self.industry_analyst.run))
+        self.workflow.add_node("company_analyst", self._timed("company_analyst", self.company_analyst.run))
+        self.workflow.add_node("collector", self._timed("collector", self.collector.run))
+        self.workflow.add_node("curator", self._timed("curator", self.curator.run))
+        self.workflow.add_node("enricher", self._timed("enricher", self.enricher.run))
+        self.workflow.add_node("briefing", self._timed("briefing", self.briefing.run))
+        self.workflow.add_node("editor", self._timed("editor", self.editor.run))
 
         # Configure workflow edges
         self.workflow.set_entry_point("grounding")
@@ -94,17 +132,65 @@ class Graph:
         self.workflow.add_edge("enricher", "briefing")
         self.workflow.add_edge("briefing", "editor")
 
-    async def run(self, thread: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
-        """Execute the research workflow"""
-        compiled_graph = self.workflow.compile()
-        
-        async for state in compiled_graph.astream(
-            self.input_state,
-            thread
-        ):
-            if self.websocket_manager and self.job_id:
-                await self._handle_ws_update(state)
-            yield state
+    def _build_refresh_workflow(self):
+        """Configure an incremental refresh that re-runs only the news research"""
+        self.baseline = Baseline()
+        self.workflow = StateGraph(InputState)
+
+        self.workflow.add_node("baseline", self._timed("baseline", self.baseline.run))
+        self.workflow.add_node("news_scanner", self._timed("news_scanner", self.news_scanner.run))
+        self.workflow.add_node("collector", self._timed("collector", self.collector.run))
+        self.workflow.add_node("curator", self._timed("curator", self.curator.run))
+        self.workflow.add_node("enricher", self._timed("enricher", self.enricher.run))
+        self.workflow.add_node("briefing", self._timed("briefing", self.briefing.run))
+        self.workflow.add_node("editor", self._timed("editor", self.editor.run))
+
+        self.workflow.set_entry_point("baseline")
+        self.workflow.set_finish_point("editor")
+
+        self.workflow.add_edge("baseline", "news_scanner")
+        self.workflow.add_edge("news_scanner", "collector")
+        self.workflow.add_edge("collector", "curator")
+        self.workflow.add_edge("curator", "enricher")
+        self.workflow.add_edge("enricher", "briefing")
+        self.workflow.add_edge("briefing", "editor")
+
+    async def run(self, thread: Dict[str, Any], resume: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """Execute the research workflow
+
+        With checkpointing enabled, progress is saved per node under the job ID
+        and resume=True continues from the last completed node.
+        """
+        # A resumed job gets a fresh budget for the stages it still has to run
+        self.budget.start()
+        async with open_checkpointer(self.websocket_manager) as checkpointer:
+            if checkpointer and self.job_id:
+                compiled_graph = self.workflow.compile(checkpointer=checkpointer)
+                thread = {
+                    **thread,
+                    "configurable": {**thread.get("configurable", {}), "thread_id": self.job_id}
+                }
+            else:
+                compiled_graph = self.workflow.compile()
+                resume = False
+
+            if resume and not (await compiled_graph.aget_state(thread)).next:
+                logger.info(f"No pending checkpoint for job {self.job_id}, starting from the beginning")
+                resume = False
+
+            report_written = False
+            async for state in compiled_graph.astream(
+                None if resume else self.input_state,
+                thread
+            ):
+                report_written = report_written or bool((state.get("editor") or {}).get("report"))
+                if self.websocket_manager and self.job_id:
+                    await self._handle_ws_update(state)
+                yield state
+
+            # Keep checkpoints of runs that ended without a report so they can be resumed
+            if checkpointer and self.job_id and report_written:
+                await clear_checkpoints(checkpointer, self.job_id)
 
     async def _handle_ws_update(self, state: Dict[str, Any]):
         """Handle WebSocket updates based on state changes"""
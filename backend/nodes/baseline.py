@@ -0,0 +1,67 @@
+import logging
+from datetime import datetime
+
+from langchain_core.messages import AIMessage
+
+from ..classes import InputState, ResearchState
+
+logger = logging.getLogger(__name__)
+
+# Categories carried over from the previous job in refresh mode
+REUSED_CATEGORIES = ['company', 'industry', 'financial']
+
+
+class Baseline:
+    """Restores a previous job's curated documents and briefings for an incremental refresh."""
+
+    async def restore(self, state: InputState) -> ResearchState:
+        company = state.get('company', 'Unknown Company')
+        baseline = state.get('baseline') or {}
+        artifacts = baseline.get('artifacts', {})
+        curated = artifacts.get('curated', {})
+        briefings = artifacts.get('briefings', {})
+        queries = artifacts.get('queries', {})
+        since = baseline.get('completed_at')
+
+        since_label = datetime.fromtimestamp(since).strftime("%B %d, %Y") if since else "the last run"
+        msg = f"♻️ Refreshing research for {company} from job {baseline.get('job_id')}"
+        msg += f"\n📰 Searching only for news since {since_label}"
+
+        if websocket_manager := state.get('websocket_manager'):
+            if job_id := state.get('job_id'):
+                await websocket_manager.send_status_update(
+                    job_id=job_id,
+                    status="processing",
+                    message=f"Refreshing news for {company} since {since_label}",
+                    result={
+                        "step": "Initializing",
+                        "refresh_from": baseline.get('job_id'),
+                        "reused_categories": REUSED_CATEGORIES
+                    }
+                )
+
+        research_state = {
+            "company": state.get('company'),
+            "company_url": state.get('company_url'),
+            "hq_location": state.get('hq_location'),
+            "industry": state.get('industry'),
+            "messages": [AIMessage(content=msg)],
+            "site_scrape": {},
+            "websocket_manager": state.get('websocket_manager'),
+            "job_id": state.get('job_id'),
+            "reused_categories": REUSED_CATEGORIES,
+            "news_since": since,
+            "analyst_queries": {category: queries[category] for category in REUSED_CATEGORIES if queries.get(category)}
+        }
+        for category in REUSED_CATEGORIES:
+            research_state[f'curated_{category}_data'] = curated.get(f'{category}_data', {})
+            research_state[f'{category}_briefing'] = briefings.get(category, '')
+            logger.info(
+                f"Reusing {len(research_state[f'curated_{category}_data'])} curated {category} documents "
+                f"and {len(research_state[f'{category}_briefing'])} character briefing"
+            )
+
+        return research_state
+
+    async def run(self, state: InputState) -> ResearchState:
+        return await self.restore(state)
@@ -6,6 +6,13 @@ from typing import Any, Dict, List, Union
 import google.generativeai as genai
 
 from ..classes import ResearchState
+from ..services.time_budget import TimeBudget
+from ..utils.sections import (
+    REPORT_SECTIONS,
+    SECTION_HEADERS,
+    format_section,
+    section_position,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +28,9 @@ class Briefing:
         # Configure Gemini
         genai.configure(api_key=self.gemini_key)
         self.gemini_model = genai.GenerativeModel('gemini-2.0-flash')
+        # Smaller model used when the briefing stage is behind schedule
+        self.fast_gemini_model = genai.GenerativeModel('gemini-2.0-flash-lite')
+        self.budget = TimeBudget()
 
     async def generate_category_briefing(
         self, docs: Union[Dict[str, Any], List[Dict[str, Any]]], 
@@ -181,7 +191,8 @@ Analyze the following documents and extract key information. Provide only the br
         
         try:
             logger.info("Sending prompt to LLM")
-            response = self.gemini_model.generate_content(prompt)
+            model = context.get('model') or self.gemini_model
+            response = await self.budget.run_within("briefing", model.generate_content_async(prompt))
             content = response.text.strip()
             if not content:
                 logger.error(f"Empty response from LLM for {category} briefing")
@@ -201,10 +212,35 @@ Analyze the following documents and extract key information. Provide only the br
                     )
 
             return {'content': content}
+        except asyncio.TimeoutError:
+            logger.warning(f"{category} briefing ran out of time budget")
+            self.budget.degrade("briefing", "skipped_briefing", category)
+            return {'content': ''}
         except Exception as e:
             logger.error(f"Error generating {category} briefing: {e}")
             return {'content': ''}
 
+    async def publish_section(self, state: ResearchState, category: str, content: str) -> None:
+        """Push a provisional report section to progressive clients."""
+        if not state.get('progressive'):
+            return
+        if websocket_manager := state.get('websocket_manager'):
+            if job_id := state.get('job_id'):
+                await websocket_manager.send_status_update(
+                    job_id=job_id,
+                    status="section_ready",
+                    message=f"{SECTION_HEADERS[category]} section ready",
+                    result={
+                        "step": "Briefing",
+                        "category": category,
+                        "section": SECTION_HEADERS[category],
+                        "position": section_position(category),
+                        "total_sections": len(REPORT_SECTIONS),
+                        "content": format_section(category, content),
+                        "is_final": False
+                    }
+                )
+
     async def create_briefings(self, state: ResearchState) -> ResearchState:
         """Create briefings for all categories in parallel."""
         company = state.get('company', 'Unknown Company')
@@ -225,8 +261,12 @@ Analyze the following documents and extract key information. Provide only the br
             "industry": state.get('industry', 'Unknown'),
             "hq_location": state.get('hq_location', 'Unknown'),
             "websocket_manager": websocket_manager,
-            "job_id": job_id
+            "job_id": job_id,
+            "model": self.gemini_model
         }
+        if self.budget.is_tight("briefing"):
+            context["model"] = self.fast_gemini_model
+            self.budget.degrade("briefing", "fast_model", "gemini-2.0-flash-lite")
         logger.info(f"Creating section briefings for {company}")
         
         # Mapping of curated data fields to briefing categories
@@ -244,6 +284,13 @@ Analyze the following documents and extract key information. Provide only the br
         for data_field, (cat, briefing_key) in categories.items():
             curated_key = f'curated_{data_field}'
             curated_data = state.get(curated_key, {})
+
+            # Refresh runs carry over briefings for categories that were not re-researched
+            if cat in state.get('reused_categories', []) and state.get(briefing_key):
+                logger.info(f"Reusing previous {cat} briefing")
+                briefings[cat] = state[briefing_key]
+                await self.publish_section(state, cat, state[briefing_key])
+                continue
             
             if curated_data:
                 logger.info(f"Processing {data_field} with {len(curated_data)} documents")
@@ -277,6 +324,9 @@ Analyze the following documents and extract key information. Provide only the br
                         briefings[task['category']] = result['content']
                         state[task['briefing_key']] = result['content']
                         logger.info(f"Completed {task['data_field']} briefing ({len(result['content'])} characters)")
+
+                        # Publish the provisional section right away; the editor reconciles it later
+                        await self.publish_section(state, task['category'], result['content'])
                     else:
                         logger.error(f"Failed to generate briefing for {task['data_field']}")
                         state[task['briefing_key']] = ""
@@ -5,6 +5,7 @@ from urllib.parse import urljoin, urlparse
 from langchain_core.messages import AIMessage
 
 from ..classes import ResearchState
+from ..utils.depth import depth_profile
 from ..utils.references import process_references_from_search_results
 
 logger = logging.getLogger(__name__)
@@ -65,7 +66,9 @@ class Curator:
                                         "step": "Curation",
                                         "doc_type": doc.get('doc_type', 'unknown'),
                                         "title": doc.get('title', 'No title'),
-                                        "score": tavily_score
+                                        "score": tavily_score,
+                                        # Running total, so clients can take the latest event alone
+                                        "kept_count": len(evaluated_docs)
                                     }
                                 )
                     else:
@@ -179,9 +182,10 @@ class Curator:
             relevant_docs = {url: doc for url, doc in zip(urls, evaluated_docs)}
             sorted_items = sorted(relevant_docs.items(), key=lambda item: item[1]['evaluation']['overall_score'], reverse=True)
             
-            # Limit to top 30 documents per category
-            if len(sorted_items) > 30:
-                sorted_items = sorted_items[:30]
+            # Limit to the depth profile's top documents per category
+            max_docs = depth_profile(state)['max_curated_docs']
+            if len(sorted_items) > max_docs:
+                sorted_items = sorted_items[:max_docs]
             relevant_docs = dict(sorted_items)
 
             doc_counts[data_field] = {
@@ -200,7 +204,9 @@ class Curator:
             state[f'curated_{data_field}'] = relevant_docs
             
         # Process references using the references module
-        top_reference_urls, reference_titles, reference_info = process_references_from_search_results(state)
+        top_reference_urls, reference_titles, reference_info = process_references_from_search_results(
+            state, max_references=depth_profile(state)['max_references']
+        )
         logger.info(f"Selected top {len(top_reference_urls)} references for the report")
         
         # Update state with references and their titles
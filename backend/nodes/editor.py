@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 from typing import Any, Dict
@@ -7,7 +8,16 @@ from openai import AsyncOpenAI
 import groq
 
 from ..classes import ResearchState
+from ..services.time_budget import TimeBudget
 from ..utils.references import format_references_section
+from ..utils.sections import (
+    REPORT_SECTIONS,
+    SECTION_HEADERS,
+    format_section,
+    section_position,
+    split_report_sections,
+    stitch_report,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +32,17 @@ class Editor:
         if not self.groq_key:
             raise ValueError("GROP_API_KEY environment variable is not set")
 
-        # Configure Groq client
-        self.groq_client = groq.Client(api_key=self.groq_key)
+        # Configure Groq client (async so section edits can run concurrently)
+        self.groq_client = groq.AsyncClient(api_key=self.groq_key)
+
+        # "single" compiles all briefings in one call, "parallel" edits each section concurrently
+        self.compile_mode = os.getenv("EDITOR_COMPILE_MODE", "single").lower()
+
+        # The fast model stands in when the editing stage is behind schedule
+        self.model = "openai/gpt-oss-20b"
+        self.fast_model = "llama-3.1-8b-instant"
+        self.active_model = self.model
+        self.budget = TimeBudget()
 
         # Initialize context dictionary for use across methods
         self.context = {
@@ -42,6 +61,11 @@ class Editor:
             "industry": state.get('industry', 'Unknown'),
             "hq_location": state.get('hq_location', 'Unknown')
         }
+
+        self.active_model = self.model
+        if self.budget.is_tight("editing"):
+            self.active_model = self.fast_model
+            self.budget.degrade("editing", "fast_model", self.fast_model)
         
         # Send initial compilation status
         if websocket_manager := state.get('websocket_manager'):
@@ -127,7 +151,10 @@ class Editor:
                         }
                     )
 
-            edited_report = await self.compile_content(state, briefings, company)
+            if self.compile_mode == "parallel":
+                edited_report = await self.compile_sections(state, briefings, company)
+            else:
+                edited_report = await self.compile_content(state, briefings, company)
             if not edited_report:
                 logger.error("Initial compilation failed")
                 return ""
@@ -157,7 +184,16 @@ class Editor:
                             "substep": "format"
                         }
                     )
-            final_report = await self.content_sweep(state, edited_report, company)
+            if self.compile_mode == "parallel":
+                # Sections were edited independently and stitched in a fixed order,
+                # so a whole-report sweep would put everything back on one critical path
+                final_report = edited_report
+            elif self.budget.is_tight("editing"):
+                logger.info("Skipping content sweep to stay within the time budget")
+                self.budget.degrade("editing", "skipped_content_sweep")
+                final_report = edited_report
+            else:
+                final_report = await self.content_sweep(state, edited_report, company)
             
             final_report = final_report or ""
             
@@ -168,6 +204,11 @@ class Editor:
             
             logger.info("Final report preview:")
             logger.info(final_report[:500])
+
+            # Sections edited in parallel were already published as they finished
+            if self.compile_mode != "parallel":
+                for category, body in split_report_sections(final_report).items():
+                    await self.publish_section(state, category, body)
             
             # Update state with the final report in two locations
             state['report'] = final_report
@@ -197,25 +238,31 @@ class Editor:
             logger.error(f"Error in edit_report: {e}")
             return ""
     
+    def build_reference_text(self, state: ResearchState) -> str:
+        """Format the references section from the curator's pre-processed reference info."""
+        references = state.get('references', [])
+        if not references:
+            return ""
+
+        logger.info(f"Found {len(references)} references to add during compilation")
+        
+        # Get pre-processed reference info from curator
+        reference_info = state.get('reference_info', {})
+        reference_titles = state.get('reference_titles', {})
+        
+        logger.info(f"Reference info from state: {reference_info}")
+        logger.info(f"Reference titles from state: {reference_titles}")
+        
+        # Use the references module to format the references section
+        reference_text = format_references_section(references, reference_info, reference_titles)
+        logger.info(f"Added {len(references)} references during compilation")
+        return reference_text
+
     async def compile_content(self, state: ResearchState, briefings: Dict[str, str], company: str) -> str:
         """Initial compilation of research sections."""
         combined_content = "\n\n".join(content for content in briefings.values())
         
-        references = state.get('references', [])
-        reference_text = ""
-        if references:
-            logger.info(f"Found {len(references)} references to add during compilation")
-            
-            # Get pre-processed reference info from curator
-            reference_info = state.get('reference_info', {})
-            reference_titles = state.get('reference_titles', {})
-            
-            logger.info(f"Reference info from state: {reference_info}")
-            logger.info(f"Reference titles from state: {reference_titles}")
-            
-            # Use the references module to format the references section
-            reference_text = format_references_section(references, reference_info, reference_titles)
-            logger.info(f"Added {len(references)} references during compilation")
+        reference_text = self.build_reference_text(state)
         
         # Use values from centralized context
         company = self.context["company"]
@@ -253,8 +300,8 @@ Strictly enforce this EXACT document structure:
 Return the report in clean markdown format. No explanations or commentary."""
         
         try:
-            response = await self.groq_client.chat.completions.create(
-                model="openai/gpt-oss-20b",
+            response = await self.budget.run_within("editing", self.groq_client.chat.completions.create(
+                model=self.active_model,
                 messages=[
                     {
                         "role": "system",
@@ -267,7 +314,7 @@ Return the report in clean markdown format. No explanations or commentary."""
                 ],
                 temperature=0,
                 stream=False
-            )
+            ))
             initial_report = response.choices[0].message.content.strip()
             
             # Append the references section after LLM processing
@@ -275,10 +322,110 @@ Return the report in clean markdown format. No explanations or commentary."""
                 initial_report = f"{initial_report}\n\n{reference_text}"
             
             return initial_report
+        except asyncio.TimeoutError:
+            logger.warning("Report compilation ran out of time budget, stitching briefings instead")
+            self.budget.degrade("editing", "stitched_briefings")
+            return stitch_report(company, briefings, reference_text)
         except Exception as e:
             logger.error(f"Error in initial compilation: {e}")
             return (combined_content or "").strip()
         
+    async def edit_section(self, category: str, briefing: str) -> str:
+        """Edit a single briefing into the body of its report section."""
+        company = self.context["company"]
+        industry = self.context["industry"]
+        hq_location = self.context["hq_location"]
+        header = SECTION_HEADERS[category]
+
+        structure_rule = (
+            "Use only bullet points (*), never headers"
+            if category == 'news'
+            else "Use ### for subsections"
+        )
+
+        prompt = f"""You are editing the "{header}" section of a research report on {company}, a {industry} company headquartered in {hq_location}.
+
+Section briefing:
+{briefing}
+
+1. Remove redundant or repetitive information
+2. Remove information that is not relevant to {company}
+3. Remove any meta-commentary (e.g. "Here is the news...")
+4. Keep all important details from the briefing
+
+Formatting rules:
+1. Return ONLY the body of the section. Do NOT include the "## {header}" header or a report title
+2. {structure_rule}
+3. Format all bullet points with *
+4. Never use code blocks (```)
+5. Never use more than one blank line between blocks
+
+Return the section in clean markdown format. No explanations or commentary."""
+
+        try:
+            response = await self.budget.run_within("editing", self.groq_client.chat.completions.create(
+                model=self.active_model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are an expert report editor that turns a research briefing into one section of a company report."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0,
+                stream=False
+            ))
+            return response.choices[0].message.content.strip()
+        except asyncio.TimeoutError:
+            logger.warning(f"Editing the {category} section ran out of time budget, using its briefing")
+            self.budget.degrade("editing", "unedited_section", category)
+            return (briefing or "").strip()
+        except Exception as e:
+            logger.error(f"Error editing {category} section: {e}")
+            return (briefing or "").strip()
+
+    async def publish_section(self, state: ResearchState, category: str, body: str) -> None:
+        """Send a final section so progressive clients can replace the provisional one."""
+        if not state.get('progressive') or not body:
+            return
+        if websocket_manager := state.get('websocket_manager'):
+            if job_id := state.get('job_id'):
+                await websocket_manager.send_status_update(
+                    job_id=job_id,
+                    status="section_ready",
+                    message=f"{SECTION_HEADERS[category]} section finalized",
+                    result={
+                        "step": "Editor",
+                        "category": category,
+                        "section": SECTION_HEADERS[category],
+                        "position": section_position(category),
+                        "total_sections": len(REPORT_SECTIONS),
+                        "content": format_section(category, body),
+                        "is_final": True
+                    }
+                )
+
+    async def compile_sections(self, state: ResearchState, briefings: Dict[str, str], company: str) -> str:
+        """Edit every section concurrently and stitch the results in the fixed report order."""
+        categories = [category for category, _ in REPORT_SECTIONS if briefings.get(category)]
+        logger.info(f"Editing {len(categories)} sections in parallel for {self.context['company']}")
+
+        async def edit_and_publish(category: str) -> str:
+            body = await self.edit_section(category, briefings[category])
+            await self.publish_section(state, category, body)
+            return body
+
+        edited = await asyncio.gather(*[
+            edit_and_publish(category)
+            for category in categories
+        ])
+        sections = dict(zip(categories, edited))
+
+        return stitch_report(self.context["company"], sections, self.build_reference_text(state))
+
     async def content_sweep(self, state: ResearchState, content: str, company: str) -> str:
         """Sweep the content for any redundant information."""
         # Use values from centralized context
@@ -334,9 +481,24 @@ Return the polished report in flawless markdown format. No explanation.
 
 Return the cleaned report in flawless markdown format. No explanations or commentary."""
         
-        try:
+        websocket_manager = state.get('websocket_manager')
+        job_id = state.get('job_id')
+
+        async def send_chunk(text: str):
+            if websocket_manager and job_id:
+                await websocket_manager.send_status_update(
+                    job_id=job_id,
+                    status="report_chunk",
+                    message="Formatting final report",
+                    result={
+                        "chunk": text,
+                        "step": "Editor"
+                    }
+                )
+
+        async def sweep() -> str:
             response = await self.groq_client.chat.completions.create(
-                model="openai/gpt-oss-20b", 
+                model=self.active_model,
                 messages=[
                     {
                         "role": "system",
@@ -348,49 +510,38 @@ Return the cleaned report in flawless markdown format. No explanations or commen
                     }
                 ],
                 temperature=0,
-                stream=False
+                stream=True
             )
-            
+
             accumulated_text = ""
             buffer = ""
-            
             async for chunk in response:
-                if chunk.choices[0].finish_reason == "stop":
-                    websocket_manager = state.get('websocket_manager')
-                    if websocket_manager and buffer:
-                        job_id = state.get('job_id')
-                        if job_id:
-                            await websocket_manager.send_status_update(
-                                job_id=job_id,
-                                status="report_chunk",
-                                message="Formatting final report",
-                                result={
-                                    "chunk": buffer,
-                                    "step": "Editor"
-                                }
-                            )
-                    break
-                    
+                if not chunk.choices:
+                    continue
                 chunk_text = chunk.choices[0].delta.content
                 if chunk_text:
                     accumulated_text += chunk_text
                     buffer += chunk_text
-                    
-                    if any(char in buffer for char in ['.', '!', '?', '\n']) and len(buffer) > 10:
-                        if websocket_manager := state.get('websocket_manager'):
-                            if job_id := state.get('job_id'):
-                                await websocket_manager.send_status_update(
-                                    job_id=job_id,
-                                    status="report_chunk",
-                                    message="Formatting final report",
-                                    result={
-                                        "chunk": buffer,
-                                        "step": "Editor"
-                                    }
-                                )
-                        buffer = ""
-            
+
+                if chunk.choices[0].finish_reason == "stop":
+                    break
+
+                if any(char in buffer for char in ['.', '!', '?', '\n']) and len(buffer) > 10:
+                    await send_chunk(buffer)
+                    buffer = ""
+
+            if buffer:
+                await send_chunk(buffer)
+            return accumulated_text
+
+        try:
+            # The allowance covers the whole stream, not just opening it
+            accumulated_text = await self.budget.run_within("editing", sweep())
             return (accumulated_text or "").strip()
+        except asyncio.TimeoutError:
+            logger.warning("Content sweep ran out of time budget, keeping the compiled report")
+            self.budget.degrade("editing", "skipped_content_sweep")
+            return (content or "").strip()
         except Exception as e:
             logger.error(f"Error in formatting: {e}")
             return (content or "").strip()
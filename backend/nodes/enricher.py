@@ -6,6 +6,11 @@ from langchain_core.messages import AIMessage
 from tavily import AsyncTavilyClient
 
 from ..classes import ResearchState
+from ..services.time_budget import TimeBudget
+from ..utils.depth import depth_profile
+
+# When enrichment is behind schedule, only documents scoring at least this get raw content
+TIGHT_BUDGET_MIN_SCORE = 0.6
 
 
 class Enricher:
@@ -17,6 +22,7 @@ class Enricher:
             raise ValueError("TAVILY_API_KEY environment variable is not set")
         self.tavily_client = AsyncTavilyClient(api_key=tavily_key)
         self.batch_size = 20
+        self.budget = TimeBudget()
 
     async def fetch_single_content(self, url: str, websocket_manager=None, job_id=None, category=None) -> Dict[str, str]:
         """Fetch raw content for a single URL."""
@@ -135,6 +141,13 @@ class Enricher:
 
         msg = [f"📚 Enriching curated data for {company}:"]
 
+        if not depth_profile(state)['enrich']:
+            msg.append("\n• Quick research uses search snippets, skipping enrichment")
+            state.setdefault('messages', []).append(AIMessage(content="\n".join(msg)))
+            return state
+
+        tight = self.budget.is_tight("enrichment")
+
         # Process each type of curated data
         data_types = {
             'financial_data': ('💰 Financial', 'financial'),
@@ -153,10 +166,24 @@ class Enricher:
                 msg.append(f"\n• No curated {label} documents to enrich")
                 continue
 
+            if category in state.get('reused_categories', []):
+                msg.append(f"\n• Reusing previously enriched {label} documents")
+                continue
+
             # Find documents needing enrichment
             docs_needing_content = {url: doc for url, doc in curated_docs.items() 
                                   if not doc.get('raw_content')}
             
+            if tight:
+                # Low-score documents keep their search snippet instead of full content
+                kept = {
+                    url: doc for url, doc in docs_needing_content.items()
+                    if float(doc.get('evaluation', {}).get('overall_score', doc.get('score', 0))) >= TIGHT_BUDGET_MIN_SCORE
+                }
+                if len(kept) < len(docs_needing_content):
+                    self.budget.degrade("enrichment", "skipped_low_score_docs", category)
+                docs_needing_content = kept
+
             if not docs_needing_content:
                 msg.append(f"\n• All {label} documents already have raw content")
                 continue
@@ -239,8 +266,15 @@ class Enricher:
                         'errors': len(task['docs'])
                     }
 
-            # Process all categories in parallel
-            results = await asyncio.gather(*[process_category(task) for task in enrichment_tasks])
+            # Process all categories in parallel, keeping whatever finished within the budget
+            category_tasks = [asyncio.create_task(process_category(task)) for task in enrichment_tasks]
+            done, pending = await asyncio.wait(category_tasks, timeout=self.budget.time_left("enrichment"))
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                self.budget.degrade("enrichment", "timed_out", f"{len(pending)} categories unfinished")
+            results = [task.result() for task in category_tasks if task in done]
             
             # Calculate totals
             total_enriched = sum(r['enriched'] for r in results)
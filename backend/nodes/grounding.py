@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 
@@ -5,6 +6,8 @@ from langchain_core.messages import AIMessage
 from tavily import AsyncTavilyClient
 
 from ..classes import InputState, ResearchState
+from ..services.time_budget import TimeBudget
+from ..utils.depth import depth_profile
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +16,7 @@ class GroundingNode:
     
     def __init__(self) -> None:
         self.tavily_client = AsyncTavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+        self.budget = TimeBudget()
 
     async def initial_search(self, state: InputState) -> ResearchState:
         # Add debug logging at the start to check websocket manager
@@ -50,15 +54,23 @@ class GroundingNode:
                         result={"step": "Initial Site Scrape"}
                     )
 
+            crawl_params = dict(depth_profile(state)['crawl'])
+            # With less than its share of the budget left, crawl fewer pages with basic extraction
+            if self.budget.is_tight("grounding"):
+                crawl_params = {
+                    "max_depth": 1,
+                    "max_breadth": min(20, crawl_params["max_breadth"]),
+                    "extract_depth": "basic"
+                }
+                self.budget.degrade("grounding", "light_site_crawl")
+
             try:
                 logger.info("Initiating Tavily crawl")
-                site_extraction = await self.tavily_client.crawl(
+                site_extraction = await self.budget.run_within("grounding", self.tavily_client.crawl(
                     url=url, 
                     instructions="Find any pages that will help us understand the company's business, products, services, and any other relevant information.",
-                    max_depth=1, 
-                    max_breadth=50, 
-                    extract_depth="advanced"
-                )
+                    **crawl_params
+                ))
                 
                 raw_contents = []
                 for item in site_extraction.get("results", []):
@@ -91,6 +103,10 @@ class GroundingNode:
                                 message="⚠️ No content found in provided URL",
                                 result={"step": "Initial Site Scrape"}
                             )
+            except asyncio.TimeoutError:
+                logger.warning("Website crawl ran out of time budget, continuing without it")
+                msg += "\n⏩ Website crawl skipped to stay within the time budget"
+                self.budget.degrade("grounding", "skipped_site_crawl")
             except Exception as e:
                 error_str = str(e)
                 logger.error(f"Website crawl error: {error_str}", exc_info=True)
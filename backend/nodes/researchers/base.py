@@ -1,6 +1,8 @@
 import asyncio
 import logging
+import math
 import os
+import time
 from datetime import datetime
 from typing import Any, Dict, List
 import groq
@@ -8,10 +10,16 @@ import groq
 from tavily import AsyncTavilyClient
 
 from ...classes import ResearchState
+from ...services.research_cache import shared_cache
+from ...services.time_budget import TimeBudget
+from ...utils.depth import depth_profile
 from ...utils.references import clean_title
 
 logger = logging.getLogger(__name__)
 
+# Queries per analyst when the research stage is behind schedule
+TIGHT_BUDGET_QUERIES = 2
+
 class BaseResearcher:
     def __init__(self):
         tavily_key = os.getenv("TAVILY_API_KEY")
@@ -21,8 +29,9 @@ class BaseResearcher:
             raise ValueError("Missing API keys")
             
         self.tavily_client = AsyncTavilyClient(api_key=tavily_key)
-        self.groq_client = groq.Client(api_key=groq_key)
+        self.groq_client = groq.AsyncClient(api_key=groq_key)
         self.analyst_type = "base_researcher"  # Default type
+        self.budget = TimeBudget()
 
     @property
     def analyst_type(self) -> str:
@@ -41,11 +50,12 @@ class BaseResearcher:
         current_year = datetime.now().year
         websocket_manager = state.get('websocket_manager')
         job_id = state.get('job_id')
+        max_queries = depth_profile(state)['queries_per_analyst']
         
         try:
             logger.info(f"Generating queries for {company} as {self.analyst_type}")
 
-            response = self.groq_client.chat.completions.create(
+            response = await self.budget.run_within("research", self.groq_client.chat.completions.create(
                 model="compound-beta-mini",
                 messages=[
                     {
@@ -55,13 +65,13 @@ class BaseResearcher:
                     {
                         "role": "user",
                         "content": f"""Researching {company} on {datetime.now().strftime("%B %d, %Y")}.
-{self._format_query_prompt(prompt, company, hq, current_year)}"""
+{self._format_query_prompt(prompt, company, hq, current_year, max_queries)}"""
                     }
                 ],
                 temperature=0,
                 max_tokens=4096,
-                stream=False  # Set to False for await
-            )
+                stream=False
+            ))
             
             queries = []
             current_query = ""
@@ -71,8 +81,11 @@ class BaseResearcher:
             content = response.choices[0].message.content if response.choices else ""
             queries = [q.strip() for q in content.split('\n') if q.strip()]
 
-            # Limit to at most 4 queries
-            queries = queries[:4]
+            # Limit to the depth profile's query count, fewer when the research stage is short on time
+            queries = queries[:max_queries]
+            if self.budget.is_tight("research") and len(queries) > TIGHT_BUDGET_QUERIES:
+                queries = queries[:TIGHT_BUDGET_QUERIES]
+                self.budget.degrade("research", "fewer_queries", self.analyst_type)
 
             # Optionally send status updates for each query
             if websocket_manager and job_id:
@@ -112,11 +125,16 @@ class BaseResearcher:
             if not queries:
                 raise ValueError(f"No queries generated for {company}")
 
-            # Limit to at most 4 queries.
-            queries = queries[:4]
+            # Limit to the depth profile's query count.
+            queries = queries[:max_queries]
             logger.info(f"Final queries for {self.analyst_type}: {queries}")
             
             return queries
+
+        except asyncio.TimeoutError:
+            logger.warning(f"Query generation for {self.analyst_type} ran out of time budget, using fallback queries")
+            self.budget.degrade("research", "fallback_queries", self.analyst_type)
+            return self._fallback_queries(company, current_year)[:min(max_queries, TIGHT_BUDGET_QUERIES)]
             
         except Exception as e:
             logger.error(f"Error generating queries for {company}: {e}")
@@ -129,13 +147,13 @@ class BaseResearcher:
                 )
             return []
 
-    def _format_query_prompt(self, prompt, company, hq, year):
+    def _format_query_prompt(self, prompt, company, hq, year, max_queries=4):
         return f"""{prompt}
 
         Important Guidelines:
         - Focus ONLY on {company}-specific information
         - Make queries very brief and to the point
-        - Provide exactly 4 search queries (one per line), with no hyphens or dashes
+        - Provide exactly {max_queries} search queries (one per line), with no hyphens or dashes
         - DO NOT make assumptions about the industry - use only the provided industry information"""
 
     def _fallback_queries(self, company, year):
@@ -146,94 +164,16 @@ class BaseResearcher:
             f"{company} industry analysis {year}"
         ]
 
-    async def search_single_query(self, query: str, websocket_manager=None, job_id=None) -> Dict[str, Any]:
-        """Execute a single search query with proper error handling."""
-        if not query or len(query.split()) < 3:
-            return {}
-
-        try:
-            if websocket_manager and job_id:
-                await websocket_manager.send_status_update(
-                    job_id=job_id,
-                    status="query_searching",
-                    message=f"Searching: {query}",
-                    result={
-                        "step": "Searching",
-                        "query": query
-                    }
-                )
-
-            # Add news topic for news analysts
-            search_params = {
-                "search_depth": "basic",
-                "include_raw_content": False,
-                "max_results": 5
-            }
-            
-            if self.analyst_type == "news_analyst":
-                search_params["topic"] = "news"
-            elif self.analyst_type == "financial_analyst":
-                search_params["topic"] = "finance"
-
-            results = await self.tavily_client.search(
-                query,
-                **search_params
-            )
-            
-            docs = {}
-            for result in results.get("results", []):
-                if not result.get("content") or not result.get("url"):
-                    continue
-                    
-                url = result.get("url")
-                title = result.get("title", "")
-                
-                # Clean up and validate the title using the references module
-                if title:
-                    title = clean_title(title)
-                    # If title is the same as URL or empty, set to empty to trigger extraction later
-                    if title.lower() == url.lower() or not title.strip():
-                        title = ""
-                
-                logger.info(f"Tavily search result for '{query}': URL={url}, Title='{title}'")
-                
-                docs[url] = {
-                    "title": title,
-                    "content": result.get("content", ""),
-                    "query": query,
-                    "url": url,
-                    "source": "web_search",
-                    "score": result.get("score", 0.0)
-                }
-
-            if websocket_manager and job_id:
-                await websocket_manager.send_status_update(
-                    job_id=job_id,
-                    status="query_searched",
-                    message=f"Found {len(docs)} results for: {query}",
-                    result={
-                        "step": "Searching",
-                        "query": query,
-                        "results_count": len(docs)
-                    }
-                )
+    async def cached_search(self, state: ResearchState, query: str, search_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a Tavily search, sharing identical searches across a batch of jobs."""
+        if not state.get('batch_id'):
+            return await self.tavily_client.search(query, **search_params)
 
-            return docs
-            
-        except Exception as e:
-            logger.error(f"Error searching query '{query}': {e}")
-            if websocket_manager and job_id:
-                await websocket_manager.send_status_update(
-                    job_id=job_id,
-                    status="query_error",
-                    message=f"Search failed for: {query}",
-                    result={
-                        "step": "Searching",
-                        "query": query,
-                        "error": str(e)
-                    }
-                )
-            return {}
+        key = ("search", query.strip().lower(), tuple(sorted(search_params.items())))
+        return await shared_cache.get_or_create(
+            key,
+            lambda: self.tavily_client.search(query, **search_params)
+        )
 
     async def search_documents(self, state: ResearchState, queries: List[str]) -> Dict[str, Any]:
         """
@@ -246,6 +186,11 @@ class BaseResearcher:
             logger.error("No valid queries to search")
             return {}
 
+        if self.budget.is_spent("research"):
+            logger.warning(f"Research time budget spent, skipping remaining {self.analyst_type} searches")
+            self.budget.degrade("research", "skipped_searches", self.analyst_type)
+            return {}
+
         # Send status update for generated queries
         if websocket_manager and job_id:
             await websocket_manager.send_status_update(
@@ -261,10 +206,11 @@ class BaseResearcher:
             )
 
         # Prepare all search parameters upfront
+        profile = depth_profile(state)
         search_params = {
-            "search_depth": "basic",
+            "search_depth": profile['search_depth'],
             "include_raw_content": False,
-            "max_results": 5
+            "max_results": profile['max_results']
         }
         
         if self.analyst_type == "news_analyst":
@@ -272,6 +218,11 @@ class BaseResearcher:
         elif self.analyst_type == "financial_analyst":
             search_params["topic"] = "finance"
 
+        # Refresh runs only need news published since the previous report
+        if since := state.get('news_since'):
+            search_params["topic"] = "news"
+            search_params["days"] = max(1, math.ceil((time.time() - since) / 86400))
+
         if websocket_manager and job_id:
             await websocket_manager.send_status_update(
                 job_id=job_id,
@@ -284,13 +235,17 @@ class BaseResearcher:
             )
         # Create all API calls upfront - direct Tavily client calls without the extra wrapper
         search_tasks = [
-            self.tavily_client.search(query, **search_params)
+            self.cached_search(state, query, search_params)
             for query in queries
         ]
 
         # Execute all API calls in parallel
         try:
-            results = await asyncio.gather(*search_tasks)
+            results = await self.budget.run_within("research", asyncio.gather(*search_tasks))
+        except asyncio.TimeoutError:
+            logger.warning(f"{self.analyst_type} searches ran out of time budget")
+            self.budget.degrade("research", "search_timeout", self.analyst_type)
+            return {}
         except Exception as e:
             logger.error(f"Error during parallel search execution: {e}")
             return {}
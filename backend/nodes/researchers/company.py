@@ -90,7 +90,8 @@ class CompanyAnalyzer(BaseResearcher):
         
         return {
             'message': msg,
-            'company_data': company_data
+            'company_data': company_data,
+            'analyst_queries': {'company': queries}
         }
 
     async def run(self, state: ResearchState) -> Dict[str, Any]:
@@ -103,7 +103,8 @@ class FinancialAnalyst(BaseResearcher):
                 'message': completion_msg,
                 'financial_data': financial_data,
                 'analyst_type': self.analyst_type,
-                'queries': queries
+                'queries': queries,
+                'analyst_queries': {'financial': queries}
             }
 
         except Exception as e:
@@ -1,8 +1,11 @@
+from datetime import datetime
 from typing import Any, Dict
 
 from langchain_core.messages import AIMessage
 
 from ...classes import ResearchState
+from ...services.research_cache import shared_cache
+from ...utils.depth import depth_profile, resolve_depth
 from .base import BaseResearcher
 
 
@@ -11,6 +14,45 @@ class IndustryAnalyzer(BaseResearcher):
         super().__init__()
         self.analyst_type = "industry_analyzer"
 
+    async def search_industry(self, state: ResearchState, industry: str) -> Dict[str, Any]:
+        """Company-independent industry searches, run once per industry across a batch."""
+        year = datetime.now().year
+        queries = [
+            f"{industry} market size and growth {year}",
+            f"{industry} industry trends {year}",
+            f"{industry} competitive landscape leading companies",
+            f"{industry} industry challenges {year}"
+        ][:depth_profile(state)['queries_per_analyst']]
+        loaded = False
+
+        async def load() -> Dict[str, Any]:
+            nonlocal loaded
+            loaded = True
+            return await self.search_documents(state, queries)
+
+        # An empty result means the searches failed or the loading job ran out of
+        # budget; it is not cached so the next job in the batch searches again
+        documents = await shared_cache.get_or_create(
+            ("industry_docs", industry.strip().lower(), resolve_depth(state.get('depth'))),
+            load,
+            cache_if=bool
+        )
+        # Search progress only reached the job that ran the searches
+        if not loaded and (websocket_manager := state.get('websocket_manager')):
+            if job_id := state.get('job_id'):
+                await websocket_manager.send_status_update(
+                    job_id=job_id,
+                    status="industry_search_shared",
+                    message=f"Reusing {len(documents)} {industry} industry documents from this batch",
+                    result={
+                        "step": "Searching",
+                        "analyst": self.analyst_type,
+                        "industry": industry,
+                        "documents": len(documents)
+                    }
+                )
+        return documents
+
     async def analyze(self, state: ResearchState) -> Dict[str, Any]:
         company = state.get('company', 'Unknown Company')
         industry = state.get('industry', 'Unknown Industry')
@@ -25,6 +67,11 @@ class IndustryAnalyzer(BaseResearcher):
         - Market size and growth
         """)
 
+        # In a batch, industry-wide searches are shared, so fewer company-specific queries are needed
+        shared_industry = bool(state.get('batch_id') and state.get('industry'))
+        if shared_industry:
+            queries = queries[:2]
+
         subqueries_msg = "🔍 Subqueries for industry analysis:\n" + "\n".join([f"• {query}" for query in queries])
         messages = state.get('messages', [])
         messages.append(AIMessage(content=subqueries_msg))
@@ -58,6 +105,11 @@ class IndustryAnalyzer(BaseResearcher):
         
         # Perform additional research with increased search depth
         try:
+            if shared_industry:
+                for url, doc in (await self.search_industry(state, industry)).items():
+                    industry_data.setdefault(url, dict(doc))
+                msg.append(f"\n♻️ Using shared {industry} industry research")
+
             # Store documents with their respective queries
             for query in queries:
                 documents = await self.search_documents(state, [query])
@@ -90,7 +142,8 @@ class IndustryAnalyzer(BaseResearcher):
         
         return {
             'message': msg,
-            'industry_data': industry_data
+            'industry_data': industry_data,
+            'analyst_queries': {'industry': queries}
         }
 
     async def run(self, state: ResearchState) -> Dict[str, Any]:
@@ -74,7 +74,8 @@ class NewsScanner(BaseResearcher):
         
         return {
             'message': msg,
-            'news_data': news_data
+            'news_data': news_data,
+            'analyst_queries': {'news': queries}
         }
 
     async def run(self, state: ResearchState) -> Dict[str, Any]:
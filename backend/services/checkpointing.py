@@ -0,0 +1,105 @@
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+from backend.services.websocket_manager import WebSocketManager
+
+logger = logging.getLogger(__name__)
+
+try:
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+except ImportError:  # langgraph-checkpoint-sqlite is optional
+    JsonPlusSerializer = object
+    AsyncSqliteSaver = None
+
+# Stands in for the live WebSocketManager inside stored checkpoints
+TRANSIENT_MARKER = "__websocket_manager__"
+
+
+class TransientAwareSerializer(JsonPlusSerializer):
+    """Checkpoint serializer that keeps live objects out of stored state.
+
+    The WebSocketManager is written as a marker and swapped back for the
+    manager of the process that loads the checkpoint, so a resumed job
+    reports progress to whoever is listening now. Values are walked
+    recursively: the manager also sits inside the `__start__` channel's input
+    dict and in pending writes of nodes that return the whole state.
+    """
+
+    def __init__(self, websocket_manager: Optional[WebSocketManager]):
+        super().__init__()
+        self.websocket_manager = websocket_manager
+
+    @classmethod
+    def _replace(cls, obj: Any, swap) -> Any:
+        """Apply swap throughout dicts, lists and tuples, copying only containers that change."""
+        if (swapped := swap(obj)) is not obj:
+            return swapped
+        if isinstance(obj, dict):
+            items = {key: cls._replace(value, swap) for key, value in obj.items()}
+            changed = any(items[key] is not value for key, value in obj.items())
+            return items if changed else obj
+        if type(obj) in (list, tuple):
+            items = [cls._replace(value, swap) for value in obj]
+            changed = any(new is not old for new, old in zip(items, obj))
+            return type(obj)(items) if changed else obj
+        return obj
+
+    def _strip(self, obj: Any) -> Any:
+        return self._replace(obj, lambda value: TRANSIENT_MARKER if isinstance(value, WebSocketManager) else value)
+
+    def _restore(self, obj: Any) -> Any:
+        return self._replace(
+            obj, lambda value: self.websocket_manager if isinstance(value, str) and value == TRANSIENT_MARKER else value
+        )
+
+    def dumps_typed(self, obj: Any):
+        return super().dumps_typed(self._strip(obj))
+
+    def loads_typed(self, data):
+        return self._restore(super().loads_typed(data))
+
+    # Checkpoint metadata records each step's writes and goes through the plain JSON methods
+    def dumps(self, obj: Any) -> bytes:
+        return super().dumps(self._strip(obj))
+
+    def loads(self, data: bytes) -> Any:
+        return self._restore(super().loads(data))
+
+
+def checkpoint_path() -> Optional[str]:
+    """SQLite file for graph checkpoints, or None when checkpointing is off."""
+    path = os.getenv("CHECKPOINT_DB")
+    if path and AsyncSqliteSaver is None:
+        logger.warning("CHECKPOINT_DB is set but langgraph-checkpoint-sqlite is not installed")
+        return None
+    return path or None
+
+
+def use_serializer(saver: Any, websocket_manager: Optional[WebSocketManager]) -> None:
+    """Make a saver write checkpoints and their metadata without live objects."""
+    saver.serde = saver.jsonplus_serde = TransientAwareSerializer(websocket_manager)
+
+
+@asynccontextmanager
+async def open_checkpointer(websocket_manager: Optional[WebSocketManager]) -> AsyncIterator[Optional[Any]]:
+    """Yield an AsyncSqliteSaver for the configured database, or None if disabled."""
+    if not (path := checkpoint_path()):
+        yield None
+        return
+    async with AsyncSqliteSaver.from_conn_string(path) as saver:
+        use_serializer(saver, websocket_manager)
+        yield saver
+
+
+async def clear_checkpoints(saver: Any, thread_id: str) -> None:
+    """Drop a finished job's checkpoints so the database does not grow without bound."""
+    try:
+        async with saver.lock:
+            await saver.conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            await saver.conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+            await saver.conn.commit()
+    except Exception as e:
+        logger.warning(f"Failed to clear checkpoints for job {thread_id}: {e}")
@@ -0,0 +1,51 @@
+import json
+from typing import List, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library encoder is the fallback
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; clients asking for it get JSON
+    msgpack = None
+
+DEFAULT_ENCODING = "json"
+
+
+def available_encodings() -> List[str]:
+    """Event encodings this process can produce."""
+    return [DEFAULT_ENCODING] + (["msgpack"] if msgpack else [])
+
+
+def negotiate_encoding(requested: Optional[str]) -> str:
+    """Encoding for a client that asked for `requested`, falling back to JSON."""
+    requested = (requested or DEFAULT_ENCODING).strip().lower()
+    return requested if requested in available_encodings() else DEFAULT_ENCODING
+
+
+def encode_event(message: dict, encoding: str = DEFAULT_ENCODING) -> Union[str, bytes]:
+    """Serialize an event: msgpack as bytes for binary frames, JSON as text.
+
+    The "sse" encoding is a complete Server-Sent Events frame whose id is the
+    event's sequence number; unsequenced messages get no id, so they don't
+    reset the client's Last-Event-ID.
+    """
+    if encoding == "msgpack" and msgpack:
+        return msgpack.packb(message, default=str)
+    if orjson:
+        data = orjson.dumps(message, default=str).decode()
+    else:
+        data = json.dumps(message, separators=(",", ":"), default=str)
+    if encoding == "sse":
+        event_id = f"id: {message['seq']}\n" if "seq" in message else ""
+        return f"{event_id}data: {data}\n\n"
+    return data
+
+
+def decode_event(payload: Union[str, bytes]) -> dict:
+    """Parse a JSON-encoded event."""
+    if orjson:
+        return orjson.loads(payload)
+    return json.loads(payload)
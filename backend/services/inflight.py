@@ -0,0 +1,51 @@
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class InFlightRegistry:
+    """Tracks running jobs by request fingerprint so duplicates can attach to them."""
+
+    def __init__(self):
+        self.leaders: Dict[str, str] = {}
+        self.fingerprints: Dict[str, str] = {}
+        self.followers: Dict[str, List[str]] = {}
+        self.deduplicated = 0
+
+    def leader_for(self, fingerprint: str) -> Optional[str]:
+        """Return the job already running for this fingerprint, if any."""
+        return self.leaders.get(fingerprint)
+
+    def register(self, fingerprint: str, job_id: str) -> None:
+        """Record job_id as the job producing results for fingerprint."""
+        self.leaders.setdefault(fingerprint, job_id)
+        self.fingerprints[job_id] = fingerprint
+
+    def attach(self, leader_id: str, follower_id: str) -> None:
+        """Attach a duplicate job to the leader's event stream and result."""
+        self.followers.setdefault(leader_id, []).append(follower_id)
+        self.deduplicated += 1
+        logger.info(f"Job {follower_id} attached to in-flight job {leader_id}")
+
+    def detach(self, leader_id: str, follower_id: str) -> None:
+        """Stop delivering a job's result to one attached duplicate."""
+        if follower_id in self.followers.get(leader_id, []):
+            self.followers[leader_id].remove(follower_id)
+
+    def followers_of(self, job_id: str) -> List[str]:
+        """Jobs currently attached to job_id."""
+        return list(self.followers.get(job_id, []))
+
+    def release(self, job_id: str) -> List[str]:
+        """Forget a finished job and return the jobs that were attached to it."""
+        if (fingerprint := self.fingerprints.pop(job_id, None)) and self.leaders.get(fingerprint) == job_id:
+            del self.leaders[fingerprint]
+        return self.followers.pop(job_id, [])
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self.leaders),
+            "attached": sum(len(f) for f in self.followers.values()),
+            "deduplicated_total": self.deduplicated,
+        }
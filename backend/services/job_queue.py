@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JobFactory = Callable[[], Awaitable[Any]]
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+def _summarize(samples: Deque[float]) -> Dict[str, Optional[float]]:
+    """Summarize a window of duration samples in seconds."""
+    if not samples:
+        return {"avg": None, "p50": None, "p95": None, "max": None}
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    return {
+        "avg": round(sum(ordered) / len(ordered), 3),
+        "p50": round(percentile(0.50), 3),
+        "p95": round(percentile(0.95), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class JobQueue:
+    """Bounded FIFO of research jobs drained by a fixed pool of worker tasks.
+
+    A job that handles its own errors returns "failed" or "cancelled" to be
+    counted as such; any other return value counts as completed.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue_size: int = 100, sample_size: int = 500):
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max(1, max_queue_size)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self.workers: List[asyncio.Task] = []
+
+        # Job IDs in arrival order, used for queue positions
+        self.pending: Dict[str, float] = {}
+        self.running: Dict[str, float] = {}
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+        self.wait_times: Deque[float] = deque(maxlen=sample_size)
+        self.run_times: Deque[float] = deque(maxlen=sample_size)
+        self.counters = {
+            "submitted": 0,
+            "rejected": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+        }
+
+    async def start(self) -> None:
+        """Spawn the worker tasks."""
+        if self.workers:
+            return
+        self.workers = [
+            asyncio.create_task(self._worker(i), name=f"research-worker-{i}")
+            for i in range(self.max_workers)
+        ]
+        logger.info(f"Job queue started with {self.max_workers} workers (capacity {self.max_queue_size})")
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks; jobs still queued are dropped."""
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    def submit(self, job_id: str, job: JobFactory) -> int:
+        """Enqueue a job and return its 1-based queue position.
+
+        Raises QueueFullError when the queue is at capacity.
+        """
+        try:
+            self.queue.put_nowait((job_id, job, time.monotonic()))
+        except asyncio.QueueFull:
+            self.counters["rejected"] += 1
+            raise QueueFullError(f"Research queue is full ({self.max_queue_size} jobs waiting)")
+        self.pending[job_id] = time.monotonic()
+        self.counters["submitted"] += 1
+        return len(self.pending)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a running job's task tree, or drop a queued job from the positions.
+
+        A queued job is still handed to a worker when its turn comes, so the
+        job itself can see it was cancelled and clean up.
+        """
+        if task := self.tasks.get(job_id):
+            task.cancel()
+            return True
+        return self.pending.pop(job_id, None) is not None
+
+    def position(self, job_id: str) -> Optional[int]:
+        """Return a job's 1-based queue position, 0 if running, or None if unknown."""
+        if job_id in self.running:
+            return 0
+        for position, pending_id in enumerate(self.pending, 1):
+            if pending_id == job_id:
+                return position
+        return None
+
+    def estimated_wait(self, position: int) -> Optional[float]:
+        """Rough wait estimate in seconds for a job at the given queue position."""
+        if not self.run_times or position <= 0:
+            return None
+        avg_run = sum(self.run_times) / len(self.run_times)
+        return round(avg_run * position / self.max_workers, 1)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, concurrency and timing statistics."""
+        return {
+            "workers": self.max_workers,
+            "capacity": self.max_queue_size,
+            "depth": self.queue.qsize(),
+            "running": len(self.running),
+            "counters": dict(self.counters),
+            "wait_time_seconds": _summarize(self.wait_times),
+            "run_time_seconds": _summarize(self.run_times),
+        }
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            job_id, job, enqueued_at = await self.queue.get()
+            self.pending.pop(job_id, None)
+            started_at = time.monotonic()
+            self.wait_times.append(started_at - enqueued_at)
+            self.running[job_id] = started_at
+            logger.info(f"Worker {worker_id} starting job {job_id} after {started_at - enqueued_at:.2f}s in queue")
+            # Run the job as its own task so it can be cancelled without losing the worker
+            task = asyncio.create_task(job(), name=f"research-job-{job_id}")
+            self.tasks[job_id] = task
+            try:
+                outcome = await task
+                self.counters[outcome if outcome in ("failed", "cancelled") else "completed"] += 1
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    task.cancel()
+                    raise
+                self.counters["cancelled"] += 1
+                logger.info(f"Job {job_id} cancelled in worker {worker_id}")
+            except Exception as e:
+                self.counters["failed"] += 1
+                logger.error(f"Job {job_id} failed in worker {worker_id}: {e}", exc_info=True)
+            finally:
+                self.run_times.append(time.monotonic() - started_at)
+                self.running.pop(job_id, None)
+                self.tasks.pop(job_id, None)
+                self.queue.task_done()
@@ -0,0 +1,292 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Jobs in these states can be evicted; queued and running jobs always stay in memory
+TERMINAL_STATUSES = {"completed", "failed", "cancelled"}
+
+# Large fields that are kept in the backing store rather than in memory
+HEAVY_FIELDS = ("report", "artifacts", "result")
+
+
+def _new_entry() -> Dict[str, Any]:
+    return {
+        "status": "pending",
+        "result": None,
+        "error": None,
+        "debug_info": [],
+        "company": None,
+        "report": None,
+        "last_update": datetime.now().isoformat()
+    }
+
+
+class FileJobStore:
+    """Persists job entries as gzipped JSON files, one per job.
+
+    Keeps an index of stored jobs (file mtime and size) so lookups of jobs
+    it doesn't hold never touch the disk. Files older than max_age_seconds
+    and the oldest files beyond max_files are pruned.
+    """
+
+    SUFFIX = ".json.gz"
+
+    def __init__(self, directory: str, max_age_seconds: float = 7 * 24 * 3600, max_files: int = 20000):
+        self.directory = directory
+        self.max_age_seconds = max_age_seconds
+        self.max_files = max(1, max_files)
+        self.lock = threading.Lock()
+        self.index: Dict[str, tuple] = {}
+        self.pruned = 0
+        os.makedirs(directory, exist_ok=True)
+        for entry in os.scandir(directory):
+            if entry.name.endswith(self.SUFFIX):
+                stat = entry.stat()
+                self.index[entry.name[:-len(self.SUFFIX)]] = (stat.st_mtime, stat.st_size)
+        self.prune()
+
+    @staticmethod
+    def _safe_id(job_id: str) -> str:
+        # Job IDs are server-generated UUIDs; strip anything that could leave the directory
+        return "".join(c for c in job_id if c.isalnum() or c == "-")
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{self._safe_id(job_id)}{self.SUFFIX}")
+
+    def __contains__(self, job_id: str) -> bool:
+        return self._safe_id(job_id) in self.index
+
+    def save(self, job_id: str, entry: Dict[str, Any]) -> None:
+        path = self._path(job_id)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(entry, f, default=str)
+        os.replace(tmp_path, path)
+        with self.lock:
+            self.index[self._safe_id(job_id)] = (time.time(), os.path.getsize(path))
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if job_id not in self:
+            return None
+        try:
+            with gzip.open(self._path(job_id), "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            with self.lock:
+                self.index.pop(self._safe_id(job_id), None)
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable stored job {job_id}: {e}")
+            return None
+
+    def prune(self) -> int:
+        """Delete expired files, then the oldest ones over max_files; returns how many were removed."""
+        cutoff = time.time() - self.max_age_seconds
+        with self.lock:
+            by_age = sorted(self.index.items(), key=lambda item: item[1][0])
+            excess = len(by_age) - self.max_files
+            doomed = [
+                safe_id for position, (safe_id, (mtime, _)) in enumerate(by_age)
+                if mtime < cutoff or position < excess
+            ]
+            for safe_id in doomed:
+                self.index.pop(safe_id, None)
+        for safe_id in doomed:
+            try:
+                os.remove(os.path.join(self.directory, f"{safe_id}{self.SUFFIX}"))
+            except FileNotFoundError:
+                pass
+        self.pruned += len(doomed)
+        return len(doomed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            sizes = [size for _, size in self.index.values()]
+        return {
+            "directory": self.directory,
+            "jobs": len(sizes),
+            "bytes": sum(sizes),
+            "pruned_total": self.pruned,
+        }
+
+
+class JobRegistry:
+    """Bounded registry of job status entries.
+
+    Finished jobs are evicted after ttl_seconds, and the least recently used
+    finished jobs are evicted whenever more than max_entries are held. With a
+    store, heavy fields (report, artifacts, result) are written through to it
+    and dropped from memory once written, and evicted jobs are loaded back by
+    fetch() and load().
+
+    Store I/O runs on one background thread, so it stays off the event loop
+    and a job's writes and reads happen in order. get() and membership
+    checks only look at memory; handlers that may see evicted jobs call
+    fetch() first.
+    """
+
+    # Writes between prunes of the store directory
+    PRUNE_EVERY = 100
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 5000,
+                 store: Optional[FileJobStore] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.store = store
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.updated_at: Dict[str, float] = {}
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-store") if store else None
+        self.writes = 0
+        # Jobs with a write in flight stay in memory until it lands
+        self.writing: Dict[str, int] = {}
+        self.evicted = 0
+        self.offloaded = 0
+
+    def __contains__(self, job_id: str) -> bool:
+        return self.get(job_id) is not None
+
+    def __getitem__(self, job_id: str) -> Dict[str, Any]:
+        if (entry := self.get(job_id)) is None:
+            raise KeyError(job_id)
+        return entry
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's in-memory entry (without offloaded fields)."""
+        if job_id in self.entries:
+            self.entries.move_to_end(job_id)
+            return self.entries[job_id]
+        return None
+
+    async def _in_store_thread(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def fetch(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's entry, loading an evicted one back from the store."""
+        if (entry := self.get(job_id)) is not None:
+            return entry
+        if not self.store or job_id not in self.store:
+            return None
+        if not (stored := await self._in_store_thread(self.store.load, job_id)):
+            return None
+        # Another caller may have loaded or updated it meanwhile
+        if (entry := self.get(job_id)) is not None:
+            return entry
+        entry = {key: value for key, value in stored.items() if key not in HEAVY_FIELDS}
+        entry["offloaded"] = [key for key in HEAVY_FIELDS if stored.get(key) is not None]
+        self._put(job_id, entry)
+        return entry
+
+    def update(self, job_id: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Create or update a job's entry; heavy fields go to the store when there is one."""
+        entry = self.get(job_id) or _new_entry()
+        entry.update(fields)
+        if "last_update" not in fields:
+            entry["last_update"] = datetime.now().isoformat()
+
+        if self.store and (any(fields.get(key) is not None for key in HEAVY_FIELDS)
+                           or entry.get("status") in TERMINAL_STATUSES):
+            self._persist(job_id, entry)
+
+        self._put(job_id, entry)
+        self._evict()
+        return entry
+
+    def _persist(self, job_id: str, entry: Dict[str, Any]) -> None:
+        """Queue the entry's write-through; heavy fields leave memory once it is on disk."""
+        record = {key: value for key, value in entry.items() if key != "offloaded"}
+        # Fields offloaded earlier are only on disk, so the write merges with the stored record
+        merge = bool(entry.get("offloaded")) or job_id in self.store
+        loop = asyncio.get_running_loop()
+        self.writing[job_id] = self.writing.get(job_id, 0) + 1
+        future = self.executor.submit(self._write, job_id, record, merge)
+        future.add_done_callback(
+            lambda f: loop.call_soon_threadsafe(self._written, job_id, entry, record, f)
+        )
+
+    def _write(self, job_id: str, record: Dict[str, Any], merge: bool) -> Dict[str, Any]:
+        if merge and (stored := self.store.load(job_id)):
+            record = {**stored, **record}
+        self.store.save(job_id, record)
+        self.writes += 1
+        if self.writes % self.PRUNE_EVERY == 0:
+            self.store.prune()
+        return record
+
+    def _written(self, job_id: str, entry: Dict[str, Any], record: Dict[str, Any], future) -> None:
+        if (remaining := self.writing.pop(job_id) - 1) > 0:
+            self.writing[job_id] = remaining
+        if (error := future.exception()) is not None:
+            logger.warning(f"Failed to persist job {job_id}, keeping it in memory: {error}")
+            return
+        stored = future.result()
+        if any(record.get(key) is not None for key in HEAVY_FIELDS):
+            self.offloaded += 1
+        # Fields replaced by a newer update stay until that update's write lands
+        for key in HEAVY_FIELDS:
+            if key in entry and entry[key] is record.get(key):
+                entry.pop(key)
+        entry["offloaded"] = [key for key in HEAVY_FIELDS if stored.get(key) is not None and key not in entry]
+        self._evict()
+
+    async def load(self, job_id: str, field: str) -> Any:
+        """Read a field, including heavy fields that were offloaded to the store."""
+        if (entry := await self.fetch(job_id)) is None:
+            return None
+        if field in entry or field not in entry.get("offloaded", []):
+            return entry.get(field)
+        stored = await self._in_store_thread(self.store.load, job_id)
+        return (stored or {}).get(field)
+
+    def _put(self, job_id: str, entry: Dict[str, Any]) -> None:
+        self.entries[job_id] = entry
+        self.entries.move_to_end(job_id)
+        self.updated_at[job_id] = time.monotonic()
+
+    def _evictable(self) -> Iterable[str]:
+        return [
+            job_id for job_id, entry in self.entries.items()
+            if entry.get("status") in TERMINAL_STATUSES and job_id not in self.writing
+        ]
+
+    def _drop(self, job_id: str) -> None:
+        self.entries.pop(job_id, None)
+        self.updated_at.pop(job_id, None)
+        self.evicted += 1
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for job_id in self._evictable():
+            if now - self.updated_at[job_id] > self.ttl_seconds:
+                self._drop(job_id)
+
+        # Oldest finished jobs go first when over capacity
+        if len(self.entries) > self.max_entries:
+            for job_id in self._evictable():
+                if len(self.entries) <= self.max_entries:
+                    break
+                self._drop(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry counts and approximate memory held by the registry."""
+        self._evict()
+        return {
+            "entries": len(self.entries),
+            "active": sum(1 for e in self.entries.values() if e.get("status") not in TERMINAL_STATUSES),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "approx_bytes": sum(len(json.dumps(e, default=str)) for e in self.entries.values()),
+            "evicted_total": self.evicted,
+            "offloaded_total": self.offloaded,
+            "pending_writes": sum(self.writing.values()),
+            "store": self.store.stats() if self.store else None,
+        }
@@ -1,66 +1,120 @@
+import os
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import certifi
-from pymongo import MongoClient
+from pymongo import ASCENDING, DESCENDING, InsertOne, MongoClient, UpdateOne
+from pymongo.write_concern import WriteConcern
 
+from .storage import FINAL_JOB_STATUSES, ResearchStorage
 
-class MongoDBService:
-    def __init__(self, uri: str):
+
+def _write_concern(value: str) -> WriteConcern:
+    return WriteConcern(w=int(value) if value.isdigit() else value)
+
+
+class MongoDBService(ResearchStorage):
+    """MongoDB storage backend.
+
+    Inserts and final statuses use MONGODB_WRITE_CONCERN; batches holding only
+    progress updates use MONGODB_STATUS_WRITE_CONCERN.
+    """
+
+    name = "mongodb"
+
+    def __init__(self, uri: str, max_workers: int = 4, flush_interval: float = 0.2, max_retries: int = 5):
+        super().__init__(max_workers=max_workers, flush_interval=flush_interval, max_retries=max_retries)
+        write_concern = os.getenv("MONGODB_WRITE_CONCERN", "majority")
         # Use certifi for SSL certificate verification with updated options
         self.client = MongoClient(
             uri,
             tlsCAFile=certifi.where(),
             retryWrites=True,
-            w='majority'
+            w=int(write_concern) if write_concern.isdigit() else write_concern
         )
         self.db = self.client.get_database('tavily_research')
         self.jobs = self.db.jobs
         self.reports = self.db.reports
+        self.artifacts = self.db.artifacts
+        self.documents = self.db.documents
+        # Progress-only status updates can take a cheaper acknowledgement
+        self.status_jobs = self.jobs.with_options(
+            write_concern=_write_concern(os.getenv("MONGODB_STATUS_WRITE_CONCERN", "1"))
+        )
 
-    def create_job(self, job_id: str, inputs: Dict[str, Any]) -> None:
-        """Create a new research job record."""
-        self.jobs.insert_one({
-            "job_id": job_id,
-            "inputs": inputs,
-            "status": "pending",
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
-        })
-
-    def update_job(self, job_id: str, 
-                  status: str = None,
-                  result: Dict[str, Any] = None,
-                  error: str = None) -> None:
-        """Update a research job with results or status."""
-        update_data = {"updated_at": datetime.utcnow()}
-        if status:
-            update_data["status"] = status
-        if result:
-            update_data["result"] = result
-        if error:
-            update_data["error"] = error
-
-        self.jobs.update_one(
-            {"job_id": job_id},
-            {"$set": update_data}
+    def _setup(self) -> None:
+        self.jobs.create_index([("job_id", ASCENDING)])
+        self.jobs.create_index([("created_at", DESCENDING)])
+        self.jobs.create_index([("inputs.company", ASCENDING), ("created_at", DESCENDING)])
+        self.reports.create_index([("job_id", ASCENDING)])
+        self.reports.create_index([("created_at", DESCENDING)])
+        self.reports.create_index([("fingerprint", ASCENDING), ("created_at", DESCENDING)])
+        self.artifacts.create_index([("job_id", ASCENDING), ("kind", ASCENDING)])
+        self.artifacts.create_index([("kind", ASCENDING), ("key", ASCENDING), ("created_at", DESCENDING)])
+
+    def _write_batch(self, jobs: Dict[str, Dict[str, Any]], reports: List[Dict[str, Any]],
+                     artifacts: List[Dict[str, Any]], documents: Dict[str, Dict[str, Any]]) -> None:
+        if jobs:
+            operations = [
+                InsertOne(pending["insert"]) if "insert" in pending
+                else UpdateOne({"job_id": job_id}, {"$set": pending["set"]})
+                for job_id, pending in jobs.items()
+            ]
+            durable = any(
+                "insert" in pending or pending["set"].get("status") in FINAL_JOB_STATUSES
+                for pending in jobs.values()
+            )
+            (self.jobs if durable else self.status_jobs).bulk_write(operations, ordered=False)
+        if reports:
+            self.reports.bulk_write([InsertOne(report) for report in reports], ordered=False)
+        if documents:
+            # Documents are keyed by content hash, so one already stored is left as is
+            self.documents.bulk_write([
+                UpdateOne({"_id": doc_id}, {"$setOnInsert": document}, upsert=True)
+                for doc_id, document in documents.items()
+            ], ordered=False)
+        if artifacts:
+            self.artifacts.bulk_write([InsertOne(dict(record)) for record in artifacts], ordered=False)
+
+    def _get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.jobs.find_one({"job_id": job_id}, {"_id": 0})
+
+    def _get_report(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.reports.find_one({"job_id": job_id}, {"_id": 0})
+
+    def _find_latest_report(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        return self.reports.find_one(
+            {"fingerprint": fingerprint},
+            {"_id": 0},
+            sort=[("created_at", DESCENDING)]
         )
 
-    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve a job by ID."""
-        return self.jobs.find_one({"job_id": job_id})
-
-    def store_report(self, job_id: str, report_data: Dict[str, Any]) -> None:
-        """Store the finalized research report."""
-        self.reports.insert_one({
-            "job_id": job_id,
-            "report_content": report_data.get("report", ""),
-            "references": report_data.get("references", []),
-            "sections": report_data.get("sections_completed", []),
-            "analyst_queries": report_data.get("analyst_queries", {}),
-            "created_at": datetime.utcnow()
-        })
-
-    def get_report(self, job_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve a report by job ID."""
-        return self.reports.find_one({"job_id": job_id}) 
\ No newline at end of file
+    def _get_artifacts(self, job_id: str, kind: Optional[str]) -> List[Dict[str, Any]]:
+        query = {"job_id": job_id, **({"kind": kind} if kind else {})}
+        return list(self.artifacts.find(query, {"_id": 0}))
+
+    def _get_documents(self, doc_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        return {
+            document.pop("_id"): document
+            for document in self.documents.find({"_id": {"$in": doc_ids}})
+        }
+
+    def _list_jobs(self, company: Optional[str], status: Optional[str],
+                   before: Optional[datetime], limit: int) -> List[Dict[str, Any]]:
+        query: Dict[str, Any] = {}
+        if company:
+            query["inputs.company"] = company
+        if status:
+            query["status"] = status
+        if before:
+            query["created_at"] = {"$lt": before}
+        cursor = self.jobs.find(query, {"_id": 0}).sort("created_at", DESCENDING).limit(limit)
+        return list(cursor)
+
+    def _list_report_ids(self, after: Optional[datetime], limit: int) -> List[Dict[str, Any]]:
+        query = {"created_at": {"$gt": after}} if after else {}
+        cursor = self.reports.find(query, {"_id": 0, "job_id": 1, "created_at": 1}).sort("created_at", ASCENDING).limit(limit)
+        return list(cursor)
+
+    def _close(self) -> None:
+        self.client.close()
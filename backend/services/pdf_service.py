@@ -1,18 +1,68 @@
+import asyncio
+import hashlib
 import io
 import logging
+import multiprocessing
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
+from backend.services.job_queue import QueueFullError
 from backend.utils.utils import generate_pdf_from_md
 
 logger = logging.getLogger(__name__)
 
+# Part of every cache key; bump it whenever PDF layout or styles change
+PDF_STYLE_VERSION = "2"
+
+
+def pdf_cache_key(markdown_content: str) -> str:
+    """Cache key of a report's PDF: a hash of its markdown and the style version."""
+    digest = hashlib.sha256(f"{PDF_STYLE_VERSION}\0{markdown_content}".encode())
+    return digest.hexdigest()[:32]
+
+
+def render_pdf(markdown_content: str) -> bytes:
+    """Render markdown to PDF bytes; runs in a render process."""
+    pdf_buffer = io.BytesIO()
+    generate_pdf_from_md(markdown_content, pdf_buffer)
+    return pdf_buffer.getvalue()
+
+
 class PDFService:
+    """Renders report PDFs.
+
+    ReportLab layout is CPU-bound, so async callers render in a bounded
+    process pool instead of on the event loop. At most max_pending renders
+    are accepted at once; a render that outlives its timeout is abandoned by
+    the caller but keeps its slot until its process finishes it.
+
+    Rendered PDFs are cached in the output directory under their
+    pdf_cache_key, least recently used first out once the directory grows
+    past max_cache_bytes. Concurrent requests for the same report share one
+    render. A request that times out stops waiting, but the render carries on
+    and its PDF is still cached, with later requests waiting for it instead of
+    starting another.
+    """
+
     def __init__(self, config):
         self.output_dir = config.get("pdf_output_dir", "pdfs")
+        self.max_workers = max(1, config.get("max_workers", 2))
+        self.max_pending = max(self.max_workers, config.get("max_pending", 8))
+        self.timeout = config.get("timeout_seconds", 60)
+        self.max_cache_bytes = config.get("max_cache_bytes", 200 * 1024 * 1024)
+        self.executor = None
+        self.pending = 0
+        # Renders in progress by cache key
+        self.rendering = {}
+        self.counters = {
+            "rendered": 0, "rejected": 0, "timed_out": 0, "failed": 0,
+            "cache_hits": 0, "cache_misses": 0, "evicted": 0
+        }
         # Create output directory if it doesn't exist
         os.makedirs(self.output_dir, exist_ok=True)
-        
+
     def _sanitize_company_name(self, company_name):
         """Sanitize company name for use in filenames."""
         # Replace spaces with underscores and remove special characters
@@ -24,42 +74,172 @@ class PDFService:
         sanitized_name = self._sanitize_company_name(company_name)
         return f"{sanitized_name}_report.pdf"
     
-    def generate_pdf_stream(self, markdown_content, company_name=None):
+    def _resolve_filename(self, markdown_content, company_name=None):
+        """PDF filename from the company name, or the report's title line."""
+        if not company_name:
+            first_line = markdown_content.split('\n')[0].strip()
+            if first_line.startswith('# '):
+                company_name = first_line[2:].strip()
+            else:
+                company_name = "Company Research"
+        return self._generate_pdf_filename(company_name)
+
+    def _executor(self):
+        if self.executor is None:
+            # Spawned rather than forked: the API process runs threads
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self.executor
+
+    def _release(self, future):
+        self.pending -= 1
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            # A render process died; start a fresh pool for the next request
+            self.executor = None
+
+    async def render(self, markdown_content, company_name=None):
+        """
+        Render a PDF in the process pool without blocking the event loop.
+
+        Returns:
+            tuple: (PDF bytes, filename)
+
+        Raises:
+            QueueFullError: if max_pending renders are already in progress
+            asyncio.TimeoutError: if the render takes longer than the timeout
+        """
+        future = self._submit(markdown_content)
+        filename = self._resolve_filename(markdown_content, company_name)
+        try:
+            # Shielded so a timeout leaves the render running and its slot taken
+            pdf_bytes = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.counters["timed_out"] += 1
+            logger.error(f"PDF render for {filename} timed out after {self.timeout}s")
+            raise
+        except Exception:
+            self.counters["failed"] += 1
+            raise
+        self.counters["rendered"] += 1
+        return pdf_bytes, filename
+
+    def _submit(self, markdown_content):
+        """Start a render in the process pool and return its future."""
+        if self.pending >= self.max_pending:
+            self.counters["rejected"] += 1
+            raise QueueFullError(f"PDF renderer is busy ({self.pending} renders in progress)")
+        future = asyncio.get_running_loop().run_in_executor(self._executor(), render_pdf, markdown_content)
+        self.pending += 1
+        future.add_done_callback(self._release)
+        return future
+
+    def cache_path(self, key):
+        """Path of a cached PDF, whether or not it exists."""
+        return os.path.join(self.output_dir, f"{key}.pdf")
+
+    def cached(self, key):
+        """Path of the cached PDF for a key, or None; a hit counts as a use for eviction."""
+        path = self.cache_path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    async def get_or_render(self, markdown_content, company_name=None):
         """
-        Generate a PDF from markdown content and return it as a stream.
-        
-        Args:
-            markdown_content (str): The markdown content to convert to PDF
-            company_name (str, optional): The company name to use in the filename
-            
+        Cached PDF for a report, rendering it first on a miss.
+
         Returns:
-            tuple: (success status, PDF stream or error message)
+            tuple: (path, cache key, filename)
+        """
+        key = pdf_cache_key(markdown_content)
+        filename = self._resolve_filename(markdown_content, company_name)
+        if path := self.cached(key):
+            self.counters["cache_hits"] += 1
+            return path, key, filename
+        if (task := self.rendering.get(key)) is None:
+            self.counters["cache_misses"] += 1
+            task = asyncio.create_task(self._render_to_cache(key, self._submit(markdown_content)))
+            self.rendering[key] = task
+            task.add_done_callback(lambda finished: self._render_done(key, finished))
+        try:
+            # Shielded so a caller giving up or timing out leaves the render to finish and be cached
+            return await asyncio.wait_for(asyncio.shield(task), self.timeout), key, filename
+        except asyncio.TimeoutError:
+            self.counters["timed_out"] += 1
+            logger.error(f"PDF render for {filename} timed out after {self.timeout}s, it will still be cached")
+            raise
+
+    async def _render_to_cache(self, key, future):
+        try:
+            pdf_bytes = await future
+        except Exception:
+            self.counters["failed"] += 1
+            raise
+        self.counters["rendered"] += 1
+        return await asyncio.to_thread(self._store, key, pdf_bytes)
+
+    def _render_done(self, key, task):
+        self.rendering.pop(key, None)
+        if not task.cancelled():
+            # Retrieved here so a render every caller stopped waiting for doesn't log as unhandled
+            task.exception()
+
+    def _store(self, key, pdf_bytes):
+        path = self.cache_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(pdf_bytes)
+        os.replace(tmp_path, path)
+        self._evict(keep=path)
+        return path
+
+    def _evict(self, keep):
+        entries = []
+        for entry in os.scandir(self.output_dir):
+            if entry.name.endswith(".pdf") and entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_cache_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.counters["evicted"] += 1
+
+    async def prerender(self, markdown_content, company_name=None):
+        """Fill the cache for a finished report in the background.
+
+        Skipped while every render process is busy, so pre-rendering never
+        queues ahead of someone waiting for a download.
         """
+        if self.pending >= self.max_workers:
+            logger.info("Skipping PDF pre-render, renderer is busy")
+            return
         try:
-            # Extract company name from the first line if not provided
-            if not company_name:
-                first_line = markdown_content.split('\n')[0].strip()
-                if first_line.startswith('# '):
-                    company_name = first_line[2:].strip()
-                else:
-                    company_name = "Company Research"
-            
-            # Generate the output filename
-            pdf_filename = self._generate_pdf_filename(company_name)
-            
-            # Create a BytesIO object to store the PDF
-            pdf_buffer = io.BytesIO()
-            
-            # Generate the PDF directly to the buffer
-            generate_pdf_from_md(markdown_content, pdf_buffer)
-            
-            # Reset buffer position to start
-            pdf_buffer.seek(0)
-            
-            # Return success and the buffer
-            return True, (pdf_buffer, pdf_filename)
-            
+            await self.get_or_render(markdown_content, company_name)
         except Exception as e:
-            error_msg = f"Error generating PDF: {str(e)}"
-            logger.error(error_msg)
-            return False, error_msg
\ No newline at end of file
+            logger.warning(f"PDF pre-render failed: {e}")
+
+    def close(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def stats(self):
+        return {
+            "workers": self.max_workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "rendering": len(self.rendering),
+            **self.counters
+        }
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import os
+from typing import Any, Callable, Dict, Optional
+
+from .event_encoding import decode_event, encode_event
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis is optional; without it events stay in this process
+    aioredis = None
+
+# Called with (job_id, message) for every event published on any job channel
+EventHandler = Callable[[str, Dict[str, Any]], None]
+
+
+class InMemoryPubSub:
+    """Delivers published events straight to this process's handler."""
+
+    def __init__(self):
+        self.handler: Optional[EventHandler] = None
+
+    def bind(self, handler: EventHandler):
+        self.handler = handler
+
+    async def start(self):
+        pass
+
+    def publish(self, job_id: str, message: Dict[str, Any]):
+        if self.handler:
+            self.handler(job_id, message)
+
+    async def close(self):
+        self.handler = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory"}
+
+
+class RedisPubSub:
+    """Publishes events on one Redis channel per job and delivers every job's events back.
+
+    Each process subscribes to all job channels, so its event buffer can replay
+    any job to clients that connect to it, wherever the job is running. Works
+    with any server speaking the Redis pub/sub protocol (Redis, Valkey, KeyDB).
+    Publishes are queued and sent in order by one task, so publish() never
+    blocks the caller.
+    """
+
+    def __init__(self, url: str, prefix: str = "research:events:", max_pending: int = 10000):
+        self.url = url
+        self.prefix = prefix
+        self.client = aioredis.from_url(url)
+        self.outbox: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.handler: Optional[EventHandler] = None
+        self.tasks = []
+        self.published = 0
+        self.received = 0
+        self.dropped = 0
+
+    def bind(self, handler: EventHandler):
+        self.handler = handler
+
+    async def start(self):
+        self.tasks = [
+            asyncio.create_task(self._listen()),
+            asyncio.create_task(self._send())
+        ]
+        logger.info(f"Publishing job events through {self.url}")
+
+    def publish(self, job_id: str, message: Dict[str, Any]):
+        try:
+            self.outbox.put_nowait((job_id, message))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"Event outbox full, dropping event {message.get('seq')} for job {job_id}")
+
+    async def _send(self):
+        while True:
+            job_id, message = await self.outbox.get()
+            try:
+                await self.client.publish(f"{self.prefix}{job_id}", encode_event(message))
+                self.published += 1
+            except Exception as e:
+                logger.error(f"Failed to publish event for job {job_id}: {e}")
+
+    async def _listen(self):
+        while True:
+            try:
+                async with self.client.pubsub() as pubsub:
+                    await pubsub.psubscribe(f"{self.prefix}*")
+                    async for item in pubsub.listen():
+                        if item.get("type") != "pmessage":
+                            continue
+                        channel = item["channel"]
+                        if isinstance(channel, bytes):
+                            channel = channel.decode()
+                        self.received += 1
+                        self.handler(channel[len(self.prefix):], decode_event(item["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Event subscription lost, reconnecting: {e}")
+                await asyncio.sleep(1)
+
+    async def close(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        await self.client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "redis",
+            "published": self.published,
+            "received": self.received,
+            "dropped": self.dropped,
+            "outbox": self.outbox.qsize(),
+        }
+
+
+def create_pubsub():
+    """Redis pub/sub when EVENTS_REDIS_URL is set and redis is installed, in-memory otherwise."""
+    url = os.getenv("EVENTS_REDIS_URL")
+    if not url:
+        return InMemoryPubSub()
+    if aioredis is None:
+        logger.warning("EVENTS_REDIS_URL is set but redis is not installed, events stay in this process")
+        return InMemoryPubSub()
+    return RedisPubSub(url, prefix=os.getenv("EVENTS_CHANNEL_PREFIX", "research:events:"))
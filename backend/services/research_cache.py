@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ResearchCache:
+    """Process-wide TTL cache with single-flight loading.
+
+    Concurrent callers asking for the same key share one in-flight load, so
+    companies researched side by side in a batch trigger each search once.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 2000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_create(self, key: Hashable, factory: Callable[[], Awaitable[Any]],
+                            cache_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Return the cached value for key, loading it with factory on a miss.
+
+        A loaded value that fails cache_if is still shared with concurrent
+        waiters but not stored, so the next caller loads it again.
+        """
+        now = time.monotonic()
+        if key in self.entries:
+            stored_at, value = self.entries[key]
+            if now - stored_at < self.ttl_seconds:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self.entries[key]
+
+        if key in self.inflight:
+            self.hits += 1
+            future = self.inflight[key]
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The loading job was cancelled, not us: load it ourselves
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    return await self.get_or_create(key, factory, cache_if)
+                raise
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            value = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved; waiters re-raise it themselves
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if cache_if is not None and not cache_if(value):
+                return value
+            self.entries[key] = (time.monotonic(), value)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            return value
+        finally:
+            self.inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.entries),
+            "inflight": len(self.inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+shared_cache = ResearchCache()
@@ -0,0 +1,100 @@
+import logging
+from typing import Any, Dict
+
+from backend.graph import Graph
+from backend.services.time_budget import default_budget_seconds
+from backend.utils.depth import resolve_depth
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = ['company', 'industry', 'financial', 'news']
+
+# Briefings only read this much of each document, so stored copies need no more
+MAX_STORED_CONTENT = 8000
+
+
+def _compact_docs(docs: Dict[str, Any]) -> Dict[str, Any]:
+    """Plain-data copies of curated documents, trimmed for storage."""
+    compact = {}
+    for url, doc in (docs or {}).items():
+        compact[url] = {
+            key: doc[key]
+            for key in ('title', 'url', 'query', 'score', 'doc_type', 'evaluation', 'content', 'source')
+            if key in doc
+        }
+        if raw_content := doc.get('raw_content'):
+            compact[url]['raw_content'] = raw_content[:MAX_STORED_CONTENT]
+    return compact
+
+
+def collect_artifacts(final_state: Dict[str, Any]) -> Dict[str, Any]:
+    """Intermediate results a later refresh run can reuse instead of recomputing."""
+    return {
+        "briefings": {
+            category: final_state.get(f'{category}_briefing', '') for category in CATEGORIES
+        },
+        "curated": {
+            f'{category}_data': _compact_docs(final_state.get(f'curated_{category}_data'))
+            for category in CATEGORIES
+        },
+        "queries": final_state.get('analyst_queries') or {},
+        "references": final_state.get('references', []),
+        "reference_info": final_state.get('reference_info', {}),
+        "reference_titles": final_state.get('reference_titles', {})
+    }
+
+
+async def run_research(job_id: str, inputs: Dict[str, Any], websocket_manager) -> Dict[str, Any]:
+    """Run the research graph for one job and return its picklable outcome.
+
+    Shared by the in-process scheduler and the worker processes, so the
+    result only carries plain data: the report and its reusable artifacts,
+    or an error message. Passing inputs["baseline"] runs an incremental
+    refresh on top of a previous job's artifacts, and inputs["resume"]
+    continues the job from its last checkpoint. inputs["time_budget_seconds"]
+    caps the run's latency; degradations applied to meet it are returned,
+    along with the seconds spent in each node.
+    """
+    graph = Graph(
+        company=inputs.get("company"),
+        url=inputs.get("company_url"),
+        industry=inputs.get("industry"),
+        hq_location=inputs.get("hq_location"),
+        websocket_manager=websocket_manager,
+        job_id=job_id,
+        progressive=bool(inputs.get("progressive")),
+        batch_id=inputs.get("batch_id"),
+        baseline=inputs.get("baseline"),
+        time_budget=inputs.get("time_budget_seconds") or default_budget_seconds(),
+        depth=resolve_depth(inputs.get("depth"))
+    )
+
+    state = {}
+    async for s in graph.run(thread={}, resume=bool(inputs.get("resume"))):
+        state.update(s)
+
+    # Look for the compiled report in either location.
+    report_content = state.get('report') or (state.get('editor') or {}).get('report')
+    if report_content:
+        logger.info(f"Found report in final state (length: {len(report_content)})")
+        return {
+            "report": report_content,
+            "error": None,
+            "artifacts": {**collect_artifacts(state.get('editor') or {}), "timings": graph.node_timings},
+            "degradations": graph.budget.degradations,
+            "timings": graph.node_timings
+        }
+
+    logger.error(f"Research completed without finding report. State keys: {list(state.keys())}")
+    logger.error(f"Editor state: {state.get('editor', {})}")
+
+    # Check if there was a specific error in the state
+    error_message = "No report found"
+    if error := state.get('error'):
+        error_message = f"Error: {error}"
+    return {
+        "report": None,
+        "error": error_message,
+        "degradations": graph.budget.degradations,
+        "timings": graph.node_timings
+    }
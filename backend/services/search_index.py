@@ -0,0 +1,293 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+from .storage import content_id
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS report_sections USING fts5(
+    job_id UNINDEXED, company, section, body, created_at UNINDEXED, company_key UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5(
+    content_id UNINDEXED, url UNINDEXED, title, content,
+    tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS document_jobs (
+    content_id TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    company TEXT,
+    PRIMARY KEY (content_id, job_id)
+);
+CREATE TABLE IF NOT EXISTS indexed_jobs (
+    job_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS indexed_jobs_created_at ON indexed_jobs (created_at);
+CREATE INDEX IF NOT EXISTS document_jobs_company ON document_jobs (company);
+"""
+
+SECTION_HEADING = re.compile(r"^#{1,3}\s+(.+?)\s*$", re.MULTILINE)
+# Sections that only list sources add noise to every query
+SKIPPED_SECTIONS = {"references"}
+
+
+def split_sections(report: str) -> List[Tuple[str, str]]:
+    """(heading, body) pairs of a markdown report, split at #, ## and ### headings."""
+    headings = list(SECTION_HEADING.finditer(report))
+    sections = []
+    if headings and (preamble := report[:headings[0].start()].strip()):
+        sections.append(("", preamble))
+    for i, heading in enumerate(headings):
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(report)
+        title = heading.group(1).strip()
+        if title.lower() in SKIPPED_SECTIONS:
+            continue
+        if body := report[heading.end():end].strip():
+            sections.append((title, body))
+    if not headings and report.strip():
+        sections.append(("", report.strip()))
+    return sections
+
+
+def match_expression(query: str) -> str:
+    """FTS5 MATCH expression requiring every term of a free-text query.
+
+    Terms are quoted so user input never reaches the FTS5 query syntax; a
+    trailing * on a term keeps its prefix search.
+    """
+    terms = []
+    for term in query.split():
+        prefix = term.endswith("*") and len(term) > 1
+        term = term.rstrip("*").replace('"', '""')
+        if term:
+            terms.append(f'"{term}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def fts5_available() -> bool:
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE probe USING fts5(body)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+class SearchIndex:
+    """SQLite FTS5 index over report sections and curated documents.
+
+    Jobs are indexed as they complete; curated documents are indexed once per
+    content hash and linked to every job that used them. The index lives in
+    its own file, so it works alongside either storage backend. Writes are
+    serialized on one lock; reads use their own connections and, with WAL,
+    don't wait on them.
+    """
+
+    def __init__(self, path: str, max_workers: int = 2):
+        self.path = path
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search")
+        self.local = threading.local()
+        self.connections: List[sqlite3.Connection] = []
+        self.connections_lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.indexed = 0
+        self.searches = 0
+        if directory := os.path.dirname(path):
+            os.makedirs(directory, exist_ok=True)
+
+    async def _run(self, fn, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(fn, *args, **kwargs))
+
+    def _connection(self) -> sqlite3.Connection:
+        if (conn := getattr(self.local, "conn", None)) is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+            with self.connections_lock:
+                self.connections.append(conn)
+        return conn
+
+    async def start(self, storage=None) -> None:
+        """Create the index and, with a storage backend, catch up on reports it doesn't hold yet."""
+        await self._run(self._setup)
+        if storage:
+            asyncio.create_task(self.backfill(storage))
+
+    def _setup(self) -> None:
+        conn = self._connection()
+        columns = [row["name"] for row in conn.execute("PRAGMA table_info(report_sections)")]
+        if columns and "company_key" not in columns:
+            self._add_company_key(conn)
+        conn.executescript(SCHEMA)
+        # Company filters compare lower-cased names; older indexes stored them as given
+        conn.execute("UPDATE document_jobs SET company = lower(company) WHERE company != lower(company)")
+        conn.commit()
+
+    @staticmethod
+    def _add_company_key(conn: sqlite3.Connection) -> None:
+        """Rebuild an older report_sections table with the lower-cased company_key column."""
+        with conn:
+            conn.execute("ALTER TABLE report_sections RENAME TO report_sections_old")
+            conn.executescript(SCHEMA)
+            conn.execute(
+                "INSERT INTO report_sections (job_id, company, section, body, created_at, company_key) "
+                "SELECT job_id, company, section, body, created_at, lower(company) FROM report_sections_old"
+            )
+            conn.execute("DROP TABLE report_sections_old")
+
+    async def backfill(self, storage, page_size: int = 500) -> None:
+        """Index every stored report the index doesn't hold yet, oldest first.
+
+        Walks all stored report ids rather than only those newer than the
+        latest indexed one, so a job whose indexing failed is retried.
+        """
+        after = None
+        count = 0
+        try:
+            while keys := await storage.list_report_ids(after=after, limit=page_size):
+                for job_id in await self._run(self._missing, [key["job_id"] for key in keys]):
+                    report = await storage.get_report(job_id)
+                    # Duplicates store a copy of the report their leader was indexed with
+                    if not report or report.get("duplicate_of") or not report.get("company"):
+                        continue
+                    artifacts = await storage.load_artifacts(job_id) or report.get("artifacts") or {}
+                    await self.index_job(
+                        job_id, report.get("company"), report.get("report_content", ""),
+                        artifacts, report["created_at"]
+                    )
+                    count += 1
+                after = keys[-1]["created_at"]
+        except Exception as e:
+            logger.error(f"Search index backfill stopped after {count} reports: {e}")
+            return
+        if count:
+            logger.info(f"Search index caught up on {count} stored reports")
+
+    def _missing(self, job_ids: List[str]) -> List[str]:
+        """The given job ids that aren't indexed, in order."""
+        placeholders = ", ".join("?" * len(job_ids))
+        indexed = {
+            row["job_id"] for row in self._connection().execute(
+                f"SELECT job_id FROM indexed_jobs WHERE job_id IN ({placeholders})", job_ids
+            )
+        }
+        return list(dict.fromkeys(job_id for job_id in job_ids if job_id not in indexed))
+
+    async def index_job(self, job_id: str, company: Optional[str], report: str,
+                        artifacts: Optional[Dict[str, Any]] = None,
+                        created_at: Optional[datetime] = None) -> None:
+        """Add a completed job's report sections and curated documents to the index."""
+        try:
+            await self._run(self._index_job, job_id, company, report, artifacts or {},
+                            created_at or datetime.utcnow())
+        except Exception as e:
+            logger.error(f"Failed to index job {job_id} for search: {e}")
+
+    def _index_job(self, job_id: str, company: Optional[str], report: str,
+                   artifacts: Dict[str, Any], created_at: datetime) -> None:
+        conn = self._connection()
+        company_key = company.lower() if company else company
+        with self.write_lock, conn:
+            if conn.execute("SELECT 1 FROM indexed_jobs WHERE job_id = ?", (job_id,)).fetchone():
+                return
+            conn.executemany(
+                "INSERT INTO report_sections (job_id, company, section, body, created_at, company_key) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(job_id, company, section, body, created_at.isoformat(), company_key)
+                 for section, body in split_sections(report)]
+            )
+            for docs in (artifacts.get("curated") or {}).values():
+                for url, doc in (docs or {}).items():
+                    doc_id = content_id(doc)
+                    known = conn.execute(
+                        "SELECT 1 FROM document_jobs WHERE content_id = ? LIMIT 1", (doc_id,)
+                    ).fetchone()
+                    conn.execute(
+                        "INSERT OR IGNORE INTO document_jobs (content_id, job_id, company) VALUES (?, ?, ?)",
+                        (doc_id, job_id, company_key)
+                    )
+                    if not known and (text := doc.get("raw_content") or doc.get("content")):
+                        conn.execute(
+                            "INSERT INTO documents (content_id, url, title, content) VALUES (?, ?, ?, ?)",
+                            (doc_id, url, doc.get("title", ""), text)
+                        )
+            conn.execute("INSERT INTO indexed_jobs (job_id, created_at) VALUES (?, ?)",
+                         (job_id, created_at.isoformat()))
+        self.indexed += 1
+
+    async def search(self, query: str, kind: Optional[str] = None, company: Optional[str] = None,
+                     limit: int = 20) -> List[Dict[str, Any]]:
+        """Best matches first; report sections and documents share one bm25 ranking. `company` ignores case."""
+        if not (expression := match_expression(query)):
+            return []
+        self.searches += 1
+        return await self._run(self._search, expression, kind, company, limit)
+
+    def _search(self, expression: str, kind: Optional[str], company: Optional[str],
+                limit: int) -> List[Dict[str, Any]]:
+        conn = self._connection()
+        company = company.lower() if company else company
+        hits = []
+        if kind in (None, "report"):
+            rows = conn.execute(
+                "SELECT job_id, company, section, created_at, bm25(report_sections) AS score, "
+                "snippet(report_sections, 3, '**', '**', ' … ', 24) AS snippet "
+                "FROM report_sections WHERE report_sections MATCH ?"
+                + (" AND company_key = ?" if company else "") + " ORDER BY score LIMIT ?",
+                (expression, *([company] if company else []), limit)
+            ).fetchall()
+            hits.extend({"type": "report", **dict(row)} for row in rows)
+        if kind in (None, "document"):
+            rows = conn.execute(
+                "SELECT documents.content_id, url, title, bm25(documents) AS score, "
+                "snippet(documents, 3, '**', '**', ' … ', 24) AS snippet, "
+                "(SELECT json_group_array(job_id) FROM document_jobs WHERE document_jobs.content_id = documents.content_id"
+                + (" AND document_jobs.company = ?" if company else "") + ") AS job_ids "
+                "FROM documents WHERE documents MATCH ?"
+                + (" AND documents.content_id IN (SELECT content_id FROM document_jobs WHERE company = ?)" if company else "")
+                + " ORDER BY score LIMIT ?",
+                (*([company] if company else []), expression, *([company] if company else []), limit)
+            ).fetchall()
+            hits.extend({"type": "document", **dict(row), "job_ids": json.loads(row["job_ids"])} for row in rows)
+        # bm25 scores are negative, lower is better
+        hits.sort(key=lambda hit: hit["score"])
+        for hit in hits:
+            hit["score"] = round(-hit["score"], 4)
+        return hits[:limit]
+
+    async def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        with self.connections_lock:
+            for conn in self.connections:
+                conn.close()
+            self.connections.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "indexed": self.indexed,
+            "searches": self.searches,
+            "bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
+
+
+def create_search_index() -> Optional[SearchIndex]:
+    """FTS5 index at SEARCH_DB (default search.db); empty turns search off."""
+    if not (path := os.getenv("SEARCH_DB", "search.db")):
+        return None
+    if not fts5_available():
+        logger.warning("SQLite was built without FTS5, report search is disabled")
+        return None
+    return SearchIndex(path)
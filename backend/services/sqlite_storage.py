@@ -0,0 +1,262 @@
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .storage import ResearchStorage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    company TEXT,
+    status TEXT,
+    inputs TEXT,
+    result TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_created_at ON jobs (created_at DESC);
+CREATE INDEX IF NOT EXISTS jobs_company ON jobs (company, created_at DESC);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    fingerprint TEXT,
+    company TEXT,
+    created_at TEXT NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_job_id ON reports (job_id);
+CREATE INDEX IF NOT EXISTS reports_fingerprint ON reports (fingerprint, created_at DESC);
+CREATE INDEX IF NOT EXISTS reports_created_at ON reports (created_at);
+
+CREATE TABLE IF NOT EXISTS artifacts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT,
+    created_at TEXT NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS artifacts_job_id ON artifacts (job_id, kind);
+CREATE INDEX IF NOT EXISTS artifacts_kind ON artifacts (kind, key, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS documents (
+    content_id TEXT PRIMARY KEY,
+    body BLOB NOT NULL
+);
+"""
+
+# Job fields kept in their own columns; the rest of a report lives in its compressed body
+JOB_COLUMNS = ("company", "status", "inputs", "result", "error", "created_at", "updated_at")
+JSON_COLUMNS = ("inputs", "result")
+REPORT_COLUMNS = ("job_id", "fingerprint", "company", "created_at")
+
+
+def _pack(document: Any) -> bytes:
+    return zlib.compress(json.dumps(document, default=str).encode(), 6)
+
+
+def _unpack(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob))
+
+
+class SQLiteStorage(ResearchStorage):
+    """Embedded storage backend on a single SQLite file in WAL mode.
+
+    Each pool thread has its own connection; WAL lets reads proceed while a
+    batch is written. Report bodies, artifact records and content-store
+    documents are stored as zlib-compressed JSON next to the indexed lookup
+    columns.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, max_workers: int = 4, flush_interval: float = 0.2, max_retries: int = 5):
+        super().__init__(max_workers=max_workers, flush_interval=flush_interval, max_retries=max_retries)
+        self.path = path
+        self.local = threading.local()
+        self.connections: List[sqlite3.Connection] = []
+        self.connections_lock = threading.Lock()
+        if directory := os.path.dirname(path):
+            os.makedirs(directory, exist_ok=True)
+
+    def _connection(self) -> sqlite3.Connection:
+        if (conn := getattr(self.local, "conn", None)) is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+            with self.connections_lock:
+                self.connections.append(conn)
+        return conn
+
+    def _setup(self) -> None:
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    def _write_batch(self, jobs: Dict[str, Dict[str, Any]], reports: List[Dict[str, Any]],
+                     artifacts: List[Dict[str, Any]], documents: Dict[str, Dict[str, Any]]) -> None:
+        conn = self._connection()
+        with conn:
+            for job_id, pending in jobs.items():
+                if "insert" in pending:
+                    doc = pending["insert"]
+                    values = {
+                        **{column: doc.get(column) for column in JOB_COLUMNS},
+                        "company": (doc.get("inputs") or {}).get("company"),
+                    }
+                    conn.execute(
+                        f"INSERT OR REPLACE INTO jobs (job_id, {', '.join(JOB_COLUMNS)}) "
+                        f"VALUES (?, {', '.join('?' for _ in JOB_COLUMNS)})",
+                        (job_id, *(self._encode(column, values[column]) for column in JOB_COLUMNS))
+                    )
+                else:
+                    fields = {k: v for k, v in pending["set"].items() if k in JOB_COLUMNS}
+                    conn.execute(
+                        f"UPDATE jobs SET {', '.join(f'{column} = ?' for column in fields)} WHERE job_id = ?",
+                        (*(self._encode(column, value) for column, value in fields.items()), job_id)
+                    )
+            conn.executemany(
+                "INSERT INTO reports (job_id, fingerprint, company, created_at, body) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        report["job_id"], report.get("fingerprint"), report.get("company"),
+                        report["created_at"].isoformat(),
+                        _pack({k: v for k, v in report.items() if k not in REPORT_COLUMNS})
+                    )
+                    for report in reports
+                ]
+            )
+            # Documents are keyed by content hash, so one already stored is left as is
+            conn.executemany(
+                "INSERT OR IGNORE INTO documents (content_id, body) VALUES (?, ?)",
+                [(doc_id, _pack(document)) for doc_id, document in documents.items()]
+            )
+            conn.executemany(
+                "INSERT INTO artifacts (job_id, kind, key, created_at, body) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (record["job_id"], record["kind"], record["key"],
+                     record["created_at"].isoformat(), _pack(record["body"]))
+                    for record in artifacts
+                ]
+            )
+
+    @staticmethod
+    def _encode(column: str, value: Any) -> Any:
+        if value is None:
+            return None
+        if column in JSON_COLUMNS:
+            return json.dumps(value, default=str)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> Dict[str, Any]:
+        # Same shape as a MongoDB job document; company is only a lookup column here
+        job = {"job_id": row["job_id"], "status": row["status"]}
+        for column in ("inputs", "result", "error", "created_at", "updated_at"):
+            if (value := row[column]) is None:
+                continue
+            if column in JSON_COLUMNS:
+                value = json.loads(value)
+            elif column in ("created_at", "updated_at"):
+                value = datetime.fromisoformat(value)
+            job[column] = value
+        return job
+
+    @staticmethod
+    def _report(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            **_unpack(row["body"]),
+            "job_id": row["job_id"],
+            "fingerprint": row["fingerprint"],
+            "company": row["company"],
+            "created_at": datetime.fromisoformat(row["created_at"])
+        }
+
+    def _get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def _get_report(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            "SELECT * FROM reports WHERE job_id = ? ORDER BY created_at DESC LIMIT 1", (job_id,)
+        ).fetchone()
+        return self._report(row) if row else None
+
+    def _find_latest_report(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            "SELECT * FROM reports WHERE fingerprint = ? ORDER BY created_at DESC LIMIT 1", (fingerprint,)
+        ).fetchone()
+        return self._report(row) if row else None
+
+    def _get_artifacts(self, job_id: str, kind: Optional[str]) -> List[Dict[str, Any]]:
+        query = "SELECT * FROM artifacts WHERE job_id = ?" + (" AND kind = ?" if kind else "") + " ORDER BY id"
+        rows = self._connection().execute(query, (job_id, kind) if kind else (job_id,)).fetchall()
+        return [
+            {
+                "job_id": row["job_id"],
+                "kind": row["kind"],
+                "key": row["key"],
+                "created_at": datetime.fromisoformat(row["created_at"]),
+                "body": _unpack(row["body"])
+            }
+            for row in rows
+        ]
+
+    def _get_documents(self, doc_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        documents = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(doc_ids), 500):
+            chunk = doc_ids[start:start + 500]
+            rows = self._connection().execute(
+                f"SELECT * FROM documents WHERE content_id IN ({', '.join('?' for _ in chunk)})", chunk
+            ).fetchall()
+            documents.update((row["content_id"], _unpack(row["body"])) for row in rows)
+        return documents
+
+    def _list_jobs(self, company: Optional[str], status: Optional[str],
+                   before: Optional[datetime], limit: int) -> List[Dict[str, Any]]:
+        clauses, params = [], []
+        if company:
+            clauses.append("company = ?")
+            params.append(company)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if before:
+            clauses.append("created_at < ?")
+            params.append(before.isoformat())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connection().execute(
+            f"SELECT * FROM jobs {where} ORDER BY created_at DESC LIMIT ?", (*params, limit)
+        ).fetchall()
+        return [self._job(row) for row in rows]
+
+    def _list_report_ids(self, after: Optional[datetime], limit: int) -> List[Dict[str, Any]]:
+        rows = self._connection().execute(
+            "SELECT job_id, created_at FROM reports WHERE created_at > ? ORDER BY created_at LIMIT ?",
+            (after.isoformat() if after else "", limit)
+        ).fetchall()
+        return [{"job_id": row["job_id"], "created_at": datetime.fromisoformat(row["created_at"])} for row in rows]
+
+    def _close(self) -> None:
+        with self.connections_lock:
+            for conn in self.connections:
+                conn.close()
+            self.connections.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["path"] = self.path
+        stats["bytes"] = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return stats
@@ -0,0 +1,377 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Job statuses backends write durably; progress updates may be acknowledged more cheaply
+FINAL_JOB_STATUSES = {"completed", "failed", "cancelled"}
+
+# Curated document fields kept once in the content store, shared by every job that found them
+CONTENT_FIELDS = ("content", "raw_content")
+REFERENCE_FIELDS = ("references", "reference_info", "reference_titles")
+
+
+def content_id(doc: Dict[str, Any]) -> str:
+    """Content-store handle for a curated document's text."""
+    content = json.dumps({field: doc.get(field) for field in CONTENT_FIELDS}, sort_keys=True)
+    return hashlib.sha256(content.encode()).hexdigest()[:32]
+
+
+def split_artifacts(artifacts: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Break a job's artifacts into (kind, key, body) records and content-store documents.
+
+    Curated documents become handles: their metadata plus the content_id
+    of their text in the content store.
+    """
+    records, documents = [], {}
+    for category, briefing in (artifacts.get("briefings") or {}).items():
+        if briefing:
+            records.append({"kind": "briefing", "key": category, "body": briefing})
+    for field, docs in (artifacts.get("curated") or {}).items():
+        handles = []
+        for url, doc in (docs or {}).items():
+            doc_id = content_id(doc)
+            documents[doc_id] = {field: doc[field] for field in CONTENT_FIELDS if doc.get(field)}
+            handles.append({
+                **{key: value for key, value in doc.items() if key not in CONTENT_FIELDS},
+                "url": url,
+                "content_id": doc_id
+            })
+        records.append({"kind": "curated", "key": field, "body": handles})
+    for category, queries in (artifacts.get("queries") or {}).items():
+        records.append({"kind": "queries", "key": category, "body": queries})
+    if any(field in artifacts for field in REFERENCE_FIELDS):
+        records.append({"kind": "references", "key": None, "body": {field: artifacts.get(field) for field in REFERENCE_FIELDS}})
+    if timings := artifacts.get("timings"):
+        records.append({"kind": "timings", "key": None, "body": timings})
+    return records, documents
+
+
+def join_artifacts(records: Iterable[Dict[str, Any]], documents: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Rebuild the artifacts dict a refresh run takes from stored records and documents."""
+    artifacts: Dict[str, Any] = {"briefings": {}, "curated": {}, "queries": {}}
+    for record in records:
+        kind, key, body = record["kind"], record["key"], record["body"]
+        if kind == "briefing":
+            artifacts["briefings"][key] = body
+        elif kind == "curated":
+            artifacts["curated"][key] = {
+                handle["url"]: {
+                    **{field: value for field, value in handle.items() if field != "content_id"},
+                    **documents.get(handle.get("content_id"), {})
+                }
+                for handle in body
+            }
+        elif kind == "queries":
+            artifacts["queries"][key] = body
+        elif kind == "references":
+            artifacts.update(body)
+        elif kind == "timings":
+            artifacts["timings"] = body
+    return artifacts
+
+
+def merge_job_writes(older: Dict[str, Any], newer: Dict[str, Any]) -> Dict[str, Any]:
+    """One pending job write with the effect of `older` followed by `newer`."""
+    if "insert" in newer:
+        return newer
+    if "insert" in older:
+        return {"insert": {**older["insert"], **newer["set"]}}
+    return {"set": {**older["set"], **newer["set"]}}
+
+
+class ResearchStorage:
+    """Job and report persistence shared by the storage backends.
+
+    Backends implement the blocking _setup, _write_batch and _get/_find/_list
+    methods for jobs, reports, artifact records and the content store; this class keeps them off the event loop. Every backend call runs
+    in a bounded thread pool. Writes are queued and returned from immediately:
+    a single writer task flushes them every flush_interval seconds, folding all
+    pending updates of a job into one operation. Reads of a job with queued
+    writes flush them first. A batch that fails to write goes back in front of
+    the queue and is retried with backoff, up to max_retries times in a row.
+    """
+
+    name = "storage"
+
+    def __init__(self, max_workers: int = 4, flush_interval: float = 0.2, max_retries: int = 5):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=self.name)
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        # Pending job writes in arrival order: a document to insert, or fields to set
+        self.pending_jobs: Dict[str, Dict[str, Any]] = {}
+        self.pending_reports: List[Dict[str, Any]] = []
+        self.pending_artifacts: List[Dict[str, Any]] = []
+        self.pending_documents: Dict[str, Dict[str, Any]] = {}
+        self.flush_lock = asyncio.Lock()
+        self.writer: Optional[asyncio.Task] = None
+        self.wakeup = asyncio.Event()
+        self.writes = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.dropped_batches = 0
+        # Failed attempts in a row of the batch now at the front of the queue
+        self.retries = 0
+
+    async def _run(self, fn, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(fn, *args, **kwargs))
+
+    async def start(self) -> None:
+        """Prepare the backend (schema, indexes) and start the background writer."""
+        try:
+            await self._run(self._setup)
+        except Exception as e:
+            logger.warning(f"Failed to prepare {self.name} storage: {e}")
+        self._ensure_writer()
+
+    def _ensure_writer(self) -> None:
+        if self.writer is None or self.writer.done():
+            self.writer = asyncio.create_task(self._write_loop())
+
+    async def _write_loop(self) -> None:
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            # Let more writes pile up so they share a round trip
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+            if self.retries:
+                await asyncio.sleep(min(self.flush_interval * 2 ** self.retries, 30))
+
+    def _queue(self) -> None:
+        self._ensure_writer()
+        self.wakeup.set()
+
+    def create_job(self, job_id: str, inputs: Dict[str, Any]) -> None:
+        """Create a new research job record."""
+        self.pending_jobs[job_id] = {
+            "insert": {
+                "job_id": job_id,
+                "inputs": inputs,
+                "status": "pending",
+                "created_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow()
+            }
+        }
+        self._queue()
+
+    def update_job(self, job_id: str,
+                  status: str = None,
+                  result: Dict[str, Any] = None,
+                  error: str = None) -> None:
+        """Update a research job with results or status."""
+        update_data = {"updated_at": datetime.utcnow()}
+        if status:
+            update_data["status"] = status
+        if result:
+            update_data["result"] = result
+        if error:
+            update_data["error"] = error
+
+        pending = self.pending_jobs.setdefault(job_id, {"set": {}})
+        # A job created in this batch is inserted with its latest fields
+        pending["insert" if "insert" in pending else "set"].update(update_data)
+        self._queue()
+
+    def store_report(self, job_id: str, report_data: Dict[str, Any]) -> None:
+        """Store the finalized research report."""
+        self.pending_reports.append({
+            "job_id": job_id,
+            "report_content": report_data.get("report", ""),
+            "references": report_data.get("references", []),
+            "sections": report_data.get("sections_completed", []),
+            "analyst_queries": report_data.get("analyst_queries", {}),
+            "fingerprint": report_data.get("fingerprint"),
+            "company": report_data.get("company"),
+            "duplicate_of": report_data.get("duplicate_of"),
+            "created_at": datetime.utcnow()
+        })
+        self._queue()
+
+    def store_artifacts(self, job_id: str, artifacts: Dict[str, Any]) -> None:
+        """Store a job's intermediate results as separate records, with curated text in the content store."""
+        records, documents = split_artifacts(artifacts)
+        created_at = datetime.utcnow()
+        self.pending_artifacts.extend({**record, "job_id": job_id, "created_at": created_at} for record in records)
+        self.pending_documents.update(documents)
+        self._queue()
+
+    async def flush(self) -> None:
+        """Write everything queued so far in one batch."""
+        async with self.flush_lock:
+            jobs, self.pending_jobs = self.pending_jobs, {}
+            reports, self.pending_reports = self.pending_reports, []
+            artifacts, self.pending_artifacts = self.pending_artifacts, []
+            documents, self.pending_documents = self.pending_documents, {}
+            if not jobs and not reports and not artifacts:
+                return
+            try:
+                await self._run(self._write_batch, jobs, reports, artifacts, documents)
+                self.writes += len(jobs) + len(reports) + len(artifacts)
+                self.batches += 1
+                self.retries = 0
+            except Exception as e:
+                self.failed_batches += 1
+                self.retries += 1
+                if self.retries > self.max_retries:
+                    self.dropped_batches += 1
+                    self.retries = 0
+                    logger.error(
+                        f"Dropping {len(jobs)} job, {len(reports)} report and {len(artifacts)} "
+                        f"artifact updates after {self.max_retries} failed retries: {e}"
+                    )
+                    return
+                logger.warning(
+                    f"Failed to write {len(jobs)} job, {len(reports)} report and {len(artifacts)} "
+                    f"artifact updates, retry {self.retries} of {self.max_retries}: {e}"
+                )
+                self._requeue(jobs, reports, artifacts, documents)
+
+    def _requeue(self, jobs: Dict[str, Dict[str, Any]], reports: List[Dict[str, Any]],
+                 artifacts: List[Dict[str, Any]], documents: Dict[str, Dict[str, Any]]) -> None:
+        """Put a failed batch back in front of the writes queued since it was taken."""
+        merged = dict(jobs)
+        for job_id, newer in self.pending_jobs.items():
+            merged[job_id] = merge_job_writes(merged[job_id], newer) if job_id in merged else newer
+        self.pending_jobs = merged
+        self.pending_reports = reports + self.pending_reports
+        self.pending_artifacts = artifacts + self.pending_artifacts
+        self.pending_documents = {**documents, **self.pending_documents}
+        self._queue()
+
+    async def _flush_if_pending(self, job_ids: Set[str]) -> None:
+        if (job_ids & self.pending_jobs.keys()
+                or any(r["job_id"] in job_ids for r in self.pending_reports)
+                or any(a["job_id"] in job_ids for a in self.pending_artifacts)):
+            await self.flush()
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a job by ID."""
+        await self._flush_if_pending({job_id})
+        return await self._run(self._get_job, job_id)
+
+    async def get_report(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a report by job ID."""
+        await self._flush_if_pending({job_id})
+        return await self._run(self._get_report, job_id)
+
+    async def find_latest_report(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Retrieve the most recent report for a request fingerprint."""
+        return await self._run(self._find_latest_report, fingerprint)
+
+    async def get_artifacts(self, job_id: str, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """A job's artifact records, optionally of one kind; curated documents are handles."""
+        await self._flush_if_pending({job_id})
+        return await self._run(self._get_artifacts, job_id, kind)
+
+    async def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Text of a curated document from the content store."""
+        return (await self._run(self._get_documents, [doc_id])).get(doc_id)
+
+    async def load_artifacts(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job's artifacts in the shape refresh runs take, or None if it stored none."""
+        await self._flush_if_pending({job_id})
+        return await self._run(self._load_artifacts, job_id)
+
+    def _load_artifacts(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if not (records := self._get_artifacts(job_id, None)):
+            return None
+        doc_ids = {
+            handle["content_id"] for record in records if record["kind"] == "curated"
+            for handle in record["body"] if handle.get("content_id")
+        }
+        return join_artifacts(records, self._get_documents(list(doc_ids)))
+
+    async def list_jobs(self, company: Optional[str] = None, status: Optional[str] = None,
+                        before: Optional[datetime] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent jobs first, optionally filtered by company, status and creation time."""
+        if self.pending_jobs:
+            await self.flush()
+        return await self._run(self._list_jobs, company, status, before, limit)
+
+    async def list_report_ids(self, after: Optional[datetime] = None, limit: int = 1000) -> List[Dict[str, Any]]:
+        """job_id and created_at of stored reports created after `after`, oldest first."""
+        if self.pending_reports:
+            await self.flush()
+        return await self._run(self._list_report_ids, after, limit)
+
+    async def close(self) -> None:
+        """Write what is still queued and release the backend."""
+        if self.writer:
+            self.writer.cancel()
+            await asyncio.gather(self.writer, return_exceptions=True)
+        await self.flush()
+        self.executor.shutdown(wait=True)
+        self._close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "pending_jobs": len(self.pending_jobs),
+            "pending_reports": len(self.pending_reports),
+            "pending_artifacts": len(self.pending_artifacts),
+            "writes": self.writes,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "dropped_batches": self.dropped_batches,
+        }
+
+    # Blocking backend operations, run in the thread pool
+
+    def _setup(self) -> None:
+        pass
+
+    def _write_batch(self, jobs: Dict[str, Dict[str, Any]], reports: List[Dict[str, Any]],
+                     artifacts: List[Dict[str, Any]], documents: Dict[str, Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def _get_artifacts(self, job_id: str, kind: Optional[str]) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def _get_documents(self, doc_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        raise NotImplementedError
+
+    def _get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def _get_report(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def _find_latest_report(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def _list_jobs(self, company: Optional[str], status: Optional[str],
+                   before: Optional[datetime], limit: int) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def _list_report_ids(self, after: Optional[datetime], limit: int) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        pass
+
+
+def create_storage() -> Optional[ResearchStorage]:
+    """MongoDB when MONGODB_URI is set, otherwise the embedded SQLite database at RESEARCH_DB.
+
+    Setting RESEARCH_DB to an empty value turns persistence off.
+    """
+    max_workers = int(os.getenv("STORAGE_MAX_WORKERS", "4"))
+    flush_interval = float(os.getenv("STORAGE_FLUSH_INTERVAL_MS", "200")) / 1000
+    max_retries = int(os.getenv("STORAGE_MAX_RETRIES", "5"))
+    if mongo_uri := os.getenv("MONGODB_URI"):
+        from .mongodb import MongoDBService
+        return MongoDBService(mongo_uri, max_workers=max_workers, flush_interval=flush_interval,
+                              max_retries=max_retries)
+    if path := os.getenv("RESEARCH_DB", "research.db"):
+        from .sqlite_storage import SQLiteStorage
+        return SQLiteStorage(path, max_workers=max_workers, flush_interval=flush_interval,
+                             max_retries=max_retries)
+    return None
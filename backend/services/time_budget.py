@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Share of the job budget each stage gets when the job is on schedule
+STAGE_SHARES = [
+    ("grounding", 0.10),
+    ("research", 0.30),
+    ("enrichment", 0.20),
+    ("briefing", 0.20),
+    ("editing", 0.20),
+]
+
+# A stage is "tight" when it is left with less than this fraction of its nominal share
+TIGHT_RATIO = 0.6
+
+
+def default_budget_seconds() -> Optional[float]:
+    """Job budget from RESEARCH_TIME_BUDGET_SECONDS, or None when unset/zero."""
+    seconds = float(os.getenv("RESEARCH_TIME_BUDGET_SECONDS", "0") or 0)
+    return seconds if seconds > 0 else None
+
+
+class TimeBudget:
+    """Per-job latency budget split across the graph stages.
+
+    Each stage gets its share of whatever time is left when it starts, so a
+    slow stage squeezes the ones after it instead of pushing the job past its
+    deadline. Nodes ask whether their stage is tight to pick cheaper work and
+    record every degradation they apply. A budget of None never degrades.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds if seconds and seconds > 0 else None
+        self.deadline: Optional[float] = None
+        self.stage_ends: Dict[str, float] = {}
+        self.degradations: List[Dict[str, Any]] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.seconds is not None
+
+    def start(self) -> None:
+        """Start the clock; called when the graph starts or resumes."""
+        if self.enabled:
+            self.deadline = time.monotonic() + self.seconds
+            self.stage_ends = {}
+
+    def remaining(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def stage_end(self, stage: str) -> Optional[float]:
+        """Monotonic time by which a stage should finish, fixed when first asked."""
+        if (remaining := self.remaining()) is None:
+            return None
+        if stage not in self.stage_ends:
+            names = [name for name, _ in STAGE_SHARES]
+            later = sum(share for _, share in STAGE_SHARES[names.index(stage):])
+            allowance = remaining * dict(STAGE_SHARES)[stage] / later
+            self.stage_ends[stage] = time.monotonic() + allowance
+        return self.stage_ends[stage]
+
+    def time_left(self, stage: str) -> Optional[float]:
+        """Seconds left in a stage's allowance, or None without a budget."""
+        if (end := self.stage_end(stage)) is None:
+            return None
+        return max(0.0, end - time.monotonic())
+
+    def is_tight(self, stage: str) -> bool:
+        """Whether a stage has noticeably less time than its nominal share."""
+        if (left := self.time_left(stage)) is None:
+            return False
+        return left < self.seconds * dict(STAGE_SHARES)[stage] * TIGHT_RATIO
+
+    def is_spent(self, stage: str) -> bool:
+        left = self.time_left(stage)
+        return left is not None and left <= 0
+
+    async def run_within(self, stage: str, awaitable: Awaitable[Any]) -> Any:
+        """Await within the stage's allowance; raises asyncio.TimeoutError when it runs out."""
+        return await asyncio.wait_for(awaitable, timeout=self.time_left(stage))
+
+    def degrade(self, stage: str, action: str, detail: str = "") -> None:
+        """Record a degradation applied to stay within the budget, once per stage/action/detail."""
+        if any((d["stage"], d["action"], d["detail"]) == (stage, action, detail) for d in self.degradations):
+            return
+        remaining = self.remaining()
+        self.degradations.append({
+            "stage": stage,
+            "action": action,
+            "detail": detail,
+            "remaining_seconds": round(remaining, 1) if remaining is not None else None
+        })
+        logger.info(f"Time budget: {stage} degraded ({action}) {detail}".rstrip())
@@ -1,20 +1,255 @@
-import json
+import asyncio
+import hashlib
 import logging
+import os
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Dict, Set
+from itertools import count
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Hashable, List, Optional, Set, Union
 
 from fastapi import WebSocket
 
+from .event_encoding import DEFAULT_ENCODING, encode_event, negotiate_encoding
+from .pubsub import InMemoryPubSub
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Progress statuses whose latest event supersedes earlier ones with the same key
+COALESCED_STATUSES = {
+    "document_kept": ("doc_type",),
+    "query_searching": ("category", "query"),
+    "query_searched": ("category", "query"),
+    "extracting": ("url",),
+    "extracted": ("url",),
+    "extraction_error": ("url",),
+}
+# Searches and extractions share a key across their start and finish events
+COALESCE_GROUPS = {
+    "query_searching": "query_search",
+    "query_searched": "query_search",
+    "extracting": "extract",
+    "extracted": "extract",
+    "extraction_error": "extract",
+}
+
+
+def coalesce_key(message: dict) -> Optional[Hashable]:
+    """Key under which a queued message is replaced by a newer one, or None to always deliver it."""
+    if message.get("type") == "state_update":
+        return ("state_update",)
+    data = message.get("data") or {}
+    status = data.get("status")
+    if status not in COALESCED_STATUSES:
+        return None
+    result = data.get("result") or {}
+    return (COALESCE_GROUPS.get(status, status), *(result.get(field) for field in COALESCED_STATUSES[status]))
+
+
+# Result fields sent in full once per job and referenced by ID after that
+LARGE_RESULT_FIELDS = ("report",)
+
+
+async def send_encoded(websocket: WebSocket, payload: Union[str, bytes]):
+    """Send an encoded event as a binary frame (msgpack) or a text frame (JSON)."""
+    if isinstance(payload, bytes):
+        await websocket.send_bytes(payload)
+    else:
+        await websocket.send_text(payload)
+
+
+class ClientConnection:
+    """Outbound queue and writer task for one WebSocket client.
+
+    Messages are queued without waiting on the network. A queued progress
+    event is dropped when a newer one with the same coalesce key is queued
+    behind everything else.
+    Once the queue reaches max_queue the client is degraded: progress
+    events are dropped and only events that must arrive are queued. A client
+    that falls further behind, or whose sends time out, is disconnected and
+    can reconnect with `since` to replay what it missed.
+    """
+
+    def __init__(self, websocket: WebSocket, on_drop: Callable[["ClientConnection"], None],
+                 max_queue: int = 256, send_timeout: float = 10.0, encoding: str = DEFAULT_ENCODING):
+        self.websocket = websocket
+        self.encoding = encoding
+        self.on_drop = on_drop
+        self.max_queue = max(1, max_queue)
+        self.send_timeout = send_timeout
+        self.pending: "OrderedDict[Hashable, Union[str, bytes]]" = OrderedDict()
+        self.ready = asyncio.Event()
+        self.degraded = False
+        self.closed = False
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self._ids = count()
+        self.writer = asyncio.create_task(self._drain())
+
+    def enqueue(self, payload: Union[str, bytes], key: Optional[Hashable] = None) -> bool:
+        """Queue a serialized message; returns False if the client has fallen too far behind."""
+        if self.closed:
+            return False
+        if key is not None and key in self.pending:
+            # The newer payload takes the tail so messages still go out in seq order
+            self.pending[key] = payload
+            self.pending.move_to_end(key)
+            self.coalesced += 1
+            return True
+        if len(self.pending) >= self.max_queue:
+            if not self.degraded:
+                self.degraded = True
+                logger.warning(f"WebSocket client is falling behind, dropping progress events "
+                               f"({len(self.pending)} queued)")
+            if key is not None:
+                self.dropped += 1
+                return True
+            if len(self.pending) >= 2 * self.max_queue:
+                return False
+        self.pending[key if key is not None else ("message", next(self._ids))] = payload
+        self.ready.set()
+        return True
+
+    async def _drain(self):
+        try:
+            while True:
+                await self.ready.wait()
+                while self.pending:
+                    _, payload = self.pending.popitem(last=False)
+                    await asyncio.wait_for(send_encoded(self.websocket, payload), self.send_timeout)
+                    self.sent += 1
+                if self.closed:
+                    await self._close_socket()
+                    return
+                # Nothing is awaited between the empty check and clearing, so no wakeup is lost
+                self.ready.clear()
+                if self.degraded:
+                    self.degraded = False
+                    logger.info("WebSocket client caught up, sending all events again")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Error sending message to client, disconnecting it: {e}")
+            self.on_drop(self)
+
+    def close_when_drained(self):
+        """Take no more messages and close the socket once the queued ones are sent."""
+        self.closed = True
+        self.ready.set()
+
+    async def _close_socket(self):
+        try:
+            await self.websocket.close(code=1000)
+        except Exception:
+            pass
+
+    def stop(self):
+        """Stop the writer task and discard anything still queued."""
+        self.closed = True
+        self.pending.clear()
+        self.writer.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self.pending),
+            "degraded": self.degraded,
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+        }
+
+
+class EventStreamSink:
+    """Stands in for a WebSocket so a Server-Sent Events response can be registered as a client.
+
+    The client's writer task puts frames here and the response generator takes
+    them out; the small bound means a stalled HTTP response stalls the writer,
+    whose send timeout then drops the client.
+    """
+
+    def __init__(self, max_frames: int = 8):
+        self.frames: asyncio.Queue = asyncio.Queue(maxsize=max_frames)
+        self.closed = False
+
+    async def send_text(self, frame: str):
+        await self.frames.put(frame)
+
+    async def close(self, code: int = 1000):
+        self.closed = True
+        # Make room for the end marker; the client resumes from its Last-Event-ID
+        while self.frames.full():
+            self.frames.get_nowait()
+        self.frames.put_nowait(None)
+
+
 class WebSocketManager:
-    def __init__(self):
+    """Delivers job events to WebSocket clients.
+
+    Events are published on a per-job channel of the pub/sub backend and
+    delivered to the clients connected to this process. With the default
+    in-memory backend that is every client; with a shared backend
+    (see pubsub.create_pubsub) clients on any process see any job's events.
+    """
+
+    def __init__(self, pubsub=None):
         # Store active connections for each job
         self.active_connections: Dict[str, Set[WebSocket]] = {}
+        # Jobs whose clients also receive another job's events (deduplicated requests)
+        self.linked_jobs: Dict[str, Set[str]] = {}
+        # Called with a job ID when its last client disconnects
+        self.on_job_idle: Optional[Callable[[str], None]] = None
+        # Recent sequenced events per job, replayed to clients that connect late or reconnect
+        self.event_logs: "OrderedDict[str, Deque[dict]]" = OrderedDict()
+        self.sequences: Dict[str, int] = {}
+        self.event_buffer_size = int(os.getenv("EVENT_BUFFER_SIZE", "500"))
+        self.event_buffer_jobs = int(os.getenv("EVENT_BUFFER_JOBS", "1000"))
+        # Outbound queue per client, so slow clients never hold up the pipeline
+        self.clients: Dict[WebSocket, ClientConnection] = {}
+        self.send_queue_size = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+        self.send_timeout = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", "10"))
+        self.dropped_clients = 0
+        # High-frequency progress events are sent at most once per interval per key;
+        # the latest held event goes out when the interval ends
+        self.progress_interval = float(os.getenv("WS_PROGRESS_MIN_INTERVAL_MS", "250")) / 1000
+        self.progress_sent_at: Dict[str, Dict[Hashable, float]] = {}
+        self.held_progress: Dict[str, "OrderedDict[Hashable, dict]"] = {}
+        self.flush_timers: Dict[str, asyncio.TimerHandle] = {}
+        # IDs of large payloads each job has already sent in full
+        self.large_payload_chars = int(os.getenv("WS_LARGE_PAYLOAD_CHARS", "4096"))
+        self.sent_payloads: Dict[str, Set[str]] = {}
+        self.sse_heartbeat = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+        self.pubsub = pubsub or InMemoryPubSub()
+        self.pubsub.bind(self._deliver)
+
+    async def start(self):
+        """Start receiving events from the pub/sub backend."""
+        await self.pubsub.start()
+
+    async def close(self):
+        await self.pubsub.close()
         
-    async def connect(self, websocket: WebSocket, job_id: str):
-        """Connect a new client to a specific job."""
+    async def connect(self, websocket: WebSocket, job_id: str, since: Optional[int] = 0,
+                      replay_from: Optional[str] = None, encoding: Optional[str] = None):
+        """Connect a new client to a specific job.
+
+        Buffered events with a sequence number above `since` are replayed
+        first (pass None to skip replay). replay_from names the job whose
+        events this client receives, for duplicates attached to another job.
+        encoding is the client's requested event encoding ("json" or "msgpack").
+        """
+        encoding = negotiate_encoding(encoding)
+        if since is not None:
+            await self.replay(websocket, replay_from or job_id, since, encoding)
+        # No await between the end of the replay and registration, so no event slips between them
+        self._register(websocket, job_id, encoding)
+
+    def _register(self, websocket: WebSocket, job_id: str, encoding: str):
+        if websocket not in self.clients:
+            self.clients[websocket] = ClientConnection(
+                websocket, self._drop_client, self.send_queue_size, self.send_timeout, encoding
+            )
         if job_id not in self.active_connections:
             self.active_connections[job_id] = set()
         self.active_connections[job_id].add(websocket)
@@ -26,42 +261,220 @@ class WebSocketManager:
         """Disconnect a client from a specific job."""
         if job_id in self.active_connections:
             self.active_connections[job_id].discard(websocket)
+            if not any(websocket in sockets for sockets in self.active_connections.values()):
+                if client := self.clients.pop(websocket, None):
+                    client.stop()
             if not self.active_connections[job_id]:
                 del self.active_connections[job_id]
+                if self.on_job_idle:
+                    self.on_job_idle(job_id)
             logger.info(f"WebSocket disconnected for job {job_id}")
             logger.info(f"Remaining connections for job: {len(self.active_connections.get(job_id, set()))}")
             logger.info(f"Remaining active jobs: {list(self.active_connections.keys())}")
                 
+    async def replay(self, websocket: WebSocket, job_id: str, since: int = 0,
+                     encoding: str = DEFAULT_ENCODING) -> int:
+        """Send buffered events newer than `since` to one client; returns the last sequence sent."""
+        last_seq = since
+        while pending := self._events_after(job_id, last_seq):
+            for event in pending:
+                await send_encoded(websocket, encode_event(event, encoding))
+                last_seq = event["seq"]
+        return last_seq
+
+    def _events_after(self, job_id: str, seq: int) -> List[dict]:
+        return [event for event in self.event_logs.get(job_id, ()) if event["seq"] > seq]
+
+    def has_events(self, job_id: str) -> bool:
+        return job_id in self.event_logs
+
+    async def stream(self, job_id: str, since: int = 0, replay_from: Optional[str] = None) -> AsyncIterator[str]:
+        """Server-Sent Events frames for a job: buffered events after `since`, then live ones.
+
+        Live events go through the same bounded, coalescing client queue as a
+        WebSocket. A comment line is sent when nothing happened for
+        SSE_HEARTBEAT_SECONDS, so proxies keep the response open.
+        """
+        last_seq = since
+        while pending := self._events_after(replay_from or job_id, last_seq):
+            for event in pending:
+                yield encode_event(event, "sse")
+                last_seq = event["seq"]
+
+        sink = EventStreamSink()
+        # As with connect, nothing is awaited between the end of the replay and registration
+        self._register(sink, job_id, "sse")
+        try:
+            while not sink.closed:
+                try:
+                    frame = await asyncio.wait_for(sink.frames.get(), self.sse_heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if frame is None:
+                    break
+                yield frame
+        finally:
+            self.disconnect(sink, job_id)
+
+    def _drop_client(self, client: ClientConnection):
+        """Disconnect a client that cannot keep up; it may reconnect and replay."""
+        if client.closed:
+            return
+        self.dropped_clients += 1
+        for job_id in [j for j, sockets in self.active_connections.items() if client.websocket in sockets]:
+            self.disconnect(client.websocket, job_id)
+        client.stop()
+        asyncio.create_task(self._close(client.websocket))
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            # 1013: try again later
+            await websocket.close(code=1013)
+        except Exception:
+            pass
+
+    def _next_seq(self, job_id: str) -> int:
+        seq = self.sequences.get(job_id, 0) + 1
+        self.sequences[job_id] = seq
+        return seq
+
+    def _record(self, job_id: str, message: dict) -> None:
+        """Buffer a sequenced message for replay."""
+        self.sequences[job_id] = max(self.sequences.get(job_id, 0), message["seq"])
+        if job_id not in self.event_logs:
+            self.event_logs[job_id] = deque(maxlen=self.event_buffer_size)
+            # Forget the least recently active jobs' events
+            while len(self.event_logs) > self.event_buffer_jobs:
+                stale_job_id, _ = self.event_logs.popitem(last=False)
+                self.sequences.pop(stale_job_id, None)
+                self.progress_sent_at.pop(stale_job_id, None)
+                self.sent_payloads.pop(stale_job_id, None)
+        self.event_logs.move_to_end(job_id)
+        self.event_logs[job_id].append(message)
+
+    def link_job(self, follower_id: str, leader_id: str):
+        """Deliver the leader job's events to clients of the follower job as well."""
+        self.linked_jobs.setdefault(leader_id, set()).add(follower_id)
+
+    def unlink_job(self, leader_id: str):
+        """Stop fanning out a finished leader job's events."""
+        self.linked_jobs.pop(leader_id, None)
+
+    def _connections_for(self, job_id: str) -> Set[WebSocket]:
+        connections = set(self.active_connections.get(job_id, set()))
+        for follower_id in self.linked_jobs.get(job_id, set()):
+            connections |= self.active_connections.get(follower_id, set())
+        return connections
+
+    def connection_count(self, job_id: str) -> int:
+        """Number of clients receiving a job's events, including attached duplicates."""
+        return len(self._connections_for(job_id))
+
     async def broadcast_to_job(self, job_id: str, message: dict):
         """Send a message to all clients connected to a specific job."""
-        if job_id not in self.active_connections:
-            logger.warning(f"No active connections for job {job_id}")
+        key = coalesce_key(message)
+        if key is not None and self.progress_interval > 0:
+            now = time.monotonic()
+            sent_at = self.progress_sent_at.setdefault(job_id, {})
+            wait = sent_at.get(key, float("-inf")) + self.progress_interval - now
+            if wait > 0:
+                # Too soon after the last one with this key: hold it, replacing any older held event
+                self.held_progress.setdefault(job_id, OrderedDict())[key] = message
+                if job_id not in self.flush_timers:
+                    self.flush_timers[job_id] = asyncio.get_running_loop().call_later(
+                        wait, self._flush_progress, job_id
+                    )
+                return
+            sent_at[key] = now
+            self.held_progress.get(job_id, {}).pop(key, None)
+        else:
+            # Held progress goes out first, so clients see events in the order they happened
+            self._flush_progress(job_id)
+        self._publish(job_id, message)
+
+    def _flush_progress(self, job_id: str):
+        """Publish a job's held progress events."""
+        if timer := self.flush_timers.pop(job_id, None):
+            timer.cancel()
+        held = self.held_progress.pop(job_id, None)
+        if not held:
             return
-            
-        # Add timestamp to message
+        now = time.monotonic()
+        sent_at = self.progress_sent_at.setdefault(job_id, {})
+        for key, message in held.items():
+            sent_at[key] = now
+            self._publish(job_id, message)
+
+    def _publish(self, job_id: str, message: dict):
+        """Stamp one event with a timestamp and sequence number and publish it on the job's channel."""
         message["timestamp"] = datetime.now().isoformat()
-        
-        # Convert message to JSON string
-        message_str = json.dumps(message)
-        logger.info(f"Message content: {message_str}")
-        
-        # Send to all connected clients for this job
-        success_count = 0
-        disconnected = set()
-        for connection in self.active_connections[job_id]:
-            try:
-                await connection.send_text(message_str)
-                success_count += 1
-            except Exception as e:
-                logger.error(f"Error sending message to client: {str(e)}", exc_info=True)
-                disconnected.add(connection)
-        
-        # Clean up disconnected clients
-        for connection in disconnected:
-            self.disconnect(connection, job_id)
+        message["seq"] = self._next_seq(job_id)
+        self.pubsub.publish(job_id, message)
+
+    def _deliver(self, job_id: str, message: dict):
+        """Buffer a published event and queue it for this process's clients of the job."""
+        self._record(job_id, message)
+        key = coalesce_key(message)
+
+        connections = self._connections_for(job_id)
+        if not connections:
+            logger.debug(f"No active connections for job {job_id}, event {message['seq']} buffered")
+            return
+
+        # Encode once per encoding in use, then queue for each client's writer task;
+        # nothing here waits on the network
+        encoded: Dict[str, Union[str, bytes]] = {}
+        for connection in connections:
+            client = self.clients.get(connection)
+            if not client:
+                continue
+            if client.encoding not in encoded:
+                encoded[client.encoding] = encode_event(message, client.encoding)
+            if not client.enqueue(encoded[client.encoding], key):
+                logger.warning(f"Disconnecting slow WebSocket client of job {job_id}")
+                self._drop_client(client)
+        logger.debug(f"Queued event {message['seq']} for job {job_id} to {len(connections)} clients")
+
+    def _reference_large_fields(self, job_id: str, result: dict) -> dict:
+        """Replace large fields this job already sent in full with a reference to them.
+
+        The first event carrying a payload gets `<field>_id` next to it; later
+        events carry only `<field>_ref` with the same ID.
+        """
+        for field in LARGE_RESULT_FIELDS:
+            value = result.get(field)
+            if not isinstance(value, str) or len(value) < self.large_payload_chars:
+                continue
+            payload_id = hashlib.sha1(value.encode()).hexdigest()[:16]
+            sent = self.sent_payloads.setdefault(job_id, set())
+            result = dict(result)
+            if payload_id in sent:
+                del result[field]
+                result[f"{field}_ref"] = payload_id
+            else:
+                sent.add(payload_id)
+                result[f"{field}_id"] = payload_id
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Outbound queue totals across connected clients."""
+        clients = [client.stats() for client in self.clients.values()]
+        return {
+            "clients": len(clients),
+            "degraded": sum(1 for c in clients if c["degraded"]),
+            "queued": sum(c["queued"] for c in clients),
+            "coalesced": sum(c["coalesced"] for c in clients),
+            "dropped_events": sum(c["dropped"] for c in clients),
+            "dropped_clients": self.dropped_clients,
+            "held_progress": sum(len(held) for held in self.held_progress.values()),
+            "pubsub": self.pubsub.stats(),
+        }
             
     async def send_status_update(self, job_id: str, status: str, message: str = None, error: str = None, result: dict = None):
         """Helper method to send formatted status updates."""
+        if result:
+            result = self._reference_large_fields(job_id, result)
         update = {
             "type": "status_update",
             "data": {
@@ -72,4 +485,40 @@ class WebSocketManager:
             }
         }
         #logger.info(f"Status: {status}, Message: {message}")
-        await self.broadcast_to_job(job_id, update)
\ No newline at end of file
+        await self.broadcast_to_job(job_id, update)
+
+    def send_direct(self, websockets, status: str, message: str = None, error: str = None, result: dict = None):
+        """Queue a status update for the given clients only.
+
+        The update is neither published nor buffered and takes no sequence
+        number, so it never reaches other clients or shifts the job's replay.
+        """
+        update = {
+            "type": "status_update",
+            "timestamp": datetime.now().isoformat(),
+            "data": {
+                "status": status,
+                "message": message,
+                "error": error,
+                "result": result
+            }
+        }
+        encoded: Dict[str, Union[str, bytes]] = {}
+        for websocket in websockets:
+            if not (client := self.clients.get(websocket)):
+                continue
+            if client.encoding not in encoded:
+                encoded[client.encoding] = encode_event(update, client.encoding)
+            client.enqueue(encoded[client.encoding])
+
+    def release_clients(self, job_id: str, status: str, message: str = None, error: str = None):
+        """Send a final status to a job's own clients and stop routing its events to them.
+
+        Clients of jobs linked to it keep receiving its events.
+        """
+        websockets = self.active_connections.pop(job_id, set())
+        self.send_direct(websockets, status, message=message, error=error)
+        for websocket in websockets:
+            if not any(websocket in sockets for sockets in self.active_connections.values()):
+                if client := self.clients.pop(websocket, None):
+                    client.close_when_drained()
\ No newline at end of file
@@ -0,0 +1,257 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from backend.services.websocket_manager import WebSocketManager
+
+logger = logging.getLogger(__name__)
+
+
+class EventRelay(WebSocketManager):
+    """WebSocketManager stand-in used inside worker processes.
+
+    Events are forwarded to the API process over the broker queue instead of
+    being written to sockets, so nodes keep calling send_status_update as usual.
+    """
+
+    def __init__(self, events):
+        super().__init__()
+        self.events = events
+
+    async def broadcast_to_job(self, job_id: str, message: dict):
+        self.events.put(("event", job_id, message))
+
+
+async def _run_job(job_id: str, inputs: Dict[str, Any], events) -> None:
+    # Imported here so the API process does not build graph dependencies per worker spawn
+    from backend.services.research_runner import run_research
+
+    try:
+        result = await run_research(job_id, inputs, EventRelay(events))
+        events.put(("result", job_id, result))
+    except Exception as e:
+        logger.error(f"Job {job_id} failed in worker process: {e}", exc_info=True)
+        events.put(("error", job_id, str(e)))
+
+
+def _queue_reader(name: str) -> ThreadPoolExecutor:
+    """A dedicated thread for blocking multiprocessing queue reads.
+
+    Keeps those reads off the default executor, which the research code
+    uses for its own blocking work.
+    """
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+
+
+async def _watch_control(control, tasks: Dict[str, asyncio.Task]) -> None:
+    loop = asyncio.get_running_loop()
+    reader = _queue_reader("control-reader")
+    while True:
+        job_id = await loop.run_in_executor(reader, control.get)
+        if job_id is None:
+            break
+        if task := tasks.get(job_id):
+            logger.info(f"Cancelling job {job_id} in worker process")
+            task.cancel()
+    reader.shutdown(wait=False)
+
+
+async def _serve(jobs, events, control, worker_index: int, concurrency: int) -> None:
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(concurrency)
+    tasks: Dict[str, asyncio.Task] = {}
+    watcher = asyncio.create_task(_watch_control(control, tasks))
+    reader = _queue_reader("job-reader")
+
+    def release(job_id: str, task: asyncio.Task) -> None:
+        tasks.pop(job_id, None)
+        slots.release()
+        if task.cancelled():
+            events.put(("cancelled", job_id, None))
+
+    while True:
+        # Only pull a job when there is a free slot, so idle processes pick up work first
+        await slots.acquire()
+        item = await loop.run_in_executor(reader, jobs.get)
+        if item is None:
+            slots.release()
+            break
+        job_id, inputs = item
+        events.put(("started", job_id, worker_index))
+        task = asyncio.create_task(_run_job(job_id, inputs, events))
+        tasks[job_id] = task
+        task.add_done_callback(lambda t, j=job_id: release(j, t))
+
+    reader.shutdown(wait=False)
+    await asyncio.gather(*tasks.values(), return_exceptions=True)
+    control.put(None)
+    await watcher
+
+
+def worker_main(jobs, events, control, worker_index: int, concurrency: int) -> None:
+    """Entry point of a research worker process."""
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_serve(jobs, events, control, worker_index, concurrency))
+
+
+class ProcessWorkerPool:
+    """Runs research jobs in N worker processes behind a multiprocessing queue broker.
+
+    Progress events come back over a shared event queue and are re-broadcast
+    through the API process's WebSocketManager, which owns the sockets. A
+    monitor replaces worker processes that die and fails the jobs they were
+    running, so their callers and queue slots are released.
+    """
+
+    def __init__(self, processes: int, websocket_manager: WebSocketManager, jobs_per_process: int = 1):
+        self.processes = max(1, processes)
+        self.jobs_per_process = max(1, jobs_per_process)
+        self.websocket_manager = websocket_manager
+
+        context = multiprocessing.get_context("spawn")
+        self.context = context
+        self.jobs = context.Queue()
+        self.events = context.Queue()
+        self.workers: List[multiprocessing.Process] = []
+        self.controls: List[Any] = []
+        self.futures: Dict[str, asyncio.Future] = {}
+        # Which worker process is running each job, for routing cancellations
+        self.assignments: Dict[str, int] = {}
+        self.reader: Optional[asyncio.Task] = None
+        self.monitor: Optional[asyncio.Task] = None
+        self.event_reader: Optional[ThreadPoolExecutor] = None
+        self.restarts = 0
+
+    def _spawn(self, index: int) -> multiprocessing.Process:
+        control = self.context.Queue()
+        process = self.context.Process(
+            target=worker_main,
+            args=(self.jobs, self.events, control, index, self.jobs_per_process),
+            name=f"research-process-{index}",
+            daemon=True
+        )
+        process.start()
+        if index < len(self.workers):
+            self.controls[index] = control
+            self.workers[index] = process
+        else:
+            self.controls.append(control)
+            self.workers.append(process)
+        return process
+
+    async def start(self) -> None:
+        """Spawn the worker processes and start relaying their events."""
+        if self.workers:
+            return
+        for i in range(self.processes):
+            self._spawn(i)
+        self.event_reader = _queue_reader("event-reader")
+        self.reader = asyncio.create_task(self._read_events())
+        self.monitor = asyncio.create_task(self._monitor())
+        logger.info(f"Started {self.processes} research worker processes ({self.jobs_per_process} jobs each)")
+
+    async def _monitor(self, interval: float = 1.0) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            for index, process in enumerate(self.workers):
+                if not process.is_alive():
+                    self._replace(index, process)
+
+    def _replace(self, index: int, process: multiprocessing.Process) -> None:
+        error = RuntimeError(f"Research worker process {index} exited unexpectedly (code {process.exitcode})")
+        failed = 0
+        for job_id, worker_index in list(self.assignments.items()):
+            if worker_index != index:
+                continue
+            self.assignments.pop(job_id, None)
+            if (future := self.futures.get(job_id)) and not future.done():
+                future.set_exception(error)
+                failed += 1
+        logger.error(f"{error}; failed {failed} running jobs, starting a replacement")
+        self._spawn(index)
+        self.restarts += 1
+
+    async def stop(self) -> None:
+        """Ask workers to finish their current jobs and exit."""
+        if self.monitor:
+            self.monitor.cancel()
+            await asyncio.gather(self.monitor, return_exceptions=True)
+            self.monitor = None
+        for _ in self.workers:
+            self.jobs.put(None)
+        loop = asyncio.get_running_loop()
+        for process in self.workers:
+            await loop.run_in_executor(None, process.join, 10)
+            if process.is_alive():
+                process.terminate()
+        self.workers = []
+        self.controls = []
+
+        # Unblock the reader thread
+        self.events.put(None)
+        if self.reader:
+            await asyncio.gather(self.reader, return_exceptions=True)
+            self.reader = None
+        if self.event_reader:
+            self.event_reader.shutdown(wait=False)
+            self.event_reader = None
+
+    async def run(self, job_id: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch a job to the worker processes and wait for its outcome."""
+        future = asyncio.get_running_loop().create_future()
+        self.futures[job_id] = future
+        self.jobs.put((job_id, inputs))
+        try:
+            return await future
+        except asyncio.CancelledError:
+            self.cancel(job_id)
+            raise
+        finally:
+            self.futures.pop(job_id, None)
+            self.assignments.pop(job_id, None)
+
+    def cancel(self, job_id: str) -> None:
+        """Ask the worker process running a job to cancel its task tree."""
+        if (worker_index := self.assignments.get(job_id)) is not None:
+            self.controls[worker_index].put(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "processes": self.processes,
+            "alive": sum(1 for p in self.workers if p.is_alive()),
+            "jobs_per_process": self.jobs_per_process,
+            "in_flight": len(self.futures),
+            "restarts": self.restarts,
+        }
+
+    async def _read_events(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await loop.run_in_executor(self.event_reader, self.events.get)
+            if item is None:
+                break
+            kind, job_id, payload = item
+            try:
+                if kind == "event":
+                    await self.websocket_manager.broadcast_to_job(job_id, payload)
+                elif kind == "started":
+                    self.assignments[job_id] = payload
+                    # Cancelled while the job sat in the broker queue; run() already cleaned up after it
+                    if job_id not in self.futures:
+                        self.cancel(job_id)
+                        self.assignments.pop(job_id, None)
+                elif kind == "cancelled":
+                    logger.info(f"Worker process cancelled job {job_id}")
+                    if job_id not in self.futures:
+                        self.assignments.pop(job_id, None)
+                elif future := self.futures.get(job_id):
+                    if future.done():
+                        continue
+                    if kind == "result":
+                        future.set_result(payload)
+                    else:
+                        future.set_exception(RuntimeError(payload))
+            except Exception as e:
+                logger.error(f"Error relaying worker event for job {job_id}: {e}", exc_info=True)
@@ -9,4 +9,13 @@ from .references import (
     format_reference_for_markdown,
     extract_link_info,
     format_references_section
-) 
\ No newline at end of file
+) 
+from .depth import DEPTH_PROFILES, depth_profile, resolve_depth
+from .sections import (
+    REPORT_SECTIONS,
+    SECTION_HEADERS,
+    section_position,
+    format_section,
+    stitch_report,
+    split_report_sections
+)
@@ -0,0 +1,52 @@
+import logging
+import os
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEPTH = "standard"
+
+# Work sizes for each research depth; "standard" matches the original pipeline
+DEPTH_PROFILES: Dict[str, Dict[str, Any]] = {
+    'quick': {
+        'queries_per_analyst': 2,
+        'max_results': 3,
+        'search_depth': 'basic',
+        'crawl': {'max_depth': 1, 'max_breadth': 10, 'extract_depth': 'basic'},
+        'enrich': False,
+        'max_curated_docs': 10,
+        'max_references': 5,
+    },
+    'standard': {
+        'queries_per_analyst': 4,
+        'max_results': 5,
+        'search_depth': 'basic',
+        'crawl': {'max_depth': 1, 'max_breadth': 50, 'extract_depth': 'advanced'},
+        'enrich': True,
+        'max_curated_docs': 30,
+        'max_references': 10,
+    },
+    'deep': {
+        'queries_per_analyst': 6,
+        'max_results': 10,
+        'search_depth': 'advanced',
+        'crawl': {'max_depth': 2, 'max_breadth': 80, 'extract_depth': 'advanced'},
+        'enrich': True,
+        'max_curated_docs': 50,
+        'max_references': 20,
+    },
+}
+
+
+def resolve_depth(depth: Optional[str]) -> str:
+    """Validated depth name, falling back to RESEARCH_DEFAULT_DEPTH or "standard"."""
+    depth = (depth or os.getenv("RESEARCH_DEFAULT_DEPTH", DEFAULT_DEPTH)).strip().lower()
+    if depth not in DEPTH_PROFILES:
+        logger.warning(f"Unknown research depth '{depth}', using {DEFAULT_DEPTH}")
+        return DEFAULT_DEPTH
+    return depth
+
+
+def depth_profile(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Work sizes for the depth selected in a research state."""
+    return DEPTH_PROFILES[resolve_depth(state.get('depth'))]
@@ -0,0 +1,32 @@
+import hashlib
+import json
+import re
+from typing import Any, Dict
+
+from .depth import DEFAULT_DEPTH, resolve_depth
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_URL_PREFIX_RE = re.compile(r'^(https?://)?(www\.)?')
+
+
+def _normalize_text(value: Any) -> str:
+    return _WHITESPACE_RE.sub(' ', str(value or '')).strip().lower()
+
+
+def _normalize_url(value: Any) -> str:
+    url = _URL_PREFIX_RE.sub('', _normalize_text(value))
+    return url.split('?')[0].split('#')[0].rstrip('/')
+
+
+def request_fingerprint(inputs: Dict[str, Any]) -> str:
+    """Stable fingerprint of the fields that determine a research report."""
+    key = {
+        "company": _normalize_text(inputs.get("company")),
+        "company_url": _normalize_url(inputs.get("company_url")),
+        "industry": _normalize_text(inputs.get("industry")),
+        "hq_location": _normalize_text(inputs.get("hq_location")),
+    }
+    # Only non-default depths are keyed, so standard reports keep their fingerprints
+    if (depth := resolve_depth(inputs.get("depth"))) != DEFAULT_DEPTH:
+        key["depth"] = depth
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:32]
@@ -0,0 +1,38 @@
+import logging
+import os
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# How long each category of a stored report stays fresh, in hours
+DEFAULT_MAX_AGE_HOURS = {
+    'company': 168,
+    'industry': 168,
+    'financial': 72,
+    'news': 24,
+}
+
+
+def category_max_age_hours() -> Dict[str, float]:
+    """Per-category freshness windows, overridable with REPORT_MAX_AGE_HOURS.
+
+    The variable takes comma-separated pairs, e.g. "news=6,financial=48".
+    """
+    max_age = dict(DEFAULT_MAX_AGE_HOURS)
+    for pair in os.getenv("REPORT_MAX_AGE_HOURS", "").split(','):
+        if '=' not in pair:
+            continue
+        category, hours = (part.strip() for part in pair.split('=', 1))
+        try:
+            max_age[category] = float(hours)
+        except ValueError:
+            logger.warning(f"Ignoring invalid REPORT_MAX_AGE_HOURS entry: {pair}")
+    return max_age
+
+
+def stale_categories(age_seconds: float) -> List[str]:
+    """Categories of a report of the given age that are past their freshness window."""
+    return [
+        category for category, hours in category_max_age_hours().items()
+        if age_seconds > hours * 3600
+    ]
@@ -123,7 +123,7 @@ def extract_website_name_from_domain(domain: str) -> str:
     
     return website_name
 
-def process_references_from_search_results(state: Dict[str, Any]) -> Tuple[List[str], Dict[str, str], Dict[str, Dict[str, Any]]]:
+def process_references_from_search_results(state: Dict[str, Any], max_references: int = 10) -> Tuple[List[str], Dict[str, str], Dict[str, Dict[str, Any]]]:
     """Process references from search results and return top references, titles, and info."""
     all_top_references = []
     
@@ -227,11 +227,11 @@ def process_references_from_search_results(state: Dict[str, Any]) -> Tuple[List[
     for i, (url, score) in enumerate(unique_references):
         logger.info(f"{i+1}. Score: {score:.4f} - URL: {url}")
     
-    # Take exactly 10 unique references (or all if less than 10)
-    top_references = unique_references[:10]
+    # Take exactly max_references unique references (or all if fewer)
+    top_references = unique_references[:max_references]
     top_reference_urls = [url for url, _ in top_references]
     
-    # Log final top 10 references
+    # Log final top references
     logger.info(f"Final top {len(top_reference_urls)} references selected:")
     for i, url in enumerate(top_reference_urls):
         score = next((s for u, s in unique_references if u == url), 0)
@@ -343,7 +343,7 @@ def format_references_section(references: List[str], reference_info: Dict[str, D
         reference_entries.append(entry)
     
     # Keep references in the same order they were provided (which should be by score)
-    # This preserves the top 10 scoring order from process_references_from_search_results
+    # This preserves the top scoring order from process_references_from_search_results
     logger.info("Maintaining reference order based on scores")
     
     # Format references in MLA style
@@ -0,0 +1,74 @@
+import logging
+import re
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fixed order of the report body: (briefing category, section header)
+REPORT_SECTIONS: List[Tuple[str, str]] = [
+    ('company', 'Company Overview'),
+    ('industry', 'Industry Overview'),
+    ('financial', 'Financial Overview'),
+    ('news', 'News'),
+]
+
+SECTION_HEADERS: Dict[str, str] = dict(REPORT_SECTIONS)
+
+_LEADING_HEADER_RE = re.compile(r'^\s*#{1,2}\s+[^\n]*\n+')
+_CODE_FENCE_RE = re.compile(r'^```[a-z]*\n?|\n?```$')
+
+
+def section_position(category: str) -> int:
+    """Return the zero-based position of a category in the final report."""
+    for position, (name, _) in enumerate(REPORT_SECTIONS):
+        if name == category:
+            return position
+    return len(REPORT_SECTIONS)
+
+
+def clean_section_body(content: str) -> str:
+    """Strip code fences and any leading #/## header the model added to a section body."""
+    body = _CODE_FENCE_RE.sub('', (content or '').strip())
+    # Models occasionally repeat the section (or report) title; the stitcher owns those
+    while _LEADING_HEADER_RE.match(body):
+        body = _LEADING_HEADER_RE.sub('', body, count=1)
+    return body.strip()
+
+
+def format_section(category: str, content: str) -> str:
+    """Render one section body under its fixed ## header."""
+    header = SECTION_HEADERS.get(category, category.title())
+    return f"## {header}\n\n{clean_section_body(content)}"
+
+
+def stitch_report(company: str, sections: Dict[str, str], reference_text: str = "") -> str:
+    """Assemble section bodies into the final report in the fixed section order."""
+    parts = [f"# {company} Research Report"]
+    for category, _ in REPORT_SECTIONS:
+        if body := clean_section_body(sections.get(category, '')):
+            parts.append(format_section(category, body))
+        else:
+            logger.info(f"Skipping empty {category} section while stitching report")
+    report = "\n\n".join(parts)
+    if reference_text:
+        report = f"{report}\n\n{reference_text.strip()}"
+    return report
+
+
+def split_report_sections(report: str) -> Dict[str, str]:
+    """Split a compiled report back into section bodies keyed by briefing category."""
+    categories = {header.lower(): category for category, header in REPORT_SECTIONS}
+    sections: Dict[str, str] = {}
+    current = None
+    lines: List[str] = []
+    for line in (report or '').split('\n'):
+        if line.startswith('## '):
+            if current:
+                sections[current] = "\n".join(lines).strip()
+            current = categories.get(line[3:].strip().lower())
+            lines = []
+        elif current:
+            lines.append(line)
+    if current:
+        sections[current] = "\n".join(lines).strip()
+    return sections
@@ -0,0 +1,105 @@
+"""Benchmark research depth profiles for latency and provider cost.
+
+Runs the full research graph once per profile (and per --runs) against the
+live providers, so TAVILY_API_KEY, GROP_API_KEY and GEMINI_API_KEY must be
+set. Cost is reported as provider call counts plus an estimate of Tavily
+credits (basic search 1, advanced search 2, 5 extracted URLs per credit).
+
+    python -m benchmarks.depth_profiles --company Tavily --url https://tavily.com
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+from backend.graph import Graph
+from backend.services.websocket_manager import WebSocketManager
+from backend.utils.depth import DEPTH_PROFILES
+
+
+class RecordingManager(WebSocketManager):
+    """Counts the status events a run emits instead of sending them."""
+
+    def __init__(self):
+        super().__init__()
+        self.statuses: Counter = Counter()
+        self.searches = 0
+
+    async def broadcast_to_job(self, job_id: str, message: dict):
+        data = message.get("data") or {}
+        if status := data.get("status"):
+            self.statuses[status] += 1
+            if status == "queries_generated":
+                self.searches += (data.get("result") or {}).get("total_queries", 0)
+
+
+async def run_profile(depth: str, args: argparse.Namespace) -> Dict[str, Any]:
+    profile = DEPTH_PROFILES[depth]
+    manager = RecordingManager()
+    graph = Graph(
+        company=args.company,
+        url=args.url,
+        industry=args.industry,
+        hq_location=args.hq,
+        websocket_manager=manager,
+        job_id=f"benchmark-{depth}",
+        depth=depth
+    )
+
+    started = time.perf_counter()
+    state = {}
+    async for update in graph.run(thread={}):
+        state.update(update)
+    elapsed = time.perf_counter() - started
+
+    final_state = state.get('editor') or {}
+    extracted = manager.statuses["extracting"]
+    search_credits = manager.searches * (2 if profile['search_depth'] == 'advanced' else 1)
+    return {
+        "depth": depth,
+        "seconds": round(elapsed, 1),
+        "searches": manager.searches,
+        "extracted_urls": extracted,
+        "briefings": manager.statuses["briefing_complete"],
+        "tavily_credits_est": search_credits + math.ceil(extracted / 5),
+        "curated_docs": sum(len(final_state.get(f'curated_{c}_data') or {}) for c in ('company', 'industry', 'financial', 'news')),
+        "references": len(final_state.get('references') or []),
+        "report_chars": len(final_state.get('report') or ''),
+    }
+
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    columns = list(rows[0].keys())
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row[c]).ljust(widths[c]) for c in columns))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--company", required=True)
+    parser.add_argument("--url")
+    parser.add_argument("--industry")
+    parser.add_argument("--hq")
+    parser.add_argument("--depths", nargs="+", choices=list(DEPTH_PROFILES), default=list(DEPTH_PROFILES))
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args()
+
+    rows = []
+    for depth in args.depths:
+        for _ in range(args.runs):
+            rows.append(await run_profile(depth, args))
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
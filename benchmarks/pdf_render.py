@@ -0,0 +1,106 @@
+"""Benchmark the markdown-to-PDF path on large synthetic reports.
+
+Builds reports shaped like the editor's output (title, ## sections, ###
+subsections, paragraphs with bold, italic and links, bullet lists and a
+references section) at each --scale, then times the markdown tokenizer
+alone and the full render including ReportLab layout. Needs reportlab but
+no API keys.
+
+    python -m benchmarks.pdf_render --scales 1 10 50 --runs 5
+"""
+import argparse
+import io
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+from backend.utils.utils import generate_pdf_from_md, markdown_to_flowables
+
+SECTIONS = ("Company Overview", "Industry Overview", "Financial Overview", "News")
+
+PARAGRAPH = (
+    "Acme Corp reported **record revenue of $4.2B** in fiscal 2024, up 18% year over year, "
+    "driven by *enterprise adoption* of its analytics platform and expansion into EMEA & APAC. "
+    "According to [Reuters](https://www.reuters.com/technology/acme-q4-results), margins improved "
+    "for the third consecutive quarter while R&D spend held at 21% of revenue."
+)
+
+BULLET = "* **{label}**: growth in {label} accounts with [details](https://example.com/{label}/{n})"
+
+
+def build_report(scale: int) -> str:
+    """A report with `scale` subsections per section."""
+    lines = ["# Acme Corp Research Report", ""]
+    for section in SECTIONS:
+        lines += [f"## {section}", ""]
+        for n in range(scale):
+            lines += [f"### {section} Topic {n + 1}", "", PARAGRAPH, ""]
+            lines += [BULLET.format(label=label, n=n) for label in ("enterprise", "mid-market", "public-sector")]
+            lines.append("")
+    lines += ["## References", ""]
+    lines += [
+        f"* [Acme Corp Source {n}](https://example.com/sources/{n})"
+        for n in range(10 * scale)
+    ]
+    return "\n".join(lines)
+
+
+def time_runs(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def run_scale(scale: int, runs: int) -> Dict[str, Any]:
+    report = build_report(scale)
+    buffer = io.BytesIO()
+
+    def render():
+        buffer.seek(0)
+        buffer.truncate()
+        generate_pdf_from_md(report, buffer)
+
+    tokenize_ms = time_runs(lambda: markdown_to_flowables(report), runs)
+    render_ms = time_runs(render, runs)
+    return {
+        "scale": scale,
+        "report_chars": len(report),
+        "lines": report.count("\n") + 1,
+        "tokenize_ms": round(tokenize_ms, 2),
+        "render_ms": round(render_ms, 1),
+        "layout_share": f"{1 - tokenize_ms / render_ms:.0%}",
+        "pdf_kb": round(len(buffer.getvalue()) / 1024, 1),
+    }
+
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    columns = list(rows[0].keys())
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row[c]).ljust(widths[c]) for c in columns))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", type=int, default=[1, 10, 50])
+    parser.add_argument("--runs", type=int, default=3, help="runs per measurement; the median is reported")
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args()
+
+    # Warm the style registry so the first scale isn't charged for it
+    markdown_to_flowables(build_report(1))
+    rows = [run_scale(scale, args.runs) for scale in args.scales]
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
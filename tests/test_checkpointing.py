@@ -0,0 +1,95 @@
+import asyncio
+import operator
+from typing import Annotated, List, TypedDict
+
+import pytest
+
+pytest.importorskip("langgraph.checkpoint.sqlite")
+
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.graph import END, START, StateGraph
+
+from backend.services.checkpointing import TransientAwareSerializer, use_serializer
+from backend.services.websocket_manager import WebSocketManager
+
+
+class State(TypedDict, total=False):
+    company: str
+    websocket_manager: WebSocketManager
+    steps: Annotated[List[str], operator.add]
+
+
+def build_graph(calls: list, fail_second: bool) -> StateGraph:
+    async def first(state: State):
+        calls.append(("first", state["websocket_manager"]))
+        # Hands the manager back like the research nodes do, so it lands in pending writes
+        return {"websocket_manager": state["websocket_manager"], "steps": ["first"]}
+
+    async def second(state: State):
+        calls.append(("second", state["websocket_manager"]))
+        if fail_second:
+            raise RuntimeError("provider outage")
+        return {"steps": ["second"]}
+
+    workflow = StateGraph(State)
+    workflow.add_node("first", first)
+    workflow.add_node("second", second)
+    workflow.add_edge(START, "first")
+    workflow.add_edge("first", "second")
+    workflow.add_edge("second", END)
+    return workflow
+
+
+async def run_until_failure(path: str, manager: WebSocketManager, config: dict) -> list:
+    calls = []
+    async with AsyncSqliteSaver.from_conn_string(path) as saver:
+        use_serializer(saver, manager)
+        graph = build_graph(calls, fail_second=True).compile(checkpointer=saver)
+        with pytest.raises(RuntimeError, match="provider outage"):
+            async for _ in graph.astream({"company": "Acme", "websocket_manager": manager}, config):
+                pass
+    return calls
+
+
+async def resume(path: str, manager: WebSocketManager, config: dict):
+    calls = []
+    async with AsyncSqliteSaver.from_conn_string(path) as saver:
+        use_serializer(saver, manager)
+        graph = build_graph(calls, fail_second=False).compile(checkpointer=saver)
+        pending = (await graph.aget_state(config)).next
+        async for _ in graph.astream(None, config):
+            pass
+        final = (await graph.aget_state(config)).values
+    return calls, pending, final
+
+
+def test_checkpoint_with_live_manager_resumes_with_new_manager(tmp_path):
+    path = str(tmp_path / "checkpoints.db")
+    config = {"configurable": {"thread_id": "job-1"}}
+    crashed_manager, resumed_manager = WebSocketManager(), WebSocketManager()
+
+    first_calls = asyncio.run(run_until_failure(path, crashed_manager, config))
+    assert [name for name, _ in first_calls] == ["first", "second"]
+
+    calls, pending, final = asyncio.run(resume(path, resumed_manager, config))
+    assert pending == ("second",)
+    # Only the failed node runs again, and it reports to the resuming process's manager
+    assert calls == [("second", resumed_manager)]
+    assert final["steps"] == ["first", "second"]
+    assert final["websocket_manager"] is resumed_manager
+
+
+def test_transient_objects_are_stripped_at_any_depth():
+    manager = WebSocketManager()
+    serde = TransientAwareSerializer(manager)
+    checkpoint = {
+        "channel_values": {
+            "__start__": {"company": "Acme", "websocket_manager": WebSocketManager()},
+            "steps": ["first"],
+        }
+    }
+
+    restored = serde.loads_typed(serde.dumps_typed(checkpoint))
+
+    assert restored["channel_values"]["__start__"]["websocket_manager"] is manager
+    assert restored["channel_values"]["steps"] == ["first"]
@@ -0,0 +1,73 @@
+import asyncio
+
+from backend.services.job_registry import FileJobStore, JobRegistry
+
+
+async def settle(registry: JobRegistry):
+    """Wait until the registry's queued store writes have landed."""
+    while registry.writing:
+        await asyncio.sleep(0.01)
+
+
+def test_finished_jobs_are_evicted_oldest_first_and_running_ones_kept():
+    async def run():
+        registry = JobRegistry(ttl_seconds=3600, max_entries=2)
+        registry.update("running", {"status": "processing"})
+        registry.update("old", {"status": "completed"})
+        registry.update("new", {"status": "completed"})
+        return registry
+
+    registry = asyncio.run(run())
+
+    assert "running" in registry and "new" in registry
+    assert "old" not in registry
+    assert registry.stats()["evicted_total"] == 1
+
+
+def test_heavy_fields_are_offloaded_and_loaded_back(tmp_path):
+    async def run():
+        registry = JobRegistry(store=FileJobStore(str(tmp_path)))
+        registry.update("job", {"status": "processing", "artifacts": {"briefings": {"company": "text"}}})
+        registry.update("job", {"status": "completed", "report": "# Report"})
+        await settle(registry)
+        entry = registry.get("job")
+        fields = await registry.load("job", "report"), await registry.load("job", "artifacts")
+
+        # A new registry over the same directory finds the job without it being in memory
+        reloaded = JobRegistry(store=FileJobStore(str(tmp_path)))
+        return entry, fields, await reloaded.fetch("job"), await reloaded.load("job", "report")
+
+    entry, (report, artifacts), fetched, reloaded_report = asyncio.run(run())
+
+    assert "report" not in entry and "artifacts" not in entry
+    assert sorted(entry["offloaded"]) == ["artifacts", "report"]
+    assert report == "# Report"
+    assert artifacts == {"briefings": {"company": "text"}}
+    assert fetched["status"] == "completed"
+    assert reloaded_report == "# Report"
+
+
+def test_jobs_stay_in_memory_until_their_write_lands(tmp_path):
+    async def run():
+        registry = JobRegistry(ttl_seconds=0, store=FileJobStore(str(tmp_path)))
+        registry.update("job", {"status": "completed", "report": "# Report"})
+        held = dict(registry.get("job"))
+        await settle(registry)
+        return held, registry.get("job"), await registry.load("job", "report")
+
+    held, after, report = asyncio.run(run())
+
+    assert held["report"] == "# Report"
+    assert after is None
+    assert report == "# Report"
+
+
+def test_store_prunes_the_oldest_files_over_the_cap(tmp_path):
+    store = FileJobStore(str(tmp_path), max_files=2)
+    for job_id in ("a", "b", "c"):
+        store.save(job_id, {"status": "completed"})
+
+    assert store.prune() == 1
+    assert "a" not in store and store.load("a") is None
+    assert store.load("c") == {"status": "completed"}
+    assert store.stats()["jobs"] == 2
@@ -0,0 +1,72 @@
+import asyncio
+
+from backend.services.research_cache import ResearchCache
+
+
+def test_concurrent_callers_share_one_load():
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["result"]
+
+    async def run():
+        cache = ResearchCache()
+        values = await asyncio.gather(*(cache.get_or_create("key", load) for _ in range(5)))
+        return cache, values, await cache.get_or_create("key", load)
+
+    cache, values, later = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert values == [["result"]] * 5 and later == ["result"]
+    assert cache.stats()["misses"] == 1
+
+
+def test_values_failing_cache_if_are_shared_but_not_stored():
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return []
+
+    async def run():
+        cache = ResearchCache()
+        shared = await asyncio.gather(*(cache.get_or_create("key", load, cache_if=bool) for _ in range(3)))
+        again = await cache.get_or_create("key", load, cache_if=bool)
+        return cache, shared, again
+
+    cache, shared, again = asyncio.run(run())
+
+    assert shared == [[], [], []] and again == []
+    # One load for the concurrent callers, another for the caller after them
+    assert len(calls) == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_waiter_loads_itself_when_the_loading_job_is_cancelled():
+    calls = []
+
+    async def slow():
+        calls.append("slow")
+        await asyncio.sleep(10)
+
+    async def fast():
+        calls.append("fast")
+        return "value"
+
+    async def run():
+        cache = ResearchCache()
+        loader = asyncio.create_task(cache.get_or_create("key", slow))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_create("key", fast))
+        await asyncio.sleep(0)
+        loader.cancel()
+        return await waiter, loader.cancelled()
+
+    value, loader_cancelled = asyncio.run(run())
+
+    assert loader_cancelled
+    assert value == "value"
+    assert calls == ["slow", "fast"]
@@ -0,0 +1,42 @@
+import pytest
+
+from backend.services.search_index import fts5_available, match_expression, split_sections
+
+
+def test_match_expression_quotes_terms_and_keeps_prefixes():
+    assert match_expression("acme widgets") == '"acme" "widgets"'
+    assert match_expression('widg* "quoted" OR') == '"widg"* """quoted""" "OR"'
+    assert match_expression("* ** ") == ""
+
+
+def test_split_sections_skips_references_and_keeps_preamble():
+    report = (
+        "Intro line\n"
+        "# Acme Research Report\n"
+        "## Company Overview\nAcme makes widgets.\n"
+        "### Products\nWidgets and gadgets.\n"
+        "## Empty\n\n"
+        "## References\n* [Source](https://example.com)\n"
+    )
+
+    assert split_sections(report) == [
+        ("", "Intro line"),
+        ("Company Overview", "Acme makes widgets."),
+        ("Products", "Widgets and gadgets."),
+    ]
+
+
+def test_split_sections_without_headings_is_one_section():
+    assert split_sections("  just text  ") == [("", "just text")]
+    assert split_sections("") == []
+
+
+@pytest.mark.skipif(not fts5_available(), reason="SQLite built without FTS5")
+def test_expression_is_valid_fts5_for_hostile_input():
+    import sqlite3
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE VIRTUAL TABLE docs USING fts5(body)")
+    conn.execute("INSERT INTO docs VALUES ('acme NEAR widgets')")
+    expression = match_expression('NEAR( "acme" AND widgets)')
+    assert conn.execute("SELECT count(*) FROM docs WHERE docs MATCH ?", (expression,)).fetchone() == (0,)
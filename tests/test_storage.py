@@ -0,0 +1,90 @@
+import asyncio
+
+from backend.services.sqlite_storage import SQLiteStorage
+from backend.services.storage import join_artifacts, split_artifacts
+
+ARTIFACTS = {
+    "briefings": {"company": "Acme makes widgets.", "news": ""},
+    "curated": {
+        "company_data": {
+            "https://acme.example/about": {
+                "title": "About Acme",
+                "url": "https://acme.example/about",
+                "evaluation": {"overall_score": 0.9},
+                "content": "Acme makes widgets.",
+                "raw_content": "Acme Corp makes widgets in Ohio."
+            }
+        }
+    },
+    "queries": {"company": ["acme widgets"]},
+    "references": ["https://acme.example/about"],
+    "reference_info": {},
+    "reference_titles": {},
+}
+
+
+def test_artifacts_round_trip_through_records_and_content_store():
+    records, documents = split_artifacts(ARTIFACTS)
+
+    # Text lives only in the content store; records hold a handle to it
+    (handle,) = next(r for r in records if r["kind"] == "curated")["body"]
+    assert "content" not in handle and handle["content_id"] in documents
+
+    restored = join_artifacts(records, documents)
+    expected = {**ARTIFACTS, "briefings": {"company": "Acme makes widgets."}}
+    assert restored == expected
+
+
+def test_sqlite_storage_batches_writes_and_folds_job_updates(tmp_path):
+    async def run():
+        storage = SQLiteStorage(str(tmp_path / "research.db"), flush_interval=60)
+        await storage.start()
+        storage.create_job("job", {"company": "Acme"})
+        storage.update_job("job", status="processing")
+        storage.update_job("job", status="completed")
+        storage.store_report("job", {"report": "# Acme", "company": "Acme", "fingerprint": "fp"})
+        storage.store_artifacts("job", ARTIFACTS)
+        queued = storage.stats()
+        # Reads of a job with queued writes flush them first
+        job = await storage.get_job("job")
+        report = await storage.find_latest_report("fp")
+        artifacts = await storage.load_artifacts("job")
+        stats = storage.stats()
+        await storage.close()
+        return queued, job, report, artifacts, stats
+
+    queued, job, report, artifacts, stats = asyncio.run(run())
+
+    assert queued["pending_jobs"] == 1 and queued["writes"] == 0
+    assert job["status"] == "completed"
+    assert report["report_content"] == "# Acme"
+    assert artifacts["curated"] == ARTIFACTS["curated"]
+    assert stats["batches"] == 1
+
+
+def test_failed_batch_is_retried_ahead_of_newer_writes(tmp_path):
+    async def run():
+        storage = SQLiteStorage(str(tmp_path / "research.db"), flush_interval=60)
+        await storage.start()
+        write_batch = storage._write_batch
+        failures = [RuntimeError("database is locked")]
+
+        def flaky(*args):
+            if failures:
+                raise failures.pop()
+            return write_batch(*args)
+
+        storage._write_batch = flaky
+        storage.create_job("job", {"company": "Acme"})
+        await storage.flush()
+        storage.update_job("job", status="completed")
+        await storage.flush()
+        job = await storage.get_job("job")
+        stats = storage.stats()
+        await storage.close()
+        return job, stats
+
+    job, stats = asyncio.run(run())
+
+    assert job["status"] == "completed"
+    assert stats["failed_batches"] == 1 and stats["dropped_batches"] == 0
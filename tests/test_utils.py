@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip("reportlab")
+
+from reportlab.platypus import ListFlowable, Paragraph
+
+from backend.utils.utils import format_inline, markdown_to_flowables
+
+
+def test_plain_text_is_escaped_around_markup():
+    assert format_inline("R&D < 5% **bold & <b>** *it*") == (
+        "R&amp;D &lt; 5% <b>bold &amp; &lt;b&gt;</b> <i>it</i>"
+    )
+
+
+def test_link_urls_and_text_are_escaped():
+    markup = format_inline('[Q&A "notes"](https://example.com/?a=1&b="2")')
+    assert markup == (
+        '<link href="https://example.com/?a=1&amp;b=&quot;2&quot;" color="blue">'
+        '<u>Q&amp;A "notes"</u></link>'
+    )
+
+
+def test_flowables_parse_reports_with_markup_characters():
+    story = markdown_to_flowables(
+        "# Acme <Corp> & Sons\n"
+        "Revenue grew 5% < 10% & margins held.\n"
+        "* **R&D**: <script>\n"
+        "- [Source](https://example.com/?q=a&b)\n"
+    )
+
+    paragraphs = [f for f in story if isinstance(f, Paragraph)]
+    (bullets,) = [f for f in story if isinstance(f, ListFlowable)]
+    assert [p.getPlainText() for p in paragraphs] == [
+        "Acme <Corp> & Sons",
+        "Revenue grew 5% < 10% & margins held.",
+    ]
+    assert len(bullets._flowables) == 2
@@ -0,0 +1,58 @@
+import asyncio
+
+from backend.services.websocket_manager import ClientConnection
+
+
+class StalledSocket:
+    """Accepts sends only once released, so messages pile up in the client queue."""
+
+    def __init__(self):
+        self.sent = []
+        self.released = asyncio.Event()
+
+    async def send_text(self, payload):
+        await self.released.wait()
+        self.sent.append(payload)
+
+
+def test_coalesced_messages_move_behind_messages_queued_after_them():
+    async def run():
+        socket = StalledSocket()
+        client = ClientConnection(socket, on_drop=lambda c: None)
+        await asyncio.sleep(0)
+        # The first message is taken by the writer and waits on the socket
+        client.enqueue("start")
+        await asyncio.sleep(0)
+        client.enqueue("progress 1", key=("extract", "a"))
+        client.enqueue("status")
+        client.enqueue("progress 2", key=("extract", "a"))
+        socket.released.set()
+        await asyncio.sleep(0.01)
+        client.stop()
+        return socket.sent, client.stats()
+
+    sent, stats = asyncio.run(run())
+
+    assert sent == ["start", "status", "progress 2"]
+    assert stats["coalesced"] == 1
+
+
+def test_degraded_client_drops_progress_and_refuses_messages_when_far_behind():
+    async def run():
+        socket = StalledSocket()
+        client = ClientConnection(socket, on_drop=lambda c: None, max_queue=2)
+        await asyncio.sleep(0)
+        client.enqueue("taken by the writer")
+        await asyncio.sleep(0)
+        results = [client.enqueue(f"status {n}") for n in range(2)]
+        results.append(client.enqueue("progress", key=("extract", "a")))
+        results += [client.enqueue(f"status {n}") for n in range(2, 5)]
+        stats = client.stats()
+        client.stop()
+        return results, stats
+
+    results, stats = asyncio.run(run())
+
+    # Progress is dropped once degraded; required messages fail only past twice the queue size
+    assert results == [True, True, True, True, True, False]
+    assert stats["degraded"] and stats["dropped"] == 1
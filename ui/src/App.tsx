@@ -39,6 +39,10 @@ function App() {
   const [hasFinalReport, setHasFinalReport] = useState(false);
   const [reconnectAttempts, setReconnectAttempts] = useState(0);
   const pollingIntervalRef = useRef<NodeJS.Timeout | null>(null);
+  // Sequence number of the last event received, so reconnects only replay what was missed
+  const lastEventSeqRef = useRef(0);
+  // Large payloads (the report) are sent in full once per job, then referenced by ID
+  const largePayloadsRef = useRef<Record<string, string>>({});
   const maxReconnectAttempts = 3;
   const reconnectDelay = 2000; // 2 seconds
   const [researchState, setResearchState] = useState<ResearchState>({
@@ -155,9 +159,10 @@ function App() {
     console.log("Initializing WebSocket connection for job:", jobId);
     
     // Use the WS_URL directly if it's a full URL, otherwise construct it
+    const wsPath = `/research/ws/${jobId}?since=${lastEventSeqRef.current}`;
     const wsUrl = WS_URL.startsWith('wss://') || WS_URL.startsWith('ws://')
-      ? `${WS_URL}/research/ws/${jobId}`
-      : `${window.location.protocol === 'https:' ? 'wss:' : 'ws:'}//${WS_URL}/research/ws/${jobId}`;
+      ? `${WS_URL}${wsPath}`
+      : `${window.location.protocol === 'https:' ? 'wss:' : 'ws:'}//${WS_URL}${wsPath}`;
     
     console.log("Connecting to WebSocket URL:", wsUrl);
     
@@ -224,9 +229,15 @@ function App() {
 
     ws.onmessage = (event) => {
       const rawData = JSON.parse(event.data);
+      if (typeof rawData.seq === "number") {
+        lastEventSeqRef.current = Math.max(lastEventSeqRef.current, rawData.seq);
+      }
 
       if (rawData.type === "status_update") {
         const statusData = rawData.data;
+        if (statusData.result?.report_id && typeof statusData.result.report === "string") {
+          largePayloadsRef.current[statusData.result.report_id] = statusData.result.report;
+        }
 
         // Handle phase transitions
         if (statusData.result?.step) {
@@ -257,13 +268,25 @@ function App() {
             step: "Complete",
             message: "Research completed successfully"
           });
+          const report = statusData.result.report
+            ?? largePayloadsRef.current[statusData.result.report_ref];
           setOutput({
             summary: "",
             details: {
-              report: statusData.result.report,
+              report: report ?? "",
             },
           });
           setHasFinalReport(true);
+          if (report === undefined) {
+            // The event that carried the report was missed, so fetch it instead
+            fetch(`${API_URL}/research/${jobId}/report`)
+              .then((response) => response.json())
+              .then((data) => {
+                const storedReport = data.report ?? data.report_content;
+                if (storedReport) setOutput({ summary: "", details: { report: storedReport } });
+              })
+              .catch((error) => console.error("Failed to fetch report:", error));
+          }
           
           // Clear polling interval if it exists
           if (pollingIntervalRef.current) {
@@ -448,7 +471,10 @@ function App() {
                     ...prev.docCounts,
                     [docType]: {
                       initial: prev.docCounts[docType].initial,
-                      kept: prev.docCounts[docType].kept + 1
+                      // kept_count survives server-side coalescing of these events
+                      kept: typeof statusData.result?.kept_count === "number"
+                        ? statusData.result.kept_count
+                        : prev.docCounts[docType].kept + 1
                     }
                   } as DocCounts
                 };
@@ -659,6 +685,8 @@ function App() {
 
       if (data.job_id) {
         console.log("Connecting WebSocket with job_id:", data.job_id);
+        lastEventSeqRef.current = 0;
+        largePayloadsRef.current = {};
         connectWebSocket(data.job_id);
       } else {
         throw new Error("No job ID received");